@@ -9,6 +9,7 @@ from app.api.v1.endpoints.accounts.schemas import (
     AccountUpdate,
     TotalBalanceResponse,
 )
+from app.core.singleflight import coalesce_response
 from app.dependencies import CurrentUserDep, SessionDep
 from app.schemas.common import ApiResponse
 from app.services.account_service import AccountService
@@ -17,6 +18,7 @@ router = APIRouter()
 
 
 @router.get("/total-balance")
+@coalesce_response
 async def get_total_balance(
     session: SessionDep,
     current_user_id: CurrentUserDep,
@@ -40,6 +42,7 @@ async def create_account(
 
 
 @router.get("")
+@coalesce_response
 async def get_accounts(
     session: SessionDep,
     current_user_id: CurrentUserDep,
@@ -52,6 +55,7 @@ async def get_accounts(
 
 
 @router.get("/{account_id}")
+@coalesce_response
 async def get_account(
     account_id: UUID,
     session: SessionDep,
@@ -0,0 +1,124 @@
+from uuid import UUID
+
+from fastapi import APIRouter
+
+from app.api.v1.endpoints.recurring_rules.schemas import (
+    RecurringRuleCreate,
+    RecurringRuleResponse,
+    RecurringRuleUpdate,
+    RecurringSuggestionResponse,
+)
+from app.dependencies import CurrentUserDep, SessionDep
+from app.schemas.common import ApiResponse, EmptyResponse
+from app.services.recurring_rule_service import RecurringRuleService
+from app.services.recurring_suggestion_service import RecurringSuggestionService
+
+router = APIRouter()
+
+
+@router.post("")
+async def create_recurring_rule(
+    request: RecurringRuleCreate,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[RecurringRuleResponse]:
+    """Create a new recurring rule."""
+    service = RecurringRuleService(session)
+    rule = await service.create(current_user_id, request)
+    return ApiResponse(data=rule, message="Recurring rule created successfully")
+
+
+@router.get("")
+async def get_recurring_rules(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[list[RecurringRuleResponse]]:
+    """Get all recurring rules."""
+    service = RecurringRuleService(session)
+    rules = await service.get_all(current_user_id)
+    return ApiResponse(data=rules)
+
+
+@router.get("/suggestions")
+async def get_recurring_suggestions(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[list[RecurringSuggestionResponse]]:
+    """Get pending recurring payment suggestions."""
+    service = RecurringSuggestionService(session)
+    suggestions = await service.get_pending(current_user_id)
+    return ApiResponse(data=suggestions)
+
+
+@router.post("/suggestions/refresh")
+async def refresh_recurring_suggestions(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[list[RecurringSuggestionResponse]]:
+    """Re-detect recurring payments in the transaction history."""
+    service = RecurringSuggestionService(session)
+    suggestions = await service.refresh(current_user_id)
+    return ApiResponse(data=suggestions)
+
+
+@router.post("/suggestions/{suggestion_id}/accept")
+async def accept_recurring_suggestion(
+    suggestion_id: UUID,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[RecurringRuleResponse]:
+    """Create a recurring rule from a suggestion."""
+    service = RecurringSuggestionService(session)
+    rule = await service.accept(current_user_id, suggestion_id)
+    return ApiResponse(data=rule, message="Recurring rule created successfully")
+
+
+@router.post("/suggestions/{suggestion_id}/dismiss")
+async def dismiss_recurring_suggestion(
+    suggestion_id: UUID,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[EmptyResponse]:
+    """Dismiss a suggestion so it is not suggested again."""
+    service = RecurringSuggestionService(session)
+    await service.dismiss(current_user_id, suggestion_id)
+    return ApiResponse(data=EmptyResponse(), message="Suggestion dismissed")
+
+
+@router.get("/{rule_id}")
+async def get_recurring_rule(
+    rule_id: UUID,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[RecurringRuleResponse]:
+    """Get a single recurring rule."""
+    service = RecurringRuleService(session)
+    rule = await service.get_by_id(current_user_id, rule_id)
+    return ApiResponse(data=rule)
+
+
+@router.put("/{rule_id}")
+async def update_recurring_rule(
+    rule_id: UUID,
+    request: RecurringRuleUpdate,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[RecurringRuleResponse]:
+    """Update a recurring rule."""
+    service = RecurringRuleService(session)
+    rule = await service.update(current_user_id, rule_id, request)
+    return ApiResponse(data=rule, message="Recurring rule updated successfully")
+
+
+@router.delete("/{rule_id}")
+async def delete_recurring_rule(
+    rule_id: UUID,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[EmptyResponse]:
+    """Delete a recurring rule; transactions it created are kept."""
+    service = RecurringRuleService(session)
+    await service.delete(current_user_id, rule_id)
+    return ApiResponse(
+        data=EmptyResponse(), message="Recurring rule deleted successfully"
+    )
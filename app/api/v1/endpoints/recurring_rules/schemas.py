@@ -0,0 +1,72 @@
+import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.recurring_rule import RecurrenceFrequency
+from app.models.transaction import TransactionType
+
+
+class RecurringRuleCreate(BaseModel):
+    amount: Decimal = Field(gt=0)
+    type: TransactionType
+    category_id: UUID | None = None
+    account_id: UUID
+    to_account_id: UUID | None = None
+    note: str | None = None
+    tag_ids: list[UUID] = []
+    frequency: RecurrenceFrequency
+    interval: int = Field(default=1, ge=1)
+    start_date: datetime.date
+    end_date: datetime.date | None = None
+
+
+class RecurringRuleUpdate(BaseModel):
+    amount: Decimal | None = Field(default=None, gt=0)
+    type: TransactionType | None = None
+    category_id: UUID | None = None
+    account_id: UUID | None = None
+    to_account_id: UUID | None = None
+    note: str | None = None
+    tag_ids: list[UUID] | None = None
+    frequency: RecurrenceFrequency | None = None
+    interval: int | None = Field(default=None, ge=1)
+    start_date: datetime.date | None = None
+    end_date: datetime.date | None = None
+    is_active: bool | None = None
+
+
+class RecurringRuleResponse(BaseModel):
+    id: UUID
+    amount: Decimal
+    type: TransactionType
+    category_id: UUID | None
+    account_id: UUID
+    to_account_id: UUID | None
+    note: str | None
+    tag_ids: list[UUID]
+    frequency: RecurrenceFrequency
+    interval: int
+    start_date: datetime.date
+    end_date: datetime.date | None
+    next_date: datetime.date
+    is_active: bool
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class RecurringSuggestionResponse(BaseModel):
+    id: UUID
+    account_id: UUID
+    category_id: UUID | None
+    type: TransactionType
+    note: str | None
+    amount: Decimal
+    frequency: RecurrenceFrequency
+    interval: int
+    occurrences: int
+    first_date: datetime.date
+    last_date: datetime.date
+    next_date: datetime.date
+    confidence: float
@@ -1,21 +1,44 @@
 import datetime
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Query
 
 from app.api.v1.endpoints.statistics.schemas import (
+    AccountStatisticsResponse,
+    AnomalyResponse,
+    CalendarResponse,
     CategoryBreakdownResponse,
+    CategoryMatrixResponse,
+    ComparisonResponse,
+    DistributionResponse,
+    FlowsResponse,
+    ForecastResponse,
     MonthlySummaryResponse,
+    RollingResponse,
+    TagBreakdownResponse,
+    TimeBucket,
+    TimeSeriesResponse,
 )
+from app.core.singleflight import coalesce_response
 from app.dependencies import CurrentUserDep, SessionDep
+from app.models.anomaly import AnomalyKind
 from app.models.transaction import TransactionType
 from app.schemas.common import ApiResponse
-from app.services.statistics_service import StatisticsService
+from app.services.anomaly_service import AnomalyService
+from app.services.statistics_service import (
+    DEFAULT_ROLLING_WINDOWS,
+    MAX_COMPARE_PERIODS,
+    MAX_FORECAST_DAYS,
+    MAX_HISTOGRAM_BINS,
+    StatisticsService,
+)
 
 router = APIRouter()
 
 
 @router.get("/summary")
+@coalesce_response
 async def get_summary(
     session: SessionDep,
     current_user_id: CurrentUserDep,
@@ -29,6 +52,7 @@ async def get_summary(
 
 
 @router.get("/category-breakdown")
+@coalesce_response
 async def get_category_breakdown(
     session: SessionDep,
     current_user_id: CurrentUserDep,
@@ -42,3 +66,220 @@ async def get_category_breakdown(
         current_user_id, start_date, end_date, type
     )
     return ApiResponse(data=breakdown)
+
+
+@router.get("/tag-breakdown")
+@coalesce_response
+async def get_tag_breakdown(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    type: Annotated[TransactionType, Query()] = TransactionType.EXPENSE,
+) -> ApiResponse[TagBreakdownResponse]:
+    """Get spending breakdown by tag for a date range."""
+    service = StatisticsService(session)
+    breakdown = await service.get_tag_breakdown(
+        current_user_id, start_date, end_date, type
+    )
+    return ApiResponse(data=breakdown)
+
+
+@router.get("/accounts")
+@coalesce_response
+async def get_account_flows(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    include_archived: Annotated[bool, Query(alias="includeArchived")] = False,
+) -> ApiResponse[AccountStatisticsResponse]:
+    """Get inflow, outflow and transfers per account for a date range."""
+    service = StatisticsService(session)
+    flows = await service.get_account_flows(
+        current_user_id, start_date, end_date, include_archived
+    )
+    return ApiResponse(data=flows)
+
+
+@router.get("/flows")
+@coalesce_response
+async def get_flows(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+) -> ApiResponse[FlowsResponse]:
+    """Get income → account → expense flows for a date range (Sankey)."""
+    service = StatisticsService(session)
+    flows = await service.get_flows(current_user_id, start_date, end_date)
+    return ApiResponse(data=flows)
+
+
+@router.get("/category-matrix")
+@coalesce_response
+async def get_category_matrix(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    type: Annotated[TransactionType, Query()] = TransactionType.EXPENSE,
+) -> ApiResponse[CategoryMatrixResponse]:
+    """Get category totals per month for a date range."""
+    service = StatisticsService(session)
+    matrix = await service.get_category_matrix(
+        current_user_id, start_date, end_date, type
+    )
+    return ApiResponse(data=matrix)
+
+
+@router.get("/calendar")
+@coalesce_response
+async def get_calendar(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    year: Annotated[int | None, Query(ge=datetime.MINYEAR, le=datetime.MAXYEAR)] = None,
+) -> ApiResponse[CalendarResponse]:
+    """Get daily income/expense totals of a year (the current one by default)."""
+    service = StatisticsService(session)
+    calendar = await service.get_calendar(
+        current_user_id, year or datetime.date.today().year
+    )
+    return ApiResponse(data=calendar)
+
+
+@router.get("/rolling")
+@coalesce_response
+async def get_rolling(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    windows: Annotated[list[int] | None, Query(alias="window")] = None,
+    category_id: Annotated[UUID | None, Query(alias="categoryId")] = None,
+) -> ApiResponse[RollingResponse]:
+    """Get rolling sums and averages per day (7, 30 and 90 days by default).
+
+    Pass ``window`` repeatedly to choose other window lengths.
+    """
+    service = StatisticsService(session)
+    rolling = await service.get_rolling(
+        current_user_id,
+        start_date,
+        end_date,
+        windows or list(DEFAULT_ROLLING_WINDOWS),
+        category_id,
+    )
+    return ApiResponse(data=rolling)
+
+
+@router.get("/distribution")
+@coalesce_response
+async def get_distribution(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    type: Annotated[TransactionType, Query()] = TransactionType.EXPENSE,
+    by_category: Annotated[bool, Query(alias="byCategory")] = False,
+    category_id: Annotated[UUID | None, Query(alias="categoryId")] = None,
+    bins: Annotated[int, Query(ge=1, le=MAX_HISTOGRAM_BINS)] = 10,
+) -> ApiResponse[DistributionResponse]:
+    """Get percentiles and a histogram of transaction amounts."""
+    service = StatisticsService(session)
+    distribution = await service.get_distribution(
+        current_user_id, start_date, end_date, type, by_category, category_id, bins
+    )
+    return ApiResponse(data=distribution)
+
+
+@router.get("/timeseries")
+@coalesce_response
+async def get_timeseries(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date, Query(alias="startDate")],
+    end_date: Annotated[datetime.date, Query(alias="endDate")],
+    bucket: Annotated[TimeBucket, Query()] = TimeBucket.MONTH,
+    category_id: Annotated[UUID | None, Query(alias="categoryId")] = None,
+    account_id: Annotated[UUID | None, Query(alias="accountId")] = None,
+    tag_id: Annotated[UUID | None, Query(alias="tagId")] = None,
+) -> ApiResponse[TimeSeriesResponse]:
+    """Get income/expense totals per bucket for a date range."""
+    service = StatisticsService(session)
+    series = await service.get_timeseries(
+        current_user_id, start_date, end_date, bucket, category_id, account_id, tag_id
+    )
+    return ApiResponse(data=series)
+
+
+@router.get("/compare")
+@coalesce_response
+async def compare_periods(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    reference_date: Annotated[datetime.date | None, Query(alias="date")] = None,
+    bucket: Annotated[TimeBucket, Query()] = TimeBucket.MONTH,
+    periods: Annotated[int, Query(ge=0, le=MAX_COMPARE_PERIODS)] = 1,
+    type: Annotated[TransactionType, Query()] = TransactionType.EXPENSE,
+) -> ApiResponse[ComparisonResponse]:
+    """Compare the current period with previous ones and the year before.
+
+    The current period is the bucket containing ``date`` (today by default).
+    """
+    service = StatisticsService(session)
+    comparison = await service.compare_periods(
+        current_user_id,
+        reference_date or datetime.date.today(),
+        bucket,
+        periods,
+        type,
+    )
+    return ApiResponse(data=comparison)
+
+
+@router.get("/forecast")
+@coalesce_response
+async def get_forecast(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    days: Annotated[int, Query(ge=1, le=MAX_FORECAST_DAYS)] = 90,
+) -> ApiResponse[ForecastResponse]:
+    """Project daily balances of active accounts over the next ``days`` days.
+
+    Combines upcoming recurring rule occurrences with a weekly and monthly
+    seasonal baseline of the accounts' recent cash flows.
+    """
+    service = StatisticsService(session)
+    forecast = await service.get_forecast(current_user_id, datetime.date.today(), days)
+    return ApiResponse(data=forecast)
+
+
+@router.get("/anomalies")
+async def get_anomalies(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    kind: Annotated[AnomalyKind | None, Query()] = None,
+    start_date: Annotated[datetime.date | None, Query(alias="startDate")] = None,
+    end_date: Annotated[datetime.date | None, Query(alias="endDate")] = None,
+) -> ApiResponse[list[AnomalyResponse]]:
+    """Get unusually large transactions and category-months, newest first.
+
+    Results are as of the last analysis; changed histories are re-analysed
+    in the background every ``anomaly_interval_seconds``.
+    """
+    service = AnomalyService(session)
+    anomalies = await service.get_anomalies(current_user_id, kind, start_date, end_date)
+    return ApiResponse(data=anomalies)
+
+
+@router.post("/anomalies/refresh")
+async def refresh_anomalies(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[list[AnomalyResponse]]:
+    """Re-analyse the whole transaction history for anomalies."""
+    service = AnomalyService(session)
+    await service.refresh(current_user_id)
+    anomalies = await service.get_anomalies(current_user_id)
+    return ApiResponse(data=anomalies)
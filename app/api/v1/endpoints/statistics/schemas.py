@@ -1,8 +1,13 @@
+import datetime
 from decimal import Decimal
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel
 
+from app.models.anomaly import AnomalyKind
+from app.models.transaction import TransactionType
+
 
 class MonthlySummaryResponse(BaseModel):
     """Monthly summary response."""
@@ -30,3 +35,262 @@ class CategoryBreakdownResponse(BaseModel):
 
     total: Decimal
     categories: list[CategorySpending]
+
+
+class TimeBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+class TimeSeriesPoint(BaseModel):
+    """Totals of one bucket; ``period_start`` is the bucket's first day."""
+
+    period_start: datetime.date
+    total_income: Decimal
+    total_expense: Decimal
+    balance: Decimal
+    transaction_count: int
+
+
+class TimeSeriesResponse(BaseModel):
+    """Time series response with one point per bucket, gaps included."""
+
+    bucket: TimeBucket
+    points: list[TimeSeriesPoint]
+
+
+class PeriodTotals(BaseModel):
+    """Totals of one compared period; categories are of the requested type."""
+
+    period_start: datetime.date
+    period_end: datetime.date
+    total_income: Decimal
+    total_expense: Decimal
+    balance: Decimal
+    transaction_count: int
+    categories: list[CategorySpending]
+
+
+class ComparisonResponse(BaseModel):
+    """Current period against the previous ones and the same period a year ago.
+
+    ``previous`` is ordered from the most recent period backwards.
+    """
+
+    bucket: TimeBucket
+    current: PeriodTotals
+    previous: list[PeriodTotals]
+    year_over_year: PeriodTotals
+
+
+class MatrixCategory(BaseModel):
+    """Header entry for one row of the category matrix."""
+
+    category_id: UUID
+    category_name: str
+    category_icon: str | None
+    category_color: str | None
+
+
+class CategoryMatrixResponse(BaseModel):
+    """Dense category × month totals.
+
+    ``amounts[i][j]`` and ``counts[i][j]`` belong to ``categories[i]`` in the
+    month starting on ``periods[j]``. Rows are ordered by total, largest first.
+    """
+
+    periods: list[datetime.date]
+    categories: list[MatrixCategory]
+    amounts: list[list[Decimal]]
+    counts: list[list[int]]
+    category_totals: list[Decimal]
+    period_totals: list[Decimal]
+
+
+class TagSpending(BaseModel):
+    """Tag spending breakdown."""
+
+    tag_id: UUID
+    tag_name: str
+    tag_color: str
+    amount: Decimal
+    percentage: Decimal
+    transaction_count: int
+
+
+class TagBreakdownResponse(BaseModel):
+    """Tag breakdown response.
+
+    ``total`` covers every transaction of the type, tagged or not, and each
+    tag's percentage is its share of it. A transaction counts towards each
+    of its tags, so tag amounts may add up to more than ``total``.
+    """
+
+    total: Decimal
+    tags: list[TagSpending]
+
+
+class AccountFlow(BaseModel):
+    """Money moved through one account over a date range.
+
+    Flows are non-negative; ``net_change`` is the resulting balance change.
+    """
+
+    account_id: UUID
+    account_name: str
+    account_icon: str | None
+    account_color: str | None
+    inflow: Decimal
+    outflow: Decimal
+    transfers_in: Decimal
+    transfers_out: Decimal
+    net_change: Decimal
+    transaction_count: int
+
+
+class AccountStatisticsResponse(BaseModel):
+    """Per-account flows in the order of the account list."""
+
+    accounts: list[AccountFlow]
+
+
+class CalendarResponse(BaseModel):
+    """Daily totals of a year as parallel arrays.
+
+    Index ``i`` of every array is the day ``i`` days after January 1st.
+    """
+
+    year: int
+    income: list[Decimal]
+    expense: list[Decimal]
+    counts: list[int]
+
+
+class AccountForecast(BaseModel):
+    """Projected end-of-day balances of one account."""
+
+    account_id: UUID
+    account_name: str
+    balances: list[Decimal]
+
+
+class ForecastResponse(BaseModel):
+    """Daily balance projection as parallel arrays.
+
+    Index ``i`` of every array is the day ``i`` days after ``start_date``
+    (tomorrow); ``total`` sums the listed accounts.
+    """
+
+    start_date: datetime.date
+    days: int
+    total: list[Decimal]
+    accounts: list[AccountForecast]
+
+
+class RollingWindowSeries(BaseModel):
+    """Trailing ``window``-day sums and daily averages, one entry per day."""
+
+    window: int
+    income_sum: list[Decimal]
+    expense_sum: list[Decimal]
+    income_average: list[Decimal]
+    expense_average: list[Decimal]
+
+
+class RollingResponse(BaseModel):
+    """Rolling windows over a date range.
+
+    Index ``i`` of every array is the day ``i`` days after ``start_date``;
+    each window looks back from that day, including days before the range.
+    """
+
+    start_date: datetime.date
+    end_date: datetime.date
+    series: list[RollingWindowSeries]
+
+
+class HistogramBucket(BaseModel):
+    """Amounts from ``lower`` up to ``upper`` (inclusive for the last bucket)."""
+
+    lower: Decimal
+    upper: Decimal
+    count: int
+
+
+class AmountDistribution(BaseModel):
+    """Spread of single transaction amounts within a group.
+
+    Percentiles interpolate between neighbouring amounts. Without
+    per-category grouping the category fields are null.
+    """
+
+    category_id: UUID | None
+    category_name: str | None
+    count: int
+    min: Decimal
+    max: Decimal
+    median: Decimal
+    p90: Decimal
+    p99: Decimal
+    histogram: list[HistogramBucket]
+
+
+class DistributionResponse(BaseModel):
+    """Amount distributions, the most frequent group first."""
+
+    groups: list[AmountDistribution]
+
+
+class FlowNodeType(str, Enum):
+    INCOME_CATEGORY = "income_category"
+    ACCOUNT = "account"
+    EXPENSE_CATEGORY = "expense_category"
+
+
+class FlowNode(BaseModel):
+    """Sankey node; ``id`` is null for uncategorized income or expenses."""
+
+    type: FlowNodeType
+    id: UUID | None
+    name: str | None
+    color: str | None
+
+
+class FlowLink(BaseModel):
+    """Money moved from ``nodes[source]`` to ``nodes[target]``."""
+
+    source: int
+    target: int
+    amount: Decimal
+    transaction_count: int
+
+
+class FlowsResponse(BaseModel):
+    """Income category → account → expense category flows.
+
+    Transfers appear as account → account links. Nodes are ordered by type,
+    then by the money passing through them, largest first.
+    """
+
+    nodes: list[FlowNode]
+    links: list[FlowLink]
+
+
+class AnomalyResponse(BaseModel):
+    """Transaction or category-month flagged as unusually large.
+
+    ``expected`` is the usual (median) amount of its category and type, and
+    ``score`` how many robust standard deviations it lies above it.
+    """
+
+    id: UUID
+    kind: AnomalyKind
+    type: TransactionType
+    category_id: UUID | None
+    transaction_id: UUID | None
+    date: datetime.date
+    amount: Decimal
+    expected: Decimal
+    score: float
@@ -2,16 +2,32 @@ import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Form, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from app.api.v1.endpoints.transactions.schemas import (
+    DuplicateGroup,
+    ExportFormat,
+    ImportColumnMapping,
+    ImportResult,
+    StatementFormat,
+    TransactionBulkCreate,
+    TransactionBulkResult,
     TransactionCreate,
     TransactionResponse,
     TransactionUpdate,
 )
 from app.dependencies import CurrentUserDep, SessionDep
+from app.exceptions import BadRequestError
 from app.models.transaction import TransactionType
 from app.schemas.common import ApiResponse, EmptyResponse
+from app.services.transaction_export_service import (
+    FILE_EXTENSIONS,
+    MEDIA_TYPES,
+    TransactionExportService,
+)
+from app.services.transaction_import_service import TransactionImportService
 from app.services.transaction_service import TransactionService
 
 router = APIRouter()
@@ -22,13 +38,56 @@ async def create_transaction(
     request: TransactionCreate,
     session: SessionDep,
     current_user_id: CurrentUserDep,
+    reject_duplicates: Annotated[bool, Query(alias="rejectDuplicates")] = False,
 ) -> ApiResponse[TransactionResponse]:
     """Create a new transaction."""
     service = TransactionService(session)
-    transaction = await service.create(current_user_id, request)
+    transaction = await service.create(current_user_id, request, reject_duplicates)
     return ApiResponse(data=transaction, message="Transaction created successfully")
 
 
+@router.post("/bulk")
+async def create_transactions(
+    request: TransactionBulkCreate,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[TransactionBulkResult]:
+    """Create many transactions, skipping likely duplicates by default."""
+    service = TransactionService(session)
+    result = await service.create_many(current_user_id, request)
+    return ApiResponse(
+        data=result, message=f"{len(result.created)} transactions created"
+    )
+
+
+@router.post("/import")
+async def import_transactions(
+    file: UploadFile,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    account_id: Annotated[UUID, Form(alias="accountId")],
+    format: Annotated[StatementFormat | None, Form()] = None,
+    mapping: Annotated[str | None, Form()] = None,
+    skip_duplicates: Annotated[bool, Form(alias="skipDuplicates")] = True,
+) -> ApiResponse[ImportResult]:
+    """Import a CSV or OFX bank statement into an account.
+
+    ``mapping`` is a JSON-encoded ImportColumnMapping (CSV only).
+    """
+    try:
+        column_mapping = (
+            ImportColumnMapping.model_validate_json(mapping) if mapping else None
+        )
+    except ValidationError as e:
+        raise BadRequestError(f"Invalid column mapping: {e}") from e
+
+    service = TransactionImportService(session)
+    result = await service.import_statement(
+        current_user_id, account_id, file, format, column_mapping, skip_duplicates
+    )
+    return ApiResponse(data=result, message=f"{result.imported} transactions imported")
+
+
 @router.get("")
 async def get_transactions(
     session: SessionDep,
@@ -56,6 +115,38 @@ async def get_transactions(
     return ApiResponse(data=transactions)
 
 
+@router.get("/duplicates")
+async def get_duplicate_transactions(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start_date: Annotated[datetime.date | None, Query(alias="startDate")] = None,
+    end_date: Annotated[datetime.date | None, Query(alias="endDate")] = None,
+) -> ApiResponse[list[DuplicateGroup]]:
+    """Get groups of transactions that look like duplicates."""
+    service = TransactionService(session)
+    groups = await service.get_duplicates(current_user_id, start_date, end_date)
+    return ApiResponse(data=groups)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_transactions(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    format: Annotated[ExportFormat, Query()] = ExportFormat.PARQUET,
+    start_date: Annotated[datetime.date | None, Query(alias="startDate")] = None,
+    end_date: Annotated[datetime.date | None, Query(alias="endDate")] = None,
+) -> StreamingResponse:
+    """Stream transactions as an Arrow IPC stream or a Parquet file."""
+    service = TransactionExportService(session)
+    content = service.stream_export(current_user_id, format, start_date, end_date)
+    filename = f"transactions.{FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{transaction_id}")
 async def get_transaction(
     transaction_id: UUID,
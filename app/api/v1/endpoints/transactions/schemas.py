@@ -1,8 +1,9 @@
 import datetime
 from decimal import Decimal
+from enum import Enum
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.transaction import TransactionType
 
@@ -51,3 +52,70 @@ class TransactionResponse(BaseModel):
     tag_ids: list[UUID]
     created_at: datetime.datetime
     updated_at: datetime.datetime
+    # Set on create when an existing transaction has the same fingerprint
+    duplicate_of: UUID | None = None
+
+
+class TransactionBulkCreate(BaseModel):
+    transactions: list[TransactionCreate] = Field(min_length=1, max_length=1000)
+    skip_duplicates: bool = True
+
+
+class DuplicateMatch(BaseModel):
+    index: int
+    duplicate_of: UUID
+
+
+class TransactionBulkResult(BaseModel):
+    created: list[TransactionResponse]
+    duplicates: list[DuplicateMatch]
+
+
+class DuplicateGroup(BaseModel):
+    fingerprint: str
+    transactions: list[TransactionResponse]
+
+
+class ExportFormat(str, Enum):
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class StatementFormat(str, Enum):
+    CSV = "csv"
+    OFX = "ofx"
+
+
+class ImportColumnMapping(BaseModel):
+    """How CSV columns map to transaction fields.
+
+    Columns are referenced by header name, or by 0-based index when the file
+    has no header row. Use ``amount`` for a single signed column, or
+    ``debit``/``credit`` for statements that split outflows and inflows.
+    """
+
+    date: str | int = "date"
+    amount: str | int | None = "amount"
+    debit: str | int | None = None
+    credit: str | int | None = None
+    note: str | int | None = None
+    type: str | int | None = None
+    date_format: str = "%Y-%m-%d"
+    delimiter: str = ","
+    decimal_separator: str = "."
+    thousands_separator: str = ""
+    has_header: bool = True
+    negative_is_expense: bool = True
+    encoding: str = "utf-8-sig"
+
+
+class ImportRowError(BaseModel):
+    row: int
+    message: str
+
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    duplicates: int = 0
+    errors: list[ImportRowError]
@@ -1,12 +1,17 @@
-from fastapi import APIRouter
+from datetime import date
+
+from fastapi import APIRouter, UploadFile
+from fastapi.responses import StreamingResponse
 
 from app.api.v1.endpoints.users.schemas import (
+    RestoreResult,
     UserPreferencesResponse,
     UserPreferencesUpdate,
     UserProfileResponse,
 )
 from app.dependencies import CurrentUserDep, SessionDep
 from app.schemas.common import ApiResponse
+from app.services.backup_service import BackupService
 from app.services.user_service import UserService
 
 router = APIRouter()
@@ -44,3 +49,31 @@ async def update_preferences(
     service = UserService(session)
     preferences = await service.update_preferences(current_user_id, request)
     return ApiResponse(data=preferences, message="Preferences updated successfully")
+
+
+@router.get("/me/backup", response_class=StreamingResponse)
+async def download_backup(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> StreamingResponse:
+    """Stream a zip of NDJSON files with all of the current user's data."""
+    service = BackupService(session)
+    archive = await service.stream_backup(current_user_id)
+    filename = f"finny-backup-{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/me/restore")
+async def restore_backup(
+    file: UploadFile,
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+) -> ApiResponse[RestoreResult]:
+    """Restore a backup archive into the current user, which must be empty."""
+    service = BackupService(session)
+    result = await service.restore(current_user_id, file)
+    return ApiResponse(data=result, message="Backup restored successfully")
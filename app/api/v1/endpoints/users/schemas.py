@@ -34,3 +34,9 @@ class UserProfileResponse(BaseModel):
     locale: str
     created_at: datetime
     updated_at: datetime
+
+
+class RestoreResult(BaseModel):
+    """Rows restored per backup table."""
+
+    restored: dict[str, int]
@@ -5,6 +5,9 @@ from app.api.v1.endpoints.auth.router import router as auth_router
 from app.api.v1.endpoints.budgets.router import router as budgets_router
 from app.api.v1.endpoints.categories.router import router as categories_router
 from app.api.v1.endpoints.health import router as health_router
+from app.api.v1.endpoints.recurring_rules.router import (
+    router as recurring_rules_router,
+)
 from app.api.v1.endpoints.statistics.router import router as statistics_router
 from app.api.v1.endpoints.tags.router import router as tags_router
 from app.api.v1.endpoints.transactions.router import router as transactions_router
@@ -22,4 +25,7 @@ router.include_router(budgets_router, prefix="/budgets", tags=["budgets"])
 router.include_router(
     transactions_router, prefix="/transactions", tags=["transactions"]
 )
+router.include_router(
+    recurring_rules_router, prefix="/recurring-rules", tags=["recurring-rules"]
+)
 router.include_router(statistics_router, prefix="/statistics", tags=["statistics"])
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +9,8 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "postgresql+psycopg://ai:ai@localhost:5532/ai"
+    # "numeric" stores amounts as NUMERIC(15, 2); "minor_units" as BIGINT cents
+    money_storage: Literal["numeric", "minor_units"] = "numeric"
 
     # JWT
     jwt_secret_key: str = "your-secret-key-change-in-production"
@@ -16,6 +19,28 @@ class Settings(BaseSettings):
     jwt_access_token_expire_minutes: int = 15  # 15 minutes
     jwt_refresh_token_expire_days: int = 30  # 30 days
 
+    # Statement import
+    import_batch_size: int = 1000  # rows per COPY into the staging table
+    import_max_errors: int = 100  # row errors reported back per import
+
+    # Backup
+    backup_batch_size: int = 1000  # rows per cursor fetch and per COPY
+
+    # Columnar export
+    export_batch_size: int = 10000  # rows per Arrow record batch / Parquet row group
+
+    # Recurring transactions
+    recurring_batch_size: int = 500  # due rules locked and materialized per commit
+    recurring_interval_seconds: int = 3600  # in-process materializer; 0 disables
+
+    # Anomaly detection
+    analysis_batch_size: int = 50000  # history rows per cursor fetch
+    anomaly_interval_seconds: int = 60  # in-process refresh of stale users; 0 disables
+
+    # Statistics cache (in-process LRU unless a shared backend is installed)
+    cache_max_entries: int = 10000  # 0 disables caching
+    cache_max_bytes: int = 64 * 1024 * 1024
+
     # App
     app_name: str = "Finny API"
     debug: bool = False
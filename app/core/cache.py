@@ -0,0 +1,207 @@
+"""Per-user versioned cache for derived read results (e.g. statistics).
+
+Cached values are keyed by ``(user_id, namespace, params, data_version)``.
+``users.data_version`` is incremented in the same database transaction as
+every write to a user's transactions, categories, accounts, tags or
+recurring rules, so all of the user's entries become unreachable at once,
+whichever process made the write. Unreachable entries simply age out of the
+backend's LRU.
+
+The default backend is an in-process LRU; deployments with several workers
+can share entries by installing a shared backend with ``set_cache_backend``.
+"""
+
+import hashlib
+import inspect
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from functools import wraps
+from typing import Any, Protocol, get_type_hints
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.account import Account
+from app.models.category import Category
+from app.models.recurring_rule import RecurringRule
+from app.models.tag import Tag
+from app.models.transaction import Transaction
+from app.models.user import User
+
+# Models whose writes change a user's derived read results
+VERSIONED_MODELS = (Transaction, Category, Account, Tag, RecurringRule)
+
+AsyncMethod = Callable[..., Awaitable[Any]]
+
+# Session.info key: users written in the open transaction
+_PENDING = "cache_pending_users"
+
+
+class CacheBackend(Protocol):
+    """Byte store with LRU-style eviction; may be shared between processes."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        cost = len(key) + len(value)
+        if cost > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = value
+        self.size += cost
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self.size -= len(key) + len(value)
+
+
+_backend: CacheBackend | None = None
+_configured = False
+
+
+def get_cache_backend() -> CacheBackend | None:
+    """The installed backend; an in-process LRU unless configured otherwise."""
+    global _backend, _configured
+    if not _configured:
+        settings = get_settings()
+        if settings.cache_max_entries > 0:
+            _backend = MemoryCacheBackend(
+                settings.cache_max_entries, settings.cache_max_bytes
+            )
+        _configured = True
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend | None) -> None:
+    """Install a cache backend (``None`` disables caching)."""
+    global _backend, _configured
+    _backend = backend
+    _configured = True
+
+
+def bump_data_versions(user_ids: Iterable[UUID]):
+    """UPDATE statement invalidating every cached result of the given users."""
+    return (
+        update(User)
+        .where(User.id.in_(set(user_ids)))
+        # Leave updated_at alone: it tracks profile changes
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+    )
+
+
+async def mark_user_data_changed(session: AsyncSession, user_id: UUID) -> None:
+    """Record a write the ORM cannot see (Core inserts and updates)."""
+    session.info.setdefault(_PENDING, set()).add(user_id)
+    await session.execute(bump_data_versions([user_id]))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_writes(session: Session, flush_context) -> None:
+    changed = {
+        obj.user_id
+        for objects in (session.new, session.dirty, session.deleted)
+        for obj in objects
+        if isinstance(obj, VERSIONED_MODELS)
+    }
+    if changed:
+        session.info.setdefault(_PENDING, set()).update(changed)
+        session.connection().execute(bump_data_versions(changed))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def params_digest(
+    signature: inspect.Signature, args, kwargs, exclude: tuple[str, ...] = ()
+) -> str:
+    """Stable digest of a call's arguments, defaults applied.
+
+    ``self`` and sessions never take part in the key.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = {
+        name: value
+        for name, value in bound.arguments.items()
+        if name != "self"
+        and name not in exclude
+        and not isinstance(value, AsyncSession)
+    }
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def user_cached(namespace: str) -> Callable[[AsyncMethod], AsyncMethod]:
+    """Cache a service method's result per user, params and data version.
+
+    The method must take ``user_id`` as its first argument after ``self``,
+    live on a service with a ``session`` attribute, and have a return
+    annotation pydantic can serialize. Each call reads the user's data
+    version (one primary-key lookup); reads are not cached while the
+    service's session holds uncommitted writes of the same user.
+    """
+
+    def decorator(method: AsyncMethod) -> AsyncMethod:
+        signature = inspect.signature(method)
+        adapter = TypeAdapter(get_type_hints(method)["return"])
+
+        @wraps(method)
+        async def wrapper(self, user_id: UUID, *args, **kwargs):
+            backend = get_cache_backend()
+            if backend is None or user_id in self.session.info.get(_PENDING, ()):
+                return await method(self, user_id, *args, **kwargs)
+
+            # Read before the result, so it is never older than the version
+            version = await self.session.scalar(
+                select(User.data_version).where(User.id == user_id)
+            )
+            if version is None:
+                return await method(self, user_id, *args, **kwargs)
+
+            digest = params_digest(
+                signature, (self, user_id, *args), kwargs, exclude=("user_id",)
+            )
+            key = f"{namespace}:{user_id}:{version}:{digest}"
+            cached = await backend.get(key)
+            if cached is not None:
+                return adapter.validate_json(cached)
+
+            result = await method(self, user_id, *args, **kwargs)
+            await backend.set(key, adapter.dump_json(result))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,92 @@
+"""Vectorized amount distributions (percentiles and histograms) per group.
+
+This is the fallback for databases without ``percentile_cont``: callers
+fetch integer amounts labelled with an integer group, and all groups are
+summarized in a fixed number of NumPy passes. Results match Postgres:
+percentiles interpolate linearly like ``percentile_cont``, and histogram
+bins follow ``histogram_bin``.
+"""
+
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # optional "analytics" extra
+    np = None
+
+
+@dataclass
+class GroupDistributions:
+    """Per-group summaries; arrays are indexed by group label."""
+
+    count: "np.ndarray"
+    low: "np.ndarray"
+    high: "np.ndarray"
+    percentiles: "np.ndarray"  # (groups, len(fractions)), float
+    histogram: "np.ndarray"  # (groups, bins) counts
+
+
+def histogram_bin(amount, low, high, bins: int):
+    """Equal-width bin of ``amount`` within ``[low, high]``.
+
+    Works on integers, NumPy arrays and SQL expressions alike; the top edge
+    falls into the last bin and a group with a single value into bin 0.
+    """
+    return (amount - low) * bins // (high - low)
+
+
+def group_distributions(
+    groups: "np.ndarray",
+    amounts: "np.ndarray",
+    group_count: int,
+    fractions: tuple[float, ...],
+    bins: int,
+) -> GroupDistributions:
+    """Summarize the amounts of every group in ``range(group_count)``."""
+    order = np.lexsort((amounts, groups))
+    g = groups[order]
+    a = amounts[order]
+    if len(a) == 0:
+        empty = np.zeros(group_count, dtype=np.int64)
+        return GroupDistributions(
+            count=empty,
+            low=empty,
+            high=empty,
+            percentiles=np.zeros((group_count, len(fractions))),
+            histogram=np.zeros((group_count, bins), dtype=np.int64),
+        )
+
+    count = np.bincount(g, minlength=group_count)
+    starts = np.cumsum(count) - count
+    present = count > 0
+    low = np.zeros(group_count, dtype=np.int64)
+    high = np.zeros(group_count, dtype=np.int64)
+    low[present] = a[starts[present]]
+    high[present] = a[starts[present] + count[present] - 1]
+
+    # percentile_cont: interpolate between the values around q * (n - 1)
+    position = np.asarray(fractions)[None, :] * np.maximum(count - 1, 0)[:, None]
+    below = np.floor(position).astype(np.int64)
+    above = np.ceil(position).astype(np.int64)
+    # Empty groups may start past the end; they are zeroed below
+    last = len(a) - 1
+    lower = a[np.minimum(starts[:, None] + below, last)]
+    upper = a[np.minimum(starts[:, None] + above, last)]
+    percentiles = lower + (upper - lower) * (position - below)
+    percentiles[~present] = 0
+
+    span = high[g] - low[g]
+    bin_index = np.zeros(len(a), dtype=np.int64)
+    spread = span > 0
+    bin_index[spread] = np.minimum(
+        histogram_bin(a[spread], low[g][spread], high[g][spread], bins), bins - 1
+    )
+    histogram = np.bincount(g * bins + bin_index, minlength=group_count * bins)
+
+    return GroupDistributions(
+        count=count,
+        low=low,
+        high=high,
+        percentiles=percentiles,
+        histogram=histogram.reshape(group_count, bins),
+    )
@@ -0,0 +1,49 @@
+"""Content fingerprints for spotting likely duplicate transactions.
+
+Two transactions share a fingerprint when they hit the same account on the
+same day with the same amount and type, and their notes only differ in
+case, punctuation or whitespace (e.g. "STARBUCKS #123" vs "Starbucks 123").
+"""
+
+import hashlib
+import re
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from app.core.money import to_minor
+
+# Length of the stored hex digest (128 bits of SHA-256)
+FINGERPRINT_LENGTH = 32
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_note(note: str | None) -> str:
+    """Casefold a note and reduce it to space-separated words."""
+    if not note:
+        return ""
+    return " ".join(_NON_WORD.sub(" ", note.casefold()).split())
+
+
+def transaction_fingerprint(
+    account_id: UUID,
+    day: date,
+    amount: Decimal,
+    transaction_type: Enum | str,
+    note: str | None,
+) -> str:
+    """Fingerprint of the fields that identify a transaction's content."""
+    if isinstance(transaction_type, Enum):
+        transaction_type = transaction_type.value
+    key = "|".join(
+        (
+            str(account_id),
+            day.isoformat(),
+            str(to_minor(abs(amount))),
+            str(transaction_type).lower(),
+            normalize_note(note),
+        )
+    )
+    return hashlib.sha256(key.encode()).hexdigest()[:FINGERPRINT_LENGTH]
@@ -0,0 +1,62 @@
+"""Seasonal baseline of daily cash flows, fitted by least squares.
+
+The model is a level plus day-of-week and day-of-month effects, so weekly
+shopping or a salary that no recurring rule describes still shows up in a
+forecast. Series are indexed by day number (days since 1970-01-01); each
+effect is only fitted once a series has enough history to estimate it.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # optional "analytics" extra
+    np = None
+
+# History a series needs before weekday / day-of-month effects are fitted
+MIN_WEEKLY_DAYS = 28
+MIN_MONTHLY_DAYS = 90
+
+
+def seasonal_features(days: "np.ndarray") -> "np.ndarray":
+    """Design matrix for day numbers: a constant, then 6 weekday and 30
+    day-of-month indicators (Monday and the 1st are the reference levels).
+    """
+    # 1970-01-01 was a Thursday
+    weekday = (days + 3) % 7
+    dates = days.astype("datetime64[D]")
+    month_day = (dates - dates.astype("datetime64[M]")).astype(np.int64)
+    columns = [np.ones(len(days))]
+    columns += [weekday == day for day in range(1, 7)]
+    columns += [month_day == day for day in range(1, 31)]
+    return np.column_stack(columns).astype(np.float64)
+
+
+def fit_baseline(
+    history: "np.ndarray", first_day: int, starts: "np.ndarray", horizon: int
+) -> "np.ndarray":
+    """Fit every series and predict the ``horizon`` days after its history.
+
+    ``history`` is (days, series) starting at day number ``first_day``;
+    series ``i`` is only observed from row ``starts[i]`` on. Returns a
+    (horizon, series) array of expected daily flows.
+    """
+    length, series = history.shape
+    features = seasonal_features(np.arange(first_day, first_day + length + horizon))
+    past, ahead = features[:length], features[length:]
+    baseline = np.zeros((horizon, series))
+    # Series observed for equally long share one multi-target solve
+    for start in np.unique(starts).tolist():
+        observed = length - start
+        if observed <= 0:
+            continue
+        # Fit a prefix of the columns: constant, weekday, month day
+        used = 1
+        if observed >= MIN_WEEKLY_DAYS:
+            used += 6
+        if observed >= MIN_MONTHLY_DAYS:
+            used += 30
+        members = np.flatnonzero(starts == start)
+        coefficients, *_ = np.linalg.lstsq(
+            past[start:, :used], history[start:, members], rcond=None
+        )
+        baseline[:, members] = ahead[:, :used] @ coefficients
+    return baseline
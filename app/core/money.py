@@ -0,0 +1,34 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+# Amounts carry two decimal places, so one major unit is 100 minor units.
+MINOR_UNITS = 100
+
+_CENT = Decimal("0.01")
+
+
+def to_minor(amount: Decimal | int | float | str) -> int:
+    """Convert a decimal amount to integer minor units (e.g. cents)."""
+    value = Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP)
+    return int(value * MINOR_UNITS)
+
+
+def from_minor(value: int) -> Decimal:
+    """Convert integer minor units back to a two-place decimal amount."""
+    return (Decimal(int(value)) / MINOR_UNITS).quantize(_CENT)
+
+
+def percentage_of(part: int, total: int) -> Decimal:
+    """Share of ``part`` in ``total`` as a percentage with two decimal places.
+
+    Computed with integer arithmetic on minor units, rounding half up.
+    """
+    if total <= 0:
+        return Decimal("0.00")
+    basis_points = (part * 10000 * 2 + total) // (total * 2)
+    return Decimal(basis_points).scaleb(-2)
+
+
+def divide_minor(value: int, divisor: int) -> int:
+    """Divide minor units by a positive integer, rounding half away from zero."""
+    quotient = (abs(value) * 2 + divisor) // (divisor * 2)
+    return quotient if value >= 0 else -quotient
@@ -0,0 +1,122 @@
+"""Vectorized detection of periodic events across many groups at once.
+
+Callers label each event with an integer group and a day number; every
+group is tested for a regular inter-arrival period with a fixed number of
+NumPy passes over the whole history, with no Python loop per group.
+"""
+
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # optional "analytics" extra
+    np = None
+
+
+@dataclass
+class PeriodicGroups:
+    """Groups found to be periodic; arrays are aligned by position."""
+
+    group: "np.ndarray"  # group label
+    period_index: "np.ndarray"  # index into the candidate periods
+    occurrences: "np.ndarray"  # distinct event days in the group
+    regularity: "np.ndarray"  # share of gaps within tolerance of the period
+    first: "np.ndarray"  # input position of the first event
+    last: "np.ndarray"  # input position of the last event
+
+
+def amount_bands(
+    keys: "np.ndarray", amounts: "np.ndarray", ratio: float
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Split each key's events into bands of similar amounts.
+
+    Within a key, amounts are sorted and a new band starts only where one
+    amount exceeds the previous one by more than ``ratio``, so neighbouring
+    amounts (e.g. a price change of a few percent) always share a band.
+    Returns the band label of every event and the key of every band.
+    """
+    order = np.lexsort((amounts, keys))
+    sorted_keys = keys[order]
+    sorted_amounts = np.maximum(amounts[order], 1)
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (sorted_keys[1:] != sorted_keys[:-1]) | (
+        sorted_amounts[1:] > sorted_amounts[:-1] * ratio
+    )
+    bands = np.empty(len(order), dtype=np.int64)
+    bands[order] = np.cumsum(starts) - 1
+    return bands, sorted_keys[starts]
+
+
+def find_periodic_groups(
+    groups: "np.ndarray",
+    days: "np.ndarray",
+    periods: "np.ndarray",
+    tolerances: "np.ndarray",
+    today: int,
+    min_occurrences: int = 3,
+    min_regularity: float = 0.75,
+) -> PeriodicGroups:
+    """Find groups whose events recur at one of the candidate periods.
+
+    A group's period is the candidate closest (in ratio) to its median gap
+    between distinct days. It is periodic when enough gaps fall within the
+    period's tolerance and its last event is less than two periods old.
+    """
+    order = np.lexsort((days, groups))
+    g = groups[order]
+    d = days[order]
+    if len(g) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return PeriodicGroups(empty, empty, empty, np.empty(0), empty, empty)
+
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    ends = np.r_[starts[1:], len(g)]
+    group_count = len(starts)
+    element_group = np.repeat(np.arange(group_count), ends - starts)
+
+    # Gaps between consecutive events of the same group; same-day repeats
+    # (e.g. a charge and its retry) are not separate occurrences.
+    gaps = np.diff(d)
+    keep = (g[1:] == g[:-1]) & (gaps > 0)
+    gap_group = element_group[1:][keep]
+    gap_values = gaps[keep].astype(np.float64)
+    gap_count = np.bincount(gap_group, minlength=group_count)
+
+    # Median gap per group: gaps are grouped already, so sort within groups
+    # and pick the middle element of each run.
+    sorted_gaps = gap_values[np.lexsort((gap_values, gap_group))]
+    gap_starts = np.cumsum(gap_count) - gap_count
+    has_gaps = gap_count > 0
+    median = np.zeros(group_count)
+    median[has_gaps] = sorted_gaps[gap_starts[has_gaps] + gap_count[has_gaps] // 2]
+
+    period_index = np.zeros(group_count, dtype=np.int64)
+    period_index[has_gaps] = np.abs(
+        np.log(median[has_gaps, None] / periods[None, :])
+    ).argmin(axis=1)
+    expected = periods[period_index]
+    tolerance = tolerances[period_index]
+
+    within = np.abs(gap_values - expected[gap_group]) <= tolerance[gap_group]
+    regularity = np.zeros(group_count)
+    regularity[has_gaps] = (
+        np.bincount(gap_group, weights=within, minlength=group_count)[has_gaps]
+        / gap_count[has_gaps]
+    )
+
+    occurrences = gap_count + 1
+    recent = d[ends - 1] + 2 * expected >= today
+    periodic = (
+        has_gaps
+        & (occurrences >= min_occurrences)
+        & (regularity >= min_regularity)
+        & recent
+    )
+    return PeriodicGroups(
+        group=g[starts][periodic],
+        period_index=period_index[periodic],
+        occurrences=occurrences[periodic],
+        regularity=regularity[periodic],
+        first=order[starts][periodic],
+        last=order[ends - 1][periodic],
+    )
@@ -0,0 +1,116 @@
+"""Coalescing of identical concurrent reads (single-flight).
+
+While a call for a key is in flight, later callers with the same key wait
+for its outcome instead of starting their own. Nothing is kept once the
+call finishes, so this never serves stale data; it only collapses bursts,
+e.g. a reconnecting client firing the same requests at once.
+
+Use ``coalesce_response`` on read-only routes (callers share one DB
+execution and one serialized body), ``single_flight`` on service methods,
+or ``SingleFlightDep`` for ad-hoc keys.
+"""
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Hashable
+from functools import wraps
+from typing import Annotated, Any, get_type_hints
+
+from fastapi import Depends, Response
+from pydantic import TypeAdapter
+
+from app.core.cache import AsyncMethod, params_digest
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by a hashable request key."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a call for ``key`` is in flight; share its outcome.
+
+        If the leading caller is cancelled (e.g. its client disconnected),
+        a waiting caller takes over and runs ``fn`` itself.
+        """
+        while (future := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no warning when nobody waited
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+_flights = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """The process-wide single-flight registry."""
+    return _flights
+
+
+SingleFlightDep = Annotated[SingleFlight, Depends(get_single_flight)]
+
+
+def single_flight(namespace: str) -> Callable[[AsyncMethod], AsyncMethod]:
+    """Coalesce concurrent calls of a method with equal arguments.
+
+    Sessions and ``self`` are not part of the key, so callers holding
+    different sessions or service instances share one execution.
+    """
+
+    def decorator(method: AsyncMethod) -> AsyncMethod:
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            key = (namespace, params_digest(signature, args, kwargs))
+            return await _flights.do(key, lambda: method(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def coalesce_response(endpoint: AsyncMethod) -> AsyncMethod:
+    """Coalesce a read-only route by its resolved parameters.
+
+    The route's parameters (including the current user) form the key; the
+    leader's result is serialized once and the same JSON body is returned
+    to every caller. The return annotation still documents the response.
+    """
+    signature = inspect.signature(endpoint)
+    adapter = TypeAdapter(get_type_hints(endpoint)["return"])
+    namespace = f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+    async def render(kwargs: dict[str, Any]) -> bytes:
+        return adapter.dump_json(await endpoint(**kwargs))
+
+    @wraps(endpoint)
+    async def wrapper(**kwargs) -> Response:
+        key = (namespace, params_digest(signature, (), kwargs))
+        body = await _flights.do(key, lambda: render(kwargs))
+        return Response(content=body, media_type="application/json")
+
+    return wrapper
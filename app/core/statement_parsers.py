@@ -0,0 +1,103 @@
+"""Incremental parsers for bank statement files.
+
+Parsers consume an async stream of byte chunks and yield one record at a
+time, so memory use depends on the chunk size rather than the file size.
+"""
+
+import codecs
+import csv
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+
+# Tags inside an OFX <STMTTRN> block. SGML (OFX 1.x) leaves have no closing
+# tag, so a value runs until the next "<" or end of line.
+_OFX_FIELD = re.compile(r"<([A-Z0-9.]+)>([^<\r\n]*)", re.IGNORECASE)
+_OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+
+# Limits on one CSV record, so an unterminated quote cannot swallow the file
+MAX_RECORD_CHARS = 64 * 1024
+MAX_RECORD_LINES = 100
+
+
+async def iter_text(
+    chunks: AsyncIterable[bytes], encoding: str = "utf-8-sig"
+) -> AsyncIterator[str]:
+    """Decode byte chunks incrementally, never splitting a character."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_lines(chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Split text chunks into lines, keeping only the unfinished line buffered."""
+    pending = ""
+    async for chunk in chunks:
+        pending += chunk
+        # The last line stays pending even if complete: a trailing "\r" may
+        # be the first half of "\r\n".
+        *lines, pending = pending.splitlines(keepends=True)
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(
+    lines: AsyncIterable[str], delimiter: str = ","
+) -> AsyncIterator[list[str]]:
+    """Parse CSV lines into field lists.
+
+    Physical lines are joined while a quoted field is open (odd number of
+    quote characters), so quoted newlines are handled without buffering
+    more than one record. Raises ``csv.Error`` for a record longer than
+    ``MAX_RECORD_CHARS`` or ``MAX_RECORD_LINES``, usually a stray quote.
+    """
+    parts: list[str] = []
+    size = 0
+    quoted = False
+    async for line in lines:
+        parts.append(line)
+        size += len(line)
+        quoted ^= line.count('"') % 2 == 1
+        if size > MAX_RECORD_CHARS or len(parts) > MAX_RECORD_LINES:
+            raise csv.Error("record too long (unterminated quoted field?)")
+        if quoted:
+            continue
+        fields = next(csv.reader(["".join(parts)], delimiter=delimiter), [])
+        parts, size = [], 0
+        if any(field.strip() for field in fields):
+            yield fields
+    if parts:
+        fields = next(csv.reader(["".join(parts)], delimiter=delimiter), [])
+        if any(field.strip() for field in fields):
+            yield fields
+
+
+async def iter_ofx_transactions(
+    chunks: AsyncIterable[str],
+) -> AsyncIterator[dict[str, str]]:
+    """Yield the fields of each <STMTTRN> block of an OFX 1.x/2.x statement.
+
+    Field names are upper-cased (e.g. ``TRNAMT``, ``DTPOSTED``, ``NAME``).
+    """
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        end = 0
+        for match in _OFX_TRANSACTION.finditer(buffer):
+            end = match.end()
+            yield {
+                name.upper(): value.strip()
+                for name, value in _OFX_FIELD.findall(match.group(1))
+            }
+        if end:
+            buffer = buffer[end:]
+        else:
+            # Drop text before the next block start to keep the buffer small
+            start = buffer.upper().rfind("<STMTTRN>")
+            buffer = buffer[start:] if start >= 0 else buffer[-16:]
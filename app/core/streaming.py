@@ -0,0 +1,43 @@
+"""Helpers for streaming generated files to the client."""
+
+import io
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable file that hands written bytes back in chunks.
+
+    Writers such as ``zipfile.ZipFile`` write into the buffer while the
+    caller periodically ``drain``s it into a streaming response, so only the
+    bytes produced since the last drain are held in memory.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._pending = 0
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._pending += len(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes written since the last drain."""
+        return self._pending
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self._pending = 0
+        return data
@@ -55,3 +55,10 @@ class ConflictError(AppException):
 
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class ServiceUnavailableError(AppException):
+    """Feature unavailable in this deployment."""
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
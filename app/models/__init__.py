@@ -1,8 +1,14 @@
 from app.models.account import Account
+from app.models.anomaly import Anomaly, AnomalyRefresh
 from app.models.budget import Budget
 from app.models.category import Category
+from app.models.daily_rollup import DailyRollup
+from app.models.posting import Posting
+from app.models.recurring_rule import RecurringRule
+from app.models.recurring_suggestion import RecurringSuggestion
 from app.models.tag import Tag
 from app.models.transaction import Transaction, TransactionTag
+from app.models.transaction_import import TransactionImportRow
 from app.models.user import User
 
 __all__ = [
@@ -13,4 +19,11 @@ __all__ = [
     "Budget",
     "Transaction",
     "TransactionTag",
+    "Posting",
+    "TransactionImportRow",
+    "RecurringRule",
+    "RecurringSuggestion",
+    "DailyRollup",
+    "Anomaly",
+    "AnomalyRefresh",
 ]
@@ -5,6 +5,7 @@ from uuid import UUID
 from sqlmodel import Field, SQLModel
 
 from app.models.base import TimestampMixin, UUIDMixin
+from app.models.types import Money
 
 
 class AccountType(str, Enum):
@@ -23,10 +24,8 @@ class Account(UUIDMixin, TimestampMixin, SQLModel, table=True):
     user_id: UUID = Field(foreign_key="users.id", index=True)
     name: str = Field(max_length=100)
     type: AccountType = Field(default=AccountType.CASH)
-    balance: Decimal = Field(default=Decimal("0"), max_digits=15, decimal_places=2)
-    initial_balance: Decimal = Field(
-        default=Decimal("0"), max_digits=15, decimal_places=2
-    )
+    balance: Decimal = Field(default=Decimal("0"), sa_type=Money)
+    initial_balance: Decimal = Field(default=Decimal("0"), sa_type=Money)
     icon: str | None = Field(default=None, max_length=50)
     color: str | None = Field(default=None, max_length=20)
     is_default: bool = Field(default=False)
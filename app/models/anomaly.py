@@ -0,0 +1,98 @@
+import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, Index, event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlmodel import Field, SQLModel
+
+from app.models.base import TimestampMixin, UUIDMixin
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import Money
+
+# Transaction attributes the anomaly scores depend on
+ANOMALY_FIELDS = ("amount", "type", "category_id", "date")
+
+
+class AnomalyKind(str, Enum):
+    TRANSACTION = "transaction"
+    CATEGORY_MONTH = "category_month"
+
+
+class Anomaly(UUIDMixin, TimestampMixin, SQLModel, table=True):
+    """Transaction or category-month far above the usual amount.
+
+    Anomalies are derived data: a user's rows are replaced whenever their
+    history is re-analysed. ``date`` is the transaction's date, or the first
+    day of the month for category-months.
+    """
+
+    __tablename__ = "anomalies"
+    __table_args__ = (
+        Index("ix_anomalies_user_id_kind_date", "user_id", "kind", "date"),
+    )
+
+    user_id: UUID = Field(foreign_key="users.id")
+    kind: AnomalyKind
+    type: TransactionType
+    category_id: UUID | None = Field(
+        default=None, foreign_key="categories.id", ondelete="CASCADE"
+    )
+    transaction_id: UUID | None = Field(
+        default=None, foreign_key="transactions.id", ondelete="CASCADE"
+    )
+    date: datetime.date
+    amount: Decimal = Field(sa_type=Money)
+    # Median of the group the amount is compared with
+    expected: Decimal = Field(sa_type=Money)
+    # Robust z-score: distance from the median in scaled MADs
+    score: float
+
+
+class AnomalyRefresh(SQLModel, table=True):
+    """Users whose transactions changed since their anomalies were computed."""
+
+    __tablename__ = "anomaly_refreshes"
+
+    user_id: UUID = Field(foreign_key="users.id", primary_key=True)
+    requested_at: datetime.datetime = Field(sa_type=TIMESTAMP(timezone=True))
+
+
+def request_refresh(dialect_name: str):
+    """INSERT ... ON CONFLICT statement marking users' anomalies as stale.
+
+    Execute with ``{"user_id", "requested_at"}`` rows; an existing mark
+    moves to the newer request time.
+    """
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    statement = dialect.insert(AnomalyRefresh)
+    return statement.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"requested_at": statement.excluded.requested_at},
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_stale_anomalies(session: Session, flush_context) -> None:
+    """Mark users whose transactions were inserted, changed or deleted."""
+    user_ids = {
+        obj.user_id
+        for obj in (*session.new, *session.deleted)
+        if isinstance(obj, Transaction)
+    }
+    user_ids |= {
+        obj.user_id
+        for obj in session.dirty
+        if isinstance(obj, Transaction)
+        and any(inspect(obj).attrs[f].history.has_changes() for f in ANOMALY_FIELDS)
+    }
+    if not user_ids:
+        return
+    now = datetime.datetime.now(datetime.UTC)
+    connection = session.connection()
+    connection.execute(
+        request_refresh(connection.dialect.name),
+        [{"user_id": user_id, "requested_at": now} for user_id in user_ids],
+    )
@@ -6,6 +6,7 @@ from uuid import UUID
 from sqlmodel import Field, SQLModel
 
 from app.models.base import TimestampMixin, UUIDMixin
+from app.models.types import Money
 
 
 class BudgetPeriod(str, Enum):
@@ -21,7 +22,7 @@ class Budget(UUIDMixin, TimestampMixin, SQLModel, table=True):
 
     user_id: UUID = Field(foreign_key="users.id", index=True)
     category_id: UUID = Field(foreign_key="categories.id", index=True)
-    amount: Decimal = Field(max_digits=15, decimal_places=2)
+    amount: Decimal = Field(sa_type=Money)
     period: BudgetPeriod
     start_date: datetime.date = Field(default_factory=datetime.date.today)
     is_active: bool = Field(default=True)
@@ -0,0 +1,168 @@
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import Index, delete, event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlmodel import Field, SQLModel
+
+from app.models.base import UUIDMixin
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import Money
+
+# Columns identifying a rollup row; also the transaction fields it depends on
+ROLLUP_KEY = ("user_id", "date", "type", "category_id", "account_id")
+
+RollupKey = tuple[UUID, datetime.date, TransactionType, UUID | None, UUID]
+
+# Unique index and conflict target for ROLLUP_KEY. SQLite has no NULLS NOT
+# DISTINCT, so a missing category is indexed as the nil UUID instead.
+ROLLUP_INDEX = (
+    "user_id",
+    "date",
+    "type",
+    text("coalesce(category_id, '00000000-0000-0000-0000-000000000000')"),
+    "account_id",
+)
+
+
+class DailyRollup(UUIDMixin, SQLModel, table=True):
+    """Per-day totals of a user's transactions by type, category and account.
+
+    Rollups are derived data: every transaction insert, update and delete
+    adjusts the matching row in the same database transaction, so statistics
+    can sum a few rows per day instead of every transaction.
+    """
+
+    __tablename__ = "daily_rollups"
+    __table_args__ = (Index("ux_daily_rollups_key", *ROLLUP_INDEX, unique=True),)
+
+    user_id: UUID = Field(foreign_key="users.id")
+    date: datetime.date
+    type: TransactionType
+    category_id: UUID | None = Field(
+        default=None, foreign_key="categories.id", ondelete="CASCADE"
+    )
+    account_id: UUID = Field(foreign_key="accounts.id", ondelete="CASCADE")
+    amount: Decimal = Field(sa_type=Money)
+    transaction_count: int
+
+
+class RollupDeltas(defaultdict[RollupKey, list]):
+    """Pending [amount, count] changes per rollup key."""
+
+    def __init__(self):
+        super().__init__(lambda: [Decimal(0), 0])
+
+    def add(self, key: RollupKey, amount: Decimal, count: int = 1) -> None:
+        delta = self[key]
+        delta[0] += amount
+        delta[1] += count
+
+    def add_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Count transaction column dicts (e.g. from a bulk insert) as new."""
+        for row in rows:
+            self.add(
+                (
+                    row["user_id"],
+                    row["date"],
+                    row["type"],
+                    row.get("category_id"),
+                    row["account_id"],
+                ),
+                row["amount"],
+            )
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Rows for ``upsert_rollups``, skipping keys whose changes cancel out."""
+        return [
+            {
+                "id": uuid4(),
+                **dict(zip(ROLLUP_KEY, key, strict=True)),
+                "amount": amount,
+                "transaction_count": count,
+            }
+            for key, (amount, count) in self.items()
+            if amount or count
+        ]
+
+
+def upsert_rollups(dialect_name: str):
+    """INSERT .. ON CONFLICT statement adding row amounts and counts to rollups.
+
+    Execute it with a list of ``RollupDeltas.rows()``. Negative deltas
+    subtract from existing rows.
+    """
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    statement = dialect.insert(DailyRollup)
+    return statement.on_conflict_do_update(
+        index_elements=list(ROLLUP_INDEX),
+        set_={
+            "amount": DailyRollup.amount + statement.excluded.amount,
+            "transaction_count": (
+                DailyRollup.transaction_count + statement.excluded.transaction_count
+            ),
+        },
+    )
+
+
+def prune_rollups(rows: Iterable[Mapping[str, Any]]):
+    """DELETE statement for rollup rows emptied by the given delta rows."""
+    rows = [row for row in rows if row["transaction_count"] < 0]
+    return delete(DailyRollup).where(
+        DailyRollup.user_id.in_({row["user_id"] for row in rows}),
+        DailyRollup.date.in_({row["date"] for row in rows}),
+        DailyRollup.transaction_count == 0,
+    )
+
+
+def _committed_key(transaction: Transaction) -> RollupKey:
+    """Rollup key of a transaction as it was before pending changes."""
+    state = inspect(transaction)
+    values = []
+    for field in ROLLUP_KEY:
+        history = state.attrs[field].history
+        values.append(
+            history.deleted[0] if history.deleted else getattr(transaction, field)
+        )
+    return tuple(values)
+
+
+def _committed_amount(transaction: Transaction) -> Decimal:
+    history = inspect(transaction).attrs["amount"].history
+    return history.deleted[0] if history.deleted else transaction.amount
+
+
+def _current_key(transaction: Transaction) -> RollupKey:
+    return tuple(getattr(transaction, field) for field in ROLLUP_KEY)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_rollups(session: Session, flush_context) -> None:
+    """Apply the rollup changes of transactions inserted, changed or deleted."""
+    deltas = RollupDeltas()
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            deltas.add(_current_key(obj), obj.amount)
+    for obj in session.dirty:
+        if not isinstance(obj, Transaction):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[f].history.has_changes() for f in (*ROLLUP_KEY, "amount")):
+            deltas.add(_committed_key(obj), -_committed_amount(obj), -1)
+            deltas.add(_current_key(obj), obj.amount)
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            deltas.add(_committed_key(obj), -_committed_amount(obj), -1)
+
+    rows = deltas.rows()
+    if not rows:
+        return
+    connection = session.connection()
+    connection.execute(upsert_rollups(connection.dialect.name), rows)
+    if any(row["transaction_count"] < 0 for row in rows):
+        connection.execute(prune_rollups(rows))
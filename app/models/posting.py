@@ -0,0 +1,121 @@
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from sqlalchemy import Index, delete, event, insert, inspect, text
+from sqlalchemy.orm import Session
+from sqlmodel import Field, SQLModel
+
+from app.models.base import UUIDMixin
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import Money
+
+# Transaction attributes that determine its postings
+POSTING_FIELDS = ("amount", "type", "account_id", "to_account_id", "date")
+
+
+class Posting(UUIDMixin, SQLModel, table=True):
+    """Signed per-account leg of a transaction (double-entry ledger row).
+
+    Expenses and income have one leg; transfers have an outgoing leg on
+    ``account_id`` and an incoming leg on ``to_account_id``. Postings are
+    derived data and are kept in sync with ``Transaction`` on every flush.
+    """
+
+    __tablename__ = "postings"
+    __table_args__ = (
+        Index(
+            "ix_postings_user_id_account_id_date",
+            "user_id",
+            "account_id",
+            text("date DESC"),
+            postgresql_include=["amount", "type", "transaction_id"],
+        ),
+    )
+
+    user_id: UUID = Field(foreign_key="users.id")
+    transaction_id: UUID = Field(
+        foreign_key="transactions.id", ondelete="CASCADE", index=True
+    )
+    account_id: UUID = Field(foreign_key="accounts.id")
+    type: TransactionType
+    date: datetime.date
+    amount: Decimal = Field(sa_type=Money)
+
+
+def posting_legs(
+    transaction_type: TransactionType,
+    account_id: UUID,
+    to_account_id: UUID | None,
+    amount: Decimal,
+) -> list[tuple[UUID, Decimal]]:
+    """Signed (account_id, amount) legs for a transaction."""
+    if transaction_type == TransactionType.INCOME:
+        return [(account_id, amount)]
+    if transaction_type == TransactionType.TRANSFER and to_account_id:
+        return [(account_id, -amount), (to_account_id, amount)]
+    return [(account_id, -amount)]
+
+
+def balance_deltas(transactions: Iterable[Transaction]) -> dict[UUID, Decimal]:
+    """Net balance change per account for a set of new transactions."""
+    deltas: dict[UUID, Decimal] = defaultdict(Decimal)
+    for transaction in transactions:
+        for account_id, amount in posting_legs(
+            transaction.type,
+            transaction.account_id,
+            transaction.to_account_id,
+            transaction.amount,
+        ):
+            deltas[account_id] += amount
+    return dict(deltas)
+
+
+def postings_for(transaction: Transaction) -> list[dict]:
+    """Posting rows for a transaction, ready for a bulk insert."""
+    return [
+        {
+            "id": uuid4(),
+            "user_id": transaction.user_id,
+            "transaction_id": transaction.id,
+            "account_id": account_id,
+            "type": transaction.type,
+            "date": transaction.date,
+            "amount": amount,
+        }
+        for account_id, amount in posting_legs(
+            transaction.type,
+            transaction.account_id,
+            transaction.to_account_id,
+            transaction.amount,
+        )
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_postings(session: Session, flush_context) -> None:
+    """Rewrite postings of transactions inserted, changed or deleted by a flush."""
+    stale: list[UUID] = []
+    rows: list[dict] = []
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            rows += postings_for(obj)
+    for obj in session.dirty:
+        if not isinstance(obj, Transaction):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[f].history.has_changes() for f in POSTING_FIELDS):
+            stale.append(obj.id)
+            rows += postings_for(obj)
+    # Postgres cascades the delete; SQLite without foreign keys does not.
+    stale += [obj.id for obj in session.deleted if isinstance(obj, Transaction)]
+
+    if not stale and not rows:
+        return
+    connection = session.connection()
+    if stale:
+        connection.execute(delete(Posting).where(Posting.transaction_id.in_(stale)))
+    if rows:
+        connection.execute(insert(Posting), rows)
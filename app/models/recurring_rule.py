@@ -0,0 +1,80 @@
+import calendar
+import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from app.models.base import TimestampMixin, UUIDMixin
+from app.models.transaction import TransactionType
+from app.models.types import Money, UUIDArray
+
+
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+class RecurringRule(UUIDMixin, TimestampMixin, SQLModel, table=True):
+    """Schedule that materializes a transaction on every occurrence.
+
+    ``occurrence_count`` is the index of the next occurrence counted from
+    ``start_date``; dates are always derived from the start date, so a rule
+    starting on Jan 31 runs on Feb 28 and then Mar 31 rather than drifting.
+    """
+
+    __tablename__ = "recurring_rules"
+    __table_args__ = (
+        # Due-rule scan of the materializer
+        Index(
+            "ix_recurring_rules_next_date",
+            "next_date",
+            postgresql_where="is_active",
+        ),
+    )
+
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    amount: Decimal = Field(sa_type=Money)
+    type: TransactionType
+    category_id: UUID | None = Field(default=None, foreign_key="categories.id")
+    account_id: UUID = Field(foreign_key="accounts.id")
+    to_account_id: UUID | None = Field(default=None, foreign_key="accounts.id")
+    note: str | None = Field(default=None, max_length=500)
+    tag_ids: list[UUID] = Field(default_factory=list, sa_type=UUIDArray)
+    frequency: RecurrenceFrequency
+    interval: int = Field(default=1)
+    start_date: datetime.date
+    end_date: datetime.date | None = Field(default=None)
+    next_date: datetime.date
+    occurrence_count: int = Field(default=0)
+    is_active: bool = Field(default=True)
+
+    def occurrence_date(self, index: int) -> datetime.date:
+        """Date of the occurrence with the given 0-based index."""
+        return occurrence_date(self.start_date, self.frequency, self.interval, index)
+
+
+def occurrence_date(
+    start_date: datetime.date,
+    frequency: RecurrenceFrequency,
+    interval: int,
+    index: int,
+) -> datetime.date:
+    """Date of the ``index``-th occurrence of a schedule starting on start_date.
+
+    Monthly and yearly schedules clamp to the last day of shorter months.
+    """
+    steps = index * interval
+    if frequency == RecurrenceFrequency.DAILY:
+        return start_date + datetime.timedelta(days=steps)
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return start_date + datetime.timedelta(weeks=steps)
+    months = steps * 12 if frequency == RecurrenceFrequency.YEARLY else steps
+    year, month = divmod(start_date.month - 1 + months, 12)
+    year += start_date.year
+    day = min(start_date.day, calendar.monthrange(year, month + 1)[1])
+    return datetime.date(year, month + 1, day)
@@ -0,0 +1,44 @@
+import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+from app.models.base import TimestampMixin, UUIDMixin
+from app.models.recurring_rule import RecurrenceFrequency
+from app.models.transaction import TransactionType
+from app.models.types import Money
+
+
+class SuggestionStatus(str, Enum):
+    PENDING = "pending"
+    ACCEPTED = "accepted"
+    DISMISSED = "dismissed"
+
+
+class RecurringSuggestion(UUIDMixin, TimestampMixin, SQLModel, table=True):
+    """Recurring payment detected in a user's history.
+
+    Pending suggestions are replaced on every analysis run; accepted and
+    dismissed ones are kept so the same payment is not suggested again.
+    A payment is identified by account, type and normalized note.
+    """
+
+    __tablename__ = "recurring_suggestions"
+
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    account_id: UUID = Field(foreign_key="accounts.id")
+    category_id: UUID | None = Field(default=None, foreign_key="categories.id")
+    type: TransactionType
+    note_key: str = Field(max_length=500)
+    note: str | None = Field(default=None, max_length=500)
+    amount: Decimal = Field(sa_type=Money)
+    frequency: RecurrenceFrequency
+    interval: int
+    occurrences: int
+    first_date: datetime.date
+    last_date: datetime.date
+    next_date: datetime.date
+    confidence: float
+    status: SuggestionStatus = Field(default=SuggestionStatus.PENDING)
@@ -3,9 +3,12 @@ from decimal import Decimal
 from enum import Enum
 from uuid import UUID
 
+from sqlalchemy import Index, event, text
 from sqlmodel import Field, SQLModel
 
+from app.core.fingerprint import FINGERPRINT_LENGTH, transaction_fingerprint
 from app.models.base import TimestampMixin, UUIDMixin
+from app.models.types import Money, UUIDArray
 
 
 class TransactionType(str, Enum):
@@ -18,23 +21,90 @@ class Transaction(UUIDMixin, TimestampMixin, SQLModel, table=True):
     """Transaction model for financial records."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Default listing order of TransactionRepository.get_by_user
+        Index(
+            "ix_transactions_user_id_date_created_at",
+            "user_id",
+            text("date DESC"),
+            text("created_at DESC"),
+        ),
+        # Statistics sums by type over a date range (index-only on Postgres)
+        Index(
+            "ix_transactions_user_id_type_date",
+            "user_id",
+            "type",
+            "date",
+            postgresql_include=["amount", "category_id"],
+        ),
+        Index(
+            "ix_transactions_user_id_category_id_date",
+            "user_id",
+            "category_id",
+            "date",
+        ),
+        Index(
+            "ix_transactions_user_id_account_id_date",
+            "user_id",
+            "account_id",
+            "date",
+        ),
+        Index(
+            "ix_transactions_user_id_to_account_id",
+            "user_id",
+            "to_account_id",
+        ),
+        Index("ix_transactions_tag_ids", "tag_ids", postgresql_using="gin"),
+        # Batched duplicate lookups and the duplicate report
+        Index("ix_transactions_user_id_fingerprint", "user_id", "fingerprint"),
+        Index(
+            "ix_transactions_recurring_rule_id_date",
+            "recurring_rule_id",
+            "date",
+        ),
+    )
 
-    user_id: UUID = Field(foreign_key="users.id", index=True)
-    amount: Decimal = Field(max_digits=15, decimal_places=2)
+    user_id: UUID = Field(foreign_key="users.id")
+    amount: Decimal = Field(sa_type=Money)
     type: TransactionType
     category_id: UUID | None = Field(
         default=None, foreign_key="categories.id", index=True
     )
     account_id: UUID = Field(foreign_key="accounts.id", index=True)
     to_account_id: UUID | None = Field(default=None, foreign_key="accounts.id")
-    date: datetime.date = Field(index=True)
+    date: datetime.date
     note: str | None = Field(default=None, max_length=500)
+    # Denormalized copy of transaction_tags, which stays the source of truth
+    tag_ids: list[UUID] = Field(default_factory=list, sa_type=UUIDArray)
+    # Content hash used to detect likely duplicates, see app.core.fingerprint
+    fingerprint: str | None = Field(default=None, max_length=FINGERPRINT_LENGTH)
+    # Rule that materialized this transaction, if any
+    recurring_rule_id: UUID | None = Field(
+        default=None, foreign_key="recurring_rules.id", ondelete="SET NULL"
+    )
+
+    def compute_fingerprint(self) -> str:
+        return transaction_fingerprint(
+            self.account_id, self.date, self.amount, self.type, self.note
+        )
+
+
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _set_fingerprint(mapper, connection, target: Transaction) -> None:
+    """Keep the fingerprint in step with the fields it is derived from."""
+    target.fingerprint = target.compute_fingerprint()
 
 
 class TransactionTag(SQLModel, table=True):
     """Many-to-many relationship between transactions and tags."""
 
     __tablename__ = "transaction_tags"
+    __table_args__ = (
+        # The primary key serves transaction -> tags; this serves tag ->
+        # transactions (tag statistics, tag deletes)
+        Index("ix_transaction_tags_tag_id_transaction_id", "tag_id", "transaction_id"),
+    )
 
     transaction_id: UUID = Field(foreign_key="transactions.id", primary_key=True)
     tag_id: UUID = Field(foreign_key="tags.id", primary_key=True)
@@ -0,0 +1,31 @@
+import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+from app.core.fingerprint import FINGERPRINT_LENGTH
+from app.models.transaction import TransactionType
+from app.models.types import Money
+
+
+class TransactionImportRow(SQLModel, table=True):
+    """Staging row of a statement import, merged into transactions in bulk.
+
+    Rows live only for the duration of one import; ``id`` and ``posting_id``
+    are pre-generated so the merge is a plain INSERT ... SELECT on any
+    database.
+    """
+
+    __tablename__ = "transaction_import_rows"
+
+    id: UUID = Field(primary_key=True)
+    import_id: UUID = Field(index=True)
+    posting_id: UUID
+    user_id: UUID
+    account_id: UUID
+    type: TransactionType
+    date: datetime.date
+    amount: Decimal = Field(sa_type=Money)
+    note: str | None = Field(default=None, max_length=500)
+    fingerprint: str = Field(max_length=FINGERPRINT_LENGTH)
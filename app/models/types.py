@@ -0,0 +1,226 @@
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    Numeric,
+    Uuid,
+    cast,
+    func,
+    literal,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeDecorator
+
+from app.config import get_settings
+from app.core.money import MINOR_UNITS, from_minor, to_minor
+
+
+class MoneyStorage(str, Enum):
+    NUMERIC = "numeric"
+    MINOR_UNITS = "minor_units"
+
+
+class Money(TypeDecorator):
+    """Decimal amount stored either as NUMERIC(15, 2) or as BIGINT minor units.
+
+    The Python side always sees ``Decimal``; the storage format is chosen by
+    ``Settings.money_storage`` unless passed explicitly.
+    """
+
+    impl = Numeric(15, 2)
+    cache_ok = True
+
+    def __init__(self, storage: MoneyStorage | None = None):
+        super().__init__()
+        self.storage = storage
+
+    @property
+    def resolved_storage(self) -> MoneyStorage:
+        return MoneyStorage(self.storage or get_settings().money_storage)
+
+    @property
+    def python_type(self) -> type:
+        return Decimal
+
+    def load_dialect_impl(self, dialect):
+        if self.resolved_storage is MoneyStorage.MINOR_UNITS:
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(Numeric(15, 2))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or self.resolved_storage is MoneyStorage.NUMERIC:
+            return value
+        return to_minor(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if self.resolved_storage is MoneyStorage.MINOR_UNITS:
+            return from_minor(value)
+        return Decimal(value)
+
+
+def minor_units(expr: ColumnElement) -> ColumnElement[int]:
+    """SQL expression for a ``Money`` column as integer minor units."""
+    if expr.type.resolved_storage is MoneyStorage.MINOR_UNITS:
+        return type_coerce(expr, BigInteger)
+    return cast(func.round(expr * MINOR_UNITS), BigInteger)
+
+
+def sum_minor(
+    expr: ColumnElement, where: ColumnElement[bool] | None = None
+) -> ColumnElement[int]:
+    """``SUM`` of a ``Money`` column in integer minor units (0 when empty).
+
+    With ``where``, only rows matching the condition are summed, so several
+    differently filtered totals can share one scan.
+    """
+    if where is None:
+        total = func.sum(minor_units(expr))
+    else:
+        total = sum_filter(minor_units(expr), where)
+    return cast(func.coalesce(total, 0), BigInteger)
+
+
+class UUIDArray(TypeDecorator):
+    """List of UUIDs: ``UUID[]`` on Postgres, a JSON array elsewhere."""
+
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(Uuid()))
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return list(value)
+        return [str(v) for v in value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return []
+        return [v if isinstance(v, UUID) else UUID(v) for v in value]
+
+
+class array_contains(FunctionElement):
+    """``column @> values`` on Postgres; ``fallback`` on other dialects.
+
+    ``fallback`` is an equivalent boolean expression for databases without
+    array operators (e.g. an EXISTS against the source join table).
+    """
+
+    type = Boolean()
+    name = "array_contains"
+    inherit_cache = True
+
+    def __init__(
+        self,
+        column: ColumnElement,
+        values: list[UUID],
+        fallback: ColumnElement[bool],
+    ):
+        super().__init__(column, literal(list(values), ARRAY(Uuid())), fallback)
+
+
+@compiles(array_contains)
+def _compile_array_contains(element, compiler, **kw):
+    _, _, fallback = element.clauses
+    return compiler.process(fallback, **kw)
+
+
+@compiles(array_contains, "postgresql")
+def _compile_array_contains_postgresql(element, compiler, **kw):
+    column, values, _ = element.clauses
+    return f"{compiler.process(column, **kw)} @> {compiler.process(values, **kw)}"
+
+
+class sum_filter(FunctionElement):
+    """``SUM(expr) FILTER (WHERE condition)`` on Postgres.
+
+    Other dialects get the equivalent ``SUM(CASE WHEN condition THEN expr
+    END)``, which also works on SQLite builds older than 3.30.
+    """
+
+    type = BigInteger()
+    name = "sum_filter"
+    inherit_cache = True
+
+    def __init__(self, expr: ColumnElement, condition: ColumnElement[bool]):
+        super().__init__(expr, condition)
+
+
+@compiles(sum_filter)
+def _compile_sum_filter(element, compiler, **kw):
+    expr, condition = element.clauses
+    return (
+        f"SUM(CASE WHEN {compiler.process(condition, **kw)} "
+        f"THEN {compiler.process(expr, **kw)} END)"
+    )
+
+
+@compiles(sum_filter, "postgresql")
+def _compile_sum_filter_postgresql(element, compiler, **kw):
+    expr, condition = element.clauses
+    return (
+        f"SUM({compiler.process(expr, **kw)}) "
+        f"FILTER (WHERE {compiler.process(condition, **kw)})"
+    )
+
+
+class date_bucket(FunctionElement):
+    """First day of the day/week/month/year containing a date column.
+
+    ``date_trunc`` on Postgres; SQLite date modifiers elsewhere. Weeks start
+    on Monday in both.
+    """
+
+    type = Date()
+    name = "date_bucket"
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("unit", InternalTraversal.dp_string)
+    ]
+
+    def __init__(self, unit: str, column: ColumnElement):
+        if unit not in _SQLITE_BUCKET_MODIFIERS:
+            raise ValueError(f"Unknown date bucket {unit!r}")
+        self.unit = unit
+        super().__init__(column)
+
+
+# SQLite date() modifiers that move a date to the start of its bucket
+_SQLITE_BUCKET_MODIFIERS = {
+    "day": "",
+    "week": ", 'weekday 0', '-6 days'",
+    "month": ", 'start of month'",
+    "year": ", 'start of year'",
+}
+
+
+@compiles(date_bucket)
+def _compile_date_bucket(element, compiler, **kw):
+    (column,) = element.clauses
+    modifiers = _SQLITE_BUCKET_MODIFIERS[element.unit]
+    return f"date({compiler.process(column, **kw)}{modifiers})"
+
+
+@compiles(date_bucket, "postgresql")
+def _compile_date_bucket_postgresql(element, compiler, **kw):
+    (column,) = element.clauses
+    return (
+        f"CAST(date_trunc('{element.unit}', {compiler.process(column, **kw)}) AS DATE)"
+    )
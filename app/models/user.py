@@ -27,3 +27,6 @@ class User(UUIDMixin, TimestampMixin, SQLModel, table=True):
     theme: ThemeMode = Field(default=ThemeMode.SYSTEM)
     currency: str = Field(default="TWD", max_length=10)
     locale: str = Field(default="zh-TW", max_length=10)
+
+    # Incremented with every write to the user's data (see app.core.cache)
+    data_version: int = Field(default=0)
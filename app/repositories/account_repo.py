@@ -1,10 +1,12 @@
+from datetime import UTC, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.account import Account
+from app.models.types import Money
 from app.repositories.base import BaseRepository
 
 
@@ -34,6 +36,40 @@ class AccountRepository(BaseRepository[Account]):
         )
         return result.scalar_one_or_none()
 
+    async def get_owned_ids(self, account_ids: list[UUID], user_id: UUID) -> set[UUID]:
+        """Get which of the given account IDs belong to the user."""
+        if not account_ids:
+            return set()
+        result = await self.session.execute(
+            select(Account.id).where(
+                Account.id.in_(account_ids), Account.user_id == user_id
+            )
+        )
+        return set(result.scalars().all())
+
+    async def apply_balance_deltas(self, deltas: dict[UUID, Decimal]) -> None:
+        """Add a delta to each account's balance in one executemany UPDATE.
+
+        Balances are incremented in SQL, so concurrent writers cannot lose
+        updates. Account objects already loaded in the session are not
+        refreshed.
+        """
+        if not deltas:
+            return
+        accounts = Account.__table__
+        await self.session.execute(
+            update(accounts)
+            .where(accounts.c.id == bindparam("account_id"))
+            .values(
+                balance=accounts.c.balance + bindparam("delta", type_=Money()),
+                updated_at=datetime.now(UTC),
+            ),
+            [
+                {"account_id": account_id, "delta": delta}
+                for account_id, delta in deltas.items()
+            ],
+        )
+
     async def get_total_balance(self, user_id: UUID) -> Decimal:
         """Get total balance across all non-archived accounts."""
         result = await self.session.execute(
@@ -0,0 +1,110 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, date, datetime
+from uuid import UUID
+
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.anomaly import Anomaly, AnomalyKind, AnomalyRefresh, request_refresh
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import minor_units
+from app.repositories.base import BaseRepository
+
+
+class AnomalyRepository(BaseRepository[Anomaly]):
+    """Repository for Anomaly model and the pending refresh marks."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, Anomaly)
+
+    async def lock_user(self, user_id: UUID) -> None:
+        """Hold the user's analysis lock until the transaction ends.
+
+        On SQLite the database-wide write lock already serializes analyses.
+        """
+        connection = await self.session.connection()
+        if connection.dialect.name == "postgresql":
+            key = int.from_bytes(user_id.bytes[:8], "big", signed=True)
+            await self.session.execute(select(func.pg_advisory_xact_lock(key)))
+
+    async def get_by_user(
+        self,
+        user_id: UUID,
+        kind: AnomalyKind | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[Anomaly]:
+        """Get a user's anomalies, most recent first."""
+        query = select(Anomaly).where(Anomaly.user_id == user_id)
+        if kind:
+            query = query.where(Anomaly.kind == kind)
+        if start_date:
+            query = query.where(Anomaly.date >= start_date)
+        if end_date:
+            query = query.where(Anomaly.date <= end_date)
+        result = await self.session.execute(
+            query.order_by(Anomaly.date.desc(), Anomaly.score.desc())
+        )
+        return list(result.scalars().all())
+
+    async def delete_by_user(self, user_id: UUID) -> None:
+        """Delete all anomalies of a user."""
+        await self.session.execute(delete(Anomaly).where(Anomaly.user_id == user_id))
+
+    async def stream_history(
+        self, user_id: UUID, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield batches of (id, type, category_id, date, minor amount) for the
+        user's income and expenses."""
+        result = await self.session.stream(
+            select(
+                Transaction.id,
+                Transaction.type,
+                Transaction.category_id,
+                Transaction.date,
+                minor_units(Transaction.amount),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.type != TransactionType.TRANSFER,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def mark_stale(self, user_id: UUID) -> None:
+        """Request a refresh for writes the ORM cannot see (Core inserts)."""
+        connection = await self.session.connection()
+        await self.session.execute(
+            request_refresh(connection.dialect.name),
+            [{"user_id": user_id, "requested_at": datetime.now(UTC)}],
+        )
+
+    async def get_refresh_request(self, user_id: UUID) -> datetime | None:
+        """When the user's anomalies were last marked stale, if they are."""
+        return await self.session.scalar(
+            select(AnomalyRefresh.requested_at).where(AnomalyRefresh.user_id == user_id)
+        )
+
+    async def get_user_ids_with_history(self) -> list[UUID]:
+        """Get IDs of users that have any transactions."""
+        result = await self.session.execute(select(Transaction.user_id).distinct())
+        return list(result.scalars().all())
+
+    async def get_stale_user_ids(self) -> list[UUID]:
+        """Get IDs of users with a pending refresh request."""
+        result = await self.session.execute(select(AnomalyRefresh.user_id))
+        return list(result.scalars().all())
+
+    async def clear_refresh_request(
+        self, user_id: UUID, requested_at: datetime
+    ) -> None:
+        """Drop the user's refresh mark unless a write renewed it after
+        ``requested_at`` (the request the analysis started from)."""
+        await self.session.execute(
+            delete(AnomalyRefresh).where(
+                AnomalyRefresh.user_id == user_id,
+                AnomalyRefresh.requested_at <= requested_at,
+            )
+        )
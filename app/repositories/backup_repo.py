@@ -0,0 +1,66 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionTag
+from app.models.user import User
+from app.repositories.base import BaseRepository
+
+
+class BackupRepository:
+    """Repository for whole-account exports and restores across tables."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def stream_rows(
+        self,
+        model: type[SQLModel],
+        user_id: UUID,
+        batch_size: int,
+        exclude: tuple[str, ...] = (),
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield a user's rows of one table through a server-side cursor."""
+        table = model.__table__
+        query = select(*(c for c in table.columns if c.name not in exclude))
+        if model is User:
+            query = query.where(table.c.id == user_id)
+        elif model is TransactionTag:
+            query = query.join(
+                Transaction, Transaction.id == table.c.transaction_id
+            ).where(Transaction.user_id == user_id)
+        else:
+            query = query.where(table.c.user_id == user_id)
+
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for row in result.mappings():
+            yield dict(row)
+
+    async def has_data(self, user_id: UUID) -> bool:
+        """Check whether the user owns any accounts, categories, tags or budgets."""
+        result = await self.session.execute(
+            select(
+                exists().where(Account.user_id == user_id)
+                | exists().where(Category.user_id == user_id)
+                | exists().where(Tag.user_id == user_id)
+                | exists().where(Budget.user_id == user_id)
+                | exists().where(Transaction.user_id == user_id)
+            )
+        )
+        return bool(result.scalar_one())
+
+    async def insert_rows(
+        self, model: type[SQLModel], rows: list[dict[str, Any]]
+    ) -> None:
+        """Bulk insert rows into a table, using COPY on asyncpg."""
+        await BaseRepository(self.session, model).bulk_insert(rows)
@@ -1,8 +1,11 @@
-from typing import Generic, TypeVar
+from enum import Enum
+from typing import Any, Generic, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Column, insert, select
+from sqlalchemy.engine import Dialect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel
 
 ModelT = TypeVar("ModelT", bound=SQLModel)
@@ -40,3 +43,50 @@ class BaseRepository(Generic[ModelT]):
         """Delete a record."""
         await self.session.delete(obj)
         await self.session.flush()
+
+    async def bulk_insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert many rows in one round trip, using COPY on asyncpg.
+
+        Rows are plain column dicts; Python-side column defaults are filled
+        in for missing keys. No ORM events fire for these rows.
+        """
+        if not rows:
+            return
+        table = self.model.__table__
+        connection = await self.session.connection()
+        if connection.dialect.driver != "asyncpg":
+            await self.session.execute(insert(table), rows)
+            return
+
+        columns = [
+            c for c in table.columns if c.name in rows[0] or c.default is not None
+        ]
+        records = [
+            tuple(
+                _copy_value(column, _row_value(column, row), connection.dialect)
+                for column in columns
+            )
+            for row in rows
+        ]
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=[c.name for c in columns]
+        )
+
+
+def _row_value(column: Column, row: dict[str, Any]) -> Any:
+    if column.name in row:
+        return row[column.name]
+    if column.default.is_callable:
+        return column.default.arg(None)
+    return column.default.arg
+
+
+def _copy_value(column: Column, value: Any, dialect: Dialect) -> Any:
+    """Convert a Python value to what COPY expects for the column."""
+    if isinstance(column.type, TypeDecorator):
+        value = column.type.process_bind_param(value, dialect)
+    if isinstance(value, Enum):
+        # SQLAlchemy stores enums by member name
+        value = value.name
+    return value
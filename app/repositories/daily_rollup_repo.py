@@ -0,0 +1,58 @@
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.money import from_minor
+from app.models.daily_rollup import (
+    ROLLUP_KEY,
+    DailyRollup,
+    RollupDeltas,
+    prune_rollups,
+    upsert_rollups,
+)
+from app.models.transaction import Transaction
+from app.models.types import sum_minor
+from app.repositories.base import BaseRepository
+
+
+class DailyRollupRepository(BaseRepository[DailyRollup]):
+    """Repository for DailyRollup model (pre-aggregated statistics)."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, DailyRollup)
+
+    async def apply_deltas(self, deltas: RollupDeltas) -> None:
+        """Add pending amount and count changes to the rollup rows.
+
+        Used by write paths that bypass the ORM flush (bulk Core inserts).
+        """
+        rows = deltas.rows()
+        if not rows:
+            return
+        connection = await self.session.connection()
+        await self.session.execute(upsert_rollups(connection.dialect.name), rows)
+        if any(row["transaction_count"] < 0 for row in rows):
+            await self.session.execute(prune_rollups(rows))
+
+    async def rebuild(self, user_id: UUID) -> int:
+        """Recompute a user's rollups from their transactions.
+
+        Returns the number of rollup rows written.
+        """
+        await self.session.execute(
+            delete(DailyRollup).where(DailyRollup.user_id == user_id)
+        )
+        key = [getattr(Transaction, column) for column in ROLLUP_KEY]
+        result = await self.session.execute(
+            select(*key, sum_minor(Transaction.amount), func.count(Transaction.id))
+            .where(Transaction.user_id == user_id)
+            .group_by(*key)
+        )
+        deltas = RollupDeltas()
+        for *values, amount, count in result.all():
+            deltas.add(tuple(values), from_minor(amount), count)
+        rows = deltas.rows()
+        if rows:
+            await self.session.execute(insert(DailyRollup), rows)
+        return len(rows)
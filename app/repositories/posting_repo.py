@@ -0,0 +1,36 @@
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.money import from_minor
+from app.models.posting import Posting
+from app.models.types import sum_minor
+from app.repositories.base import BaseRepository
+
+
+class PostingRepository(BaseRepository[Posting]):
+    """Repository for Posting model (read side of the ledger)."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, Posting)
+
+    async def get_balance_changes(
+        self,
+        user_id: UUID,
+        account_ids: list[UUID] | None = None,
+    ) -> dict[UUID, Decimal]:
+        """Net posted amount per account, derived with one SUM over postings.
+
+        Adding an account's ``initial_balance`` gives its ledger balance.
+        """
+        query = (
+            select(Posting.account_id, sum_minor(Posting.amount).label("amount"))
+            .where(Posting.user_id == user_id)
+            .group_by(Posting.account_id)
+        )
+        if account_ids is not None:
+            query = query.where(Posting.account_id.in_(account_ids))
+        result = await self.session.execute(query)
+        return {row.account_id: from_minor(row.amount) for row in result.all()}
@@ -0,0 +1,61 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.recurring_rule import RecurringRule
+from app.models.transaction import Transaction
+from app.repositories.base import BaseRepository
+
+
+class RecurringRuleRepository(BaseRepository[RecurringRule]):
+    """Repository for RecurringRule model."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RecurringRule)
+
+    async def get_by_user(self, user_id: UUID) -> list[RecurringRule]:
+        """Get all recurring rules for a user, soonest first."""
+        result = await self.session.execute(
+            select(RecurringRule)
+            .where(RecurringRule.user_id == user_id)
+            .order_by(RecurringRule.is_active.desc(), RecurringRule.next_date)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(self, id: UUID, user_id: UUID) -> RecurringRule | None:
+        """Get a recurring rule by ID and user."""
+        result = await self.session.execute(
+            select(RecurringRule).where(
+                RecurringRule.id == id, RecurringRule.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def lock_due(self, today: date, limit: int) -> list[RecurringRule]:
+        """Lock up to ``limit`` active rules due on or before today.
+
+        Rules locked by a concurrent materializer are skipped, so several
+        workers can run at once without creating an occurrence twice.
+        """
+        result = await self.session.execute(
+            select(RecurringRule)
+            .where(
+                RecurringRule.is_active == True,  # noqa: E712
+                RecurringRule.next_date <= today,
+            )
+            .order_by(RecurringRule.next_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def get_last_materialized_date(self, rule_id: UUID) -> date | None:
+        """Get the date of the latest transaction created by a rule."""
+        result = await self.session.execute(
+            select(func.max(Transaction.date)).where(
+                Transaction.recurring_rule_id == rule_id
+            )
+        )
+        return result.scalar_one()
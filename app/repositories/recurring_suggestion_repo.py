@@ -0,0 +1,102 @@
+from collections.abc import AsyncIterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.recurring_suggestion import RecurringSuggestion, SuggestionStatus
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import minor_units
+from app.repositories.base import BaseRepository
+
+
+class RecurringSuggestionRepository(BaseRepository[RecurringSuggestion]):
+    """Repository for RecurringSuggestion model."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RecurringSuggestion)
+
+    async def get_pending(self, user_id: UUID) -> list[RecurringSuggestion]:
+        """Get pending suggestions, most confident first."""
+        result = await self.session.execute(
+            select(RecurringSuggestion)
+            .where(
+                RecurringSuggestion.user_id == user_id,
+                RecurringSuggestion.status == SuggestionStatus.PENDING,
+            )
+            .order_by(
+                RecurringSuggestion.confidence.desc(),
+                RecurringSuggestion.next_date,
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id_and_user(
+        self, id: UUID, user_id: UUID
+    ) -> RecurringSuggestion | None:
+        """Get a suggestion by ID and user."""
+        result = await self.session.execute(
+            select(RecurringSuggestion).where(
+                RecurringSuggestion.id == id, RecurringSuggestion.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_resolved_keys(
+        self, user_id: UUID
+    ) -> set[tuple[UUID, TransactionType, str]]:
+        """Get (account_id, type, note_key) of accepted or dismissed suggestions."""
+        result = await self.session.execute(
+            select(
+                RecurringSuggestion.account_id,
+                RecurringSuggestion.type,
+                RecurringSuggestion.note_key,
+            ).where(
+                RecurringSuggestion.user_id == user_id,
+                RecurringSuggestion.status != SuggestionStatus.PENDING,
+            )
+        )
+        return {tuple(row) for row in result.all()}
+
+    async def delete_pending(self, user_id: UUID) -> None:
+        """Delete a user's pending suggestions."""
+        await self.session.execute(
+            delete(RecurringSuggestion).where(
+                RecurringSuggestion.user_id == user_id,
+                RecurringSuggestion.status == SuggestionStatus.PENDING,
+            )
+        )
+
+    async def stream_history(
+        self, user_id: UUID, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield batches of (note, account_id, type, category_id, date, minor
+        amount) for the user's noted, non-transfer transactions.
+
+        Transactions created by a recurring rule are already automated and
+        are left out.
+        """
+        result = await self.session.stream(
+            select(
+                Transaction.note,
+                Transaction.account_id,
+                Transaction.type,
+                Transaction.category_id,
+                Transaction.date,
+                minor_units(Transaction.amount),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.type != TransactionType.TRANSFER,
+                Transaction.note.is_not(None),
+                Transaction.recurring_rule_id.is_(None),
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_user_ids_with_history(self) -> list[UUID]:
+        """Get IDs of users that have any transactions."""
+        result = await self.session.execute(select(Transaction.user_id).distinct())
+        return list(result.scalars().all())
@@ -1,6 +1,7 @@
+from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tag import Tag
@@ -49,3 +50,27 @@ class TagRepository(BaseRepository[Tag]):
             select(Tag).where(Tag.id.in_(tag_ids), Tag.user_id == user_id)
         )
         return list(result.scalars().all())
+
+    async def increment_usage(self, counts: dict[tuple[UUID, UUID], int]) -> None:
+        """Add to usage counts keyed by (user_id, tag_id) in one executemany.
+
+        Tag IDs not owned by the paired user are left untouched.
+        """
+        if not counts:
+            return
+        tags = Tag.__table__
+        await self.session.execute(
+            update(tags)
+            .where(
+                tags.c.id == bindparam("tag_id"),
+                tags.c.user_id == bindparam("owner_id"),
+            )
+            .values(
+                usage_count=tags.c.usage_count + bindparam("count"),
+                updated_at=datetime.now(UTC),
+            ),
+            [
+                {"owner_id": user_id, "tag_id": tag_id, "count": count}
+                for (user_id, tag_id), count in counts.items()
+            ],
+        )
@@ -0,0 +1,130 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, case, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.money import from_minor
+from app.models.account import Account
+from app.models.daily_rollup import RollupDeltas
+from app.models.posting import Posting
+from app.models.transaction import Transaction, TransactionType
+from app.models.transaction_import import TransactionImportRow
+from app.models.types import UUIDArray, sum_minor
+from app.repositories.base import BaseRepository
+from app.repositories.daily_rollup_repo import DailyRollupRepository
+
+
+class TransactionImportRepository(BaseRepository[TransactionImportRow]):
+    """Repository for staged statement imports."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, TransactionImportRow)
+
+    async def merge(self, import_id: UUID) -> int:
+        """Move staged rows into transactions, postings, rollups and balances.
+
+        Every step is a single set-based statement regardless of row count.
+        Returns the number of transactions created.
+        """
+        staged = TransactionImportRow
+        is_staged = staged.import_id == import_id
+        signed_amount = case(
+            (staged.type == TransactionType.INCOME, staged.amount),
+            else_=-staged.amount,
+        )
+        now = literal(datetime.now(UTC), TIMESTAMP(timezone=True))
+
+        result = await self.session.execute(
+            insert(Transaction).from_select(
+                [
+                    "id",
+                    "user_id",
+                    "amount",
+                    "type",
+                    "account_id",
+                    "date",
+                    "note",
+                    "fingerprint",
+                    "tag_ids",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    staged.id,
+                    staged.user_id,
+                    staged.amount,
+                    staged.type,
+                    staged.account_id,
+                    staged.date,
+                    staged.note,
+                    staged.fingerprint,
+                    literal([], UUIDArray()),
+                    now,
+                    now,
+                ).where(is_staged),
+            )
+        )
+        imported = result.rowcount
+
+        await self.session.execute(
+            insert(Posting).from_select(
+                [
+                    "id",
+                    "user_id",
+                    "transaction_id",
+                    "account_id",
+                    "type",
+                    "date",
+                    "amount",
+                ],
+                select(
+                    staged.posting_id,
+                    staged.user_id,
+                    staged.id,
+                    staged.account_id,
+                    staged.type,
+                    staged.date,
+                    signed_amount,
+                ).where(is_staged),
+            )
+        )
+
+        delta = (
+            select(func.coalesce(func.sum(signed_amount), 0))
+            .where(is_staged, staged.account_id == Account.id)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(Account)
+            .where(Account.id.in_(select(staged.account_id).where(is_staged)))
+            .values(balance=Account.balance + delta, updated_at=now)
+            .execution_options(synchronize_session="fetch")
+        )
+
+        # Rollups get one aggregate per day, type and account of the import
+        rollup_key = (staged.user_id, staged.date, staged.type, staged.account_id)
+        totals = await self.session.execute(
+            select(*rollup_key, sum_minor(staged.amount), func.count(staged.id))
+            .where(is_staged)
+            .group_by(*rollup_key)
+        )
+        deltas = RollupDeltas()
+        for user_id, day, transaction_type, account_id, amount, count in totals:
+            deltas.add(
+                (user_id, day, transaction_type, None, account_id),
+                from_minor(amount),
+                count,
+            )
+        await DailyRollupRepository(self.session).apply_deltas(deltas)
+
+        await self.discard(import_id)
+        return imported
+
+    async def discard(self, import_id: UUID) -> None:
+        """Delete the staged rows of an import."""
+        await self.session.execute(
+            delete(TransactionImportRow).where(
+                TransactionImportRow.import_id == import_id
+            )
+        )
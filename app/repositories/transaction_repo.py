@@ -1,12 +1,21 @@
+from collections.abc import AsyncIterator, Collection, Sequence
 from datetime import date
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import ColumnElement, Row, delete, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.models.account import Account
+from app.models.category import Category
+from app.models.posting import Posting
 from app.models.transaction import Transaction, TransactionTag, TransactionType
+from app.models.types import array_contains
 from app.repositories.base import BaseRepository
 
+# Fingerprints per IN (...) list, well below bind parameter limits
+FINGERPRINT_LOOKUP_CHUNK = 1000
+
 
 class TransactionRepository(BaseRepository[Transaction]):
     """Repository for Transaction model."""
@@ -33,31 +42,74 @@ class TransactionRepository(BaseRepository[Transaction]):
         if category_id:
             query = query.where(Transaction.category_id == category_id)
         if account_id:
-            query = query.where(
-                (Transaction.account_id == account_id)
-                | (Transaction.to_account_id == account_id)
+            # One range scan over the account's postings covers both transfer legs
+            legs = select(Posting.transaction_id).where(
+                Posting.user_id == user_id,
+                Posting.account_id == account_id,
             )
+            if start_date:
+                legs = legs.where(Posting.date >= start_date)
+            if end_date:
+                legs = legs.where(Posting.date <= end_date)
+            query = query.where(Transaction.id.in_(legs))
         if start_date:
             query = query.where(Transaction.date >= start_date)
         if end_date:
             query = query.where(Transaction.date <= end_date)
         if search_query:
             query = query.where(Transaction.note.ilike(f"%{search_query}%"))
+        if tag_id:
+            query = query.where(has_tag(tag_id))
 
         query = query.order_by(Transaction.date.desc(), Transaction.created_at.desc())
         result = await self.session.execute(query)
-        transactions = list(result.scalars().all())
+        return list(result.scalars().all())
 
-        # Filter by tag if specified
-        if tag_id:
-            filtered = []
-            for t in transactions:
-                tag_ids = await self.get_tag_ids(t.id)
-                if tag_id in tag_ids:
-                    filtered.append(t)
-            return filtered
+    async def stream_export_rows(
+        self,
+        user_id: UUID,
+        batch_size: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield batches of flat export rows from a server-side cursor.
+
+        Rows carry account and category names alongside the ids, in date
+        order.
+        """
+        to_account = aliased(Account)
+        query = (
+            select(
+                Transaction.id,
+                Transaction.date,
+                Transaction.type,
+                Transaction.amount,
+                Transaction.account_id,
+                Account.name.label("account_name"),
+                Transaction.to_account_id,
+                to_account.name.label("to_account_name"),
+                Transaction.category_id,
+                Category.name.label("category_name"),
+                Transaction.note,
+                Transaction.tag_ids,
+                Transaction.created_at,
+            )
+            .join(Account, Account.id == Transaction.account_id)
+            .outerjoin(to_account, to_account.id == Transaction.to_account_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(Transaction.user_id == user_id)
+        )
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+        query = query.order_by(Transaction.date, Transaction.created_at)
 
-        return transactions
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
 
     async def get_by_id_and_user(self, id: UUID, user_id: UUID) -> Transaction | None:
         """Get a transaction by ID and user."""
@@ -68,21 +120,80 @@ class TransactionRepository(BaseRepository[Transaction]):
         )
         return result.scalar_one_or_none()
 
-    async def get_tag_ids(self, transaction_id: UUID) -> list[UUID]:
-        """Get tag IDs for a transaction."""
+    async def find_by_fingerprints(
+        self, user_id: UUID, fingerprints: Collection[str]
+    ) -> dict[str, UUID]:
+        """Map each known fingerprint to the oldest transaction carrying it."""
+        unique = list(dict.fromkeys(fingerprints))
+        matches: dict[str, UUID] = {}
+        for i in range(0, len(unique), FINGERPRINT_LOOKUP_CHUNK):
+            result = await self.session.execute(
+                select(Transaction.fingerprint, Transaction.id)
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.fingerprint.in_(
+                        unique[i : i + FINGERPRINT_LOOKUP_CHUNK]
+                    ),
+                )
+                .order_by(Transaction.created_at.desc())
+            )
+            matches.update(result.all())
+        return matches
+
+    async def get_duplicates(
+        self,
+        user_id: UUID,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[Transaction]:
+        """Get transactions sharing a fingerprint with at least one other.
+
+        Results are ordered by fingerprint so callers can group them.
+        """
+        groups = (
+            select(Transaction.fingerprint)
+            .where(Transaction.user_id == user_id)
+            .group_by(Transaction.fingerprint)
+            .having(func.count() > 1)
+        )
+        if start_date:
+            groups = groups.where(Transaction.date >= start_date)
+        if end_date:
+            groups = groups.where(Transaction.date <= end_date)
+
         result = await self.session.execute(
-            select(TransactionTag.tag_id).where(
-                TransactionTag.transaction_id == transaction_id
+            select(Transaction)
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint.in_(groups),
+            )
+            .order_by(
+                Transaction.date.desc(),
+                Transaction.fingerprint,
+                Transaction.created_at,
             )
         )
-        return [row[0] for row in result.all()]
+        return list(result.scalars().all())
+
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        """Insert transactions and their tag links in batched statements."""
+        self.session.add_all(transactions)
+        await self.session.flush()
+        self.session.add_all(
+            TransactionTag(transaction_id=transaction.id, tag_id=tag_id)
+            for transaction in transactions
+            for tag_id in transaction.tag_ids
+        )
+        await self.session.flush()
+
+    async def set_tags(self, transaction: Transaction, tag_ids: list[UUID]) -> None:
+        """Set tags for a transaction and refresh its denormalized tag_ids."""
+        tag_ids = list(dict.fromkeys(tag_ids))
 
-    async def set_tags(self, transaction_id: UUID, tag_ids: list[UUID]) -> None:
-        """Set tags for a transaction."""
         # Remove existing tags
         await self.session.execute(
             delete(TransactionTag).where(
-                TransactionTag.transaction_id == transaction_id
+                TransactionTag.transaction_id == transaction.id
             )
         )
         await self.session.flush()
@@ -90,15 +201,33 @@ class TransactionRepository(BaseRepository[Transaction]):
         # Add new tags
         for tag_id in tag_ids:
             self.session.add(
-                TransactionTag(transaction_id=transaction_id, tag_id=tag_id)
+                TransactionTag(transaction_id=transaction.id, tag_id=tag_id)
             )
+        transaction.tag_ids = tag_ids
         await self.session.flush()
 
-    async def clear_tags(self, transaction_id: UUID) -> None:
+    async def clear_tags(self, transaction: Transaction) -> None:
         """Clear all tags from a transaction."""
         await self.session.execute(
             delete(TransactionTag).where(
-                TransactionTag.transaction_id == transaction_id
+                TransactionTag.transaction_id == transaction.id
             )
         )
+        transaction.tag_ids = []
         await self.session.flush()
+
+
+def has_tag(tag_id: UUID) -> ColumnElement[bool]:
+    """Filter transactions carrying a tag.
+
+    Uses the GIN-indexed tag_ids array on Postgres and the transaction_tags
+    join table elsewhere.
+    """
+    return array_contains(
+        Transaction.tag_ids,
+        [tag_id],
+        exists().where(
+            TransactionTag.transaction_id == Transaction.id,
+            TransactionTag.tag_id == tag_id,
+        ),
+    )
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,3 +17,8 @@ class UserRepository(BaseRepository[User]):
         """Get a user by email."""
         result = await self.session.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
+
+    async def get_all_ids(self) -> list[UUID]:
+        """Get the IDs of all users."""
+        result = await self.session.execute(select(User.id))
+        return list(result.scalars().all())
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.statistics.schemas import AnomalyResponse
+from app.config import get_settings
+from app.core.money import from_minor
+from app.core.outliers import gap_filled_sums, np, robust_z_scores
+from app.exceptions import ServiceUnavailableError
+from app.models.anomaly import Anomaly, AnomalyKind
+from app.repositories.anomaly_repo import AnomalyRepository
+
+logger = logging.getLogger(__name__)
+
+# Modified z-score above which an amount is flagged (Iglewicz and Hoaglin)
+SCORE_THRESHOLD = 3.5
+# History a category needs before its spread is trusted
+MIN_TRANSACTIONS = 8
+MIN_MONTHS = 6
+
+
+class AnomalyService:
+    """Service for detecting unusually large transactions and months."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = AnomalyRepository(session)
+        self.settings = get_settings()
+
+    def _to_response(self, anomaly: Anomaly) -> AnomalyResponse:
+        return AnomalyResponse(
+            id=anomaly.id,
+            kind=anomaly.kind,
+            type=anomaly.type,
+            category_id=anomaly.category_id,
+            transaction_id=anomaly.transaction_id,
+            date=anomaly.date,
+            amount=anomaly.amount,
+            expected=anomaly.expected,
+            score=anomaly.score,
+        )
+
+    async def get_anomalies(
+        self,
+        user_id: UUID,
+        kind: AnomalyKind | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[AnomalyResponse]:
+        """Get the user's anomalies as of the last analysis.
+
+        Analyses run in ``refresh_stale_anomalies``, not on read.
+        """
+        anomalies = await self.repo.get_by_user(user_id, kind, start_date, end_date)
+        return [self._to_response(a) for a in anomalies]
+
+    async def refresh(self, user_id: UUID, today: date | None = None) -> int:
+        """Re-analyse the user's whole history and replace their anomalies.
+
+        Transactions are scored within their (type, category) and monthly
+        totals within the category's months up to the current one, empty
+        months included; all groups are scored in a few NumPy passes.
+        Concurrent analyses of the same user wait for each other, so their
+        delete-and-insert cannot interleave. Returns the number of anomalies
+        found.
+        """
+        if np is None:
+            raise ServiceUnavailableError(
+                "Anomaly detection requires numpy (install the 'analytics' extra)"
+            )
+        today = today or date.today()
+        await self.repo.lock_user(user_id)
+        requested_at = await self.repo.get_refresh_request(user_id)
+
+        keys: dict[tuple[Any, UUID | None], int] = {}
+        key_codes: list[int] = []
+        ids: list[UUID] = []
+        dates: list[date] = []
+        amounts: list[int] = []
+        async for rows in self.repo.stream_history(
+            user_id, self.settings.analysis_batch_size
+        ):
+            batch_ids, types, categories, batch_dates, minor = zip(*rows, strict=True)
+            key_codes += [
+                keys.setdefault(key, len(keys))
+                for key in zip(types, categories, strict=True)
+            ]
+            ids += batch_ids
+            dates += batch_dates
+            amounts += minor
+
+        await self.repo.delete_by_user(user_id)
+        rows = self._find_anomalies(
+            user_id, keys, key_codes, ids, dates, amounts, today
+        )
+        await self.repo.bulk_insert(rows)
+        if requested_at is not None:
+            await self.repo.clear_refresh_request(user_id, requested_at)
+        return len(rows)
+
+    def _find_anomalies(
+        self,
+        user_id: UUID,
+        keys: dict[tuple[Any, UUID | None], int],
+        key_codes: list[int],
+        ids: list[UUID],
+        dates: list[date],
+        amounts: list[int],
+        today: date,
+    ) -> list[dict[str, Any]]:
+        if not key_codes:
+            return []
+        key_list = list(keys)
+        groups = np.array(key_codes, dtype=np.int64)
+        minor_amounts = np.abs(np.array(amounts, dtype=np.int64))
+        rows = []
+
+        scores = robust_z_scores(groups, minor_amounts, len(keys))
+        flagged = (scores.count[groups] >= MIN_TRANSACTIONS) & (
+            scores.score > SCORE_THRESHOLD
+        )
+        for index in np.flatnonzero(flagged).tolist():
+            transaction_type, category_id = key_list[groups[index]]
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "kind": AnomalyKind.TRANSACTION,
+                    "type": transaction_type,
+                    "category_id": category_id,
+                    "transaction_id": ids[index],
+                    "date": dates[index],
+                    "amount": from_minor(int(minor_amounts[index])),
+                    "expected": _median_amount(scores.median[groups[index]]),
+                    "score": round(float(scores.score[index]), 2),
+                }
+            )
+
+        months = np.array(dates, dtype="datetime64[M]").astype(np.int64)
+        month_groups, month_numbers, totals = gap_filled_sums(
+            groups,
+            months,
+            minor_amounts,
+            len(keys),
+            last_period=int(np.datetime64(today, "M").astype(np.int64)),
+        )
+        month_scores = robust_z_scores(month_groups, totals, len(keys))
+        flagged = (month_scores.count[month_groups] >= MIN_MONTHS) & (
+            month_scores.score > SCORE_THRESHOLD
+        )
+        month_starts = month_numbers.astype("datetime64[M]").astype("datetime64[D]")
+        for index in np.flatnonzero(flagged).tolist():
+            group = month_groups[index]
+            transaction_type, category_id = key_list[group]
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "kind": AnomalyKind.CATEGORY_MONTH,
+                    "type": transaction_type,
+                    "category_id": category_id,
+                    "transaction_id": None,
+                    "date": month_starts[index].item(),
+                    "amount": from_minor(int(totals[index])),
+                    "expected": _median_amount(month_scores.median[group]),
+                    "score": round(float(month_scores.score[index]), 2),
+                }
+            )
+        return rows
+
+
+def _median_amount(median: float) -> Decimal:
+    # Medians of an even count fall halfway between two minor units
+    return from_minor(
+        int(Decimal(float(median)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    )
+
+
+async def refresh_stale_anomalies(
+    session_maker: sessionmaker, all_users: bool = False
+) -> int:
+    """Re-analyse users whose transactions changed, one commit per user.
+
+    With ``all_users`` every user with a pending mark or existing history
+    is re-analysed. A user whose analysis fails keeps their mark and is
+    retried on the next run. Returns the number of anomalies found.
+    """
+    async with session_maker() as session:
+        repo = AnomalyRepository(session)
+        user_ids = set(await repo.get_stale_user_ids())
+        if all_users:
+            user_ids.update(await repo.get_user_ids_with_history())
+    total = 0
+    for user_id in user_ids:
+        async with session_maker() as session:
+            try:
+                total += await AnomalyService(session).refresh(user_id)
+                await session.commit()
+            except ServiceUnavailableError:
+                raise
+            except Exception:
+                logger.exception("Anomaly detection failed for user %s", user_id)
+    return total
+
+
+async def run_anomaly_refresher(session_maker: sessionmaker, interval: int) -> None:
+    """Re-analyse stale users every ``interval`` seconds until cancelled."""
+    if np is None:
+        logger.warning("Anomaly detection disabled: numpy is not installed")
+        return
+    while True:
+        try:
+            found = await refresh_stale_anomalies(session_maker)
+            if found:
+                logger.info("Found %d anomalies", found)
+        except Exception:
+            logger.exception("Anomaly refresh failed")
+        await asyncio.sleep(interval)
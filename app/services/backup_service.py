@@ -0,0 +1,309 @@
+import io
+import json
+import zipfile
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import IO, Any
+from uuid import UUID, uuid4, uuid5
+
+import sqlalchemy as sa
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.api.v1.endpoints.users.schemas import RestoreResult
+from app.config import get_settings
+from app.core.cache import mark_user_data_changed
+from app.core.fingerprint import transaction_fingerprint
+from app.core.streaming import ChunkBuffer
+from app.exceptions import BadRequestError, ConflictError, NotFoundError
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.daily_rollup import RollupDeltas
+from app.models.posting import Posting, posting_legs
+from app.models.recurring_rule import RecurringRule
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionTag
+from app.models.types import Money, UUIDArray
+from app.models.user import User
+from app.repositories.anomaly_repo import AnomalyRepository
+from app.repositories.backup_repo import BackupRepository
+from app.repositories.daily_rollup_repo import DailyRollupRepository
+from app.repositories.user_repo import UserRepository
+
+BACKUP_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Archive members in restore (foreign key) order
+BACKUP_TABLES: dict[str, type[SQLModel]] = {
+    "users": User,
+    "accounts": Account,
+    "categories": Category,
+    "tags": Tag,
+    "budgets": Budget,
+    "recurring_rules": RecurringRule,
+    "transactions": Transaction,
+    "transaction_tags": TransactionTag,
+}
+
+# Columns left out of the archive: secrets, and data derived on restore
+EXCLUDED_COLUMNS = {
+    "users": ("password_hash", "data_version"),
+    "transactions": ("fingerprint",),
+}
+
+# User fields carried over onto the restoring user
+RESTORED_USER_FIELDS = ("name", "theme", "currency", "locale")
+
+# Flush the zip stream to the client once this many bytes are pending
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class BackupService:
+    """Service for streaming whole-account backups and restoring them."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = BackupRepository(session)
+        self.rollup_repo = DailyRollupRepository(session)
+        self.user_repo = UserRepository(session)
+        self.settings = get_settings()
+
+    async def stream_backup(self, user_id: UUID) -> AsyncIterator[bytes]:
+        """Check the user exists and return the archive as a byte stream."""
+        user = await self.user_repo.get_by_id(user_id)
+        if not user:
+            raise NotFoundError("User", str(user_id))
+        return self._write_archive(user_id)
+
+    async def _write_archive(self, user_id: UUID) -> AsyncIterator[bytes]:
+        """Write a zip of one NDJSON member per table, draining as it goes.
+
+        Rows come from server-side cursors and the zip is written to a
+        non-seekable buffer (sizes go into data descriptors), so memory use
+        is bounded by the batch size rather than the account size.
+        """
+        buffer = ChunkBuffer()
+        counts: dict[str, int] = {}
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, model in BACKUP_TABLES.items():
+                counts[name] = 0
+                with archive.open(f"{name}.ndjson", "w", force_zip64=True) as member:
+                    async for row in self.repo.stream_rows(
+                        model,
+                        user_id,
+                        self.settings.backup_batch_size,
+                        EXCLUDED_COLUMNS.get(name, ()),
+                    ):
+                        member.write(_dump_row(row))
+                        counts[name] += 1
+                        if buffer.pending >= STREAM_CHUNK_SIZE:
+                            yield buffer.drain()
+            archive.writestr(
+                MANIFEST,
+                json.dumps(
+                    {
+                        "version": BACKUP_VERSION,
+                        "exported_at": datetime.now(UTC).isoformat(),
+                        "counts": counts,
+                    }
+                ),
+            )
+        yield buffer.drain()
+
+    async def restore(self, user_id: UUID, file: UploadFile) -> RestoreResult:
+        """Load a backup archive into a user that has no data yet.
+
+        Every id in the archive is replaced by ``uuid5(namespace, old_id)``
+        with a namespace drawn per restore. The mapping is a pure function,
+        so foreign keys are rewritten row by row without lookup tables, and
+        the same archive can be restored into several users or environments.
+        """
+        user = await self.user_repo.get_by_id(user_id)
+        if not user:
+            raise NotFoundError("User", str(user_id))
+        if await self.repo.has_data(user_id):
+            raise ConflictError("Restore requires an account without existing data")
+
+        try:
+            archive = zipfile.ZipFile(file.file)
+        except zipfile.BadZipFile as e:
+            raise BadRequestError("Backup must be a zip archive") from e
+
+        namespace = uuid4()
+        restored: dict[str, int] = {}
+        with archive:
+            _check_manifest(archive)
+            members = set(archive.namelist())
+            for name, model in BACKUP_TABLES.items():
+                member = f"{name}.ndjson"
+                if member not in members:
+                    continue
+                with archive.open(member) as stream:
+                    if model is User:
+                        restored[name] = self._restore_user(user, stream, member)
+                    else:
+                        restored[name] = await self._restore_table(
+                            model, stream, member, namespace, user_id
+                        )
+        await mark_user_data_changed(self.session, user_id)
+        await AnomalyRepository(self.session).mark_stale(user_id)
+        return RestoreResult(restored=restored)
+
+    def _restore_user(self, user: User, stream: IO[bytes], member: str) -> int:
+        """Copy profile and preference fields onto the restoring user."""
+        for _, record in _iter_records(stream, member):
+            for field in RESTORED_USER_FIELDS:
+                if field in record:
+                    setattr(
+                        user, field, _load_value(User.__table__.c[field], record[field])
+                    )
+            user.updated_at = datetime.now(UTC)
+            return 1
+        return 0
+
+    async def _restore_table(
+        self,
+        model: type[SQLModel],
+        stream: IO[bytes],
+        member: str,
+        namespace: UUID,
+        user_id: UUID,
+    ) -> int:
+        """Remap and bulk insert one table in batches."""
+        columns = [
+            c
+            for c in model.__table__.columns
+            if c.name not in EXCLUDED_COLUMNS.get(model.__tablename__, ())
+        ]
+        batch: list[dict[str, Any]] = []
+        postings: list[dict[str, Any]] = []
+        count = 0
+        for line_number, record in _iter_records(stream, member):
+            try:
+                row = {
+                    c.name: _load_value(c, record[c.name], namespace, user_id)
+                    for c in columns
+                    if c.name in record
+                }
+                if model is Transaction:
+                    row["fingerprint"] = transaction_fingerprint(
+                        row["account_id"],
+                        row["date"],
+                        row["amount"],
+                        row["type"],
+                        row.get("note"),
+                    )
+                    postings += _postings_for(row)
+            except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+                raise BadRequestError(
+                    f"Invalid value in {member} line {line_number}"
+                ) from e
+
+            batch.append(row)
+            count += 1
+            if len(batch) >= self.settings.backup_batch_size:
+                await self._insert(model, batch, postings)
+                batch, postings = [], []
+        await self._insert(model, batch, postings)
+        return count
+
+    async def _insert(
+        self,
+        model: type[SQLModel],
+        rows: list[dict[str, Any]],
+        postings: list[dict[str, Any]],
+    ) -> None:
+        await self.repo.insert_rows(model, rows)
+        # Postings and rollups are derived data, rebuilt rather than archived
+        await self.repo.insert_rows(Posting, postings)
+        if model is Transaction:
+            deltas = RollupDeltas()
+            deltas.add_rows(rows)
+            await self.rollup_repo.apply_deltas(deltas)
+
+
+def _dump_row(row: dict[str, Any]) -> bytes:
+    return (
+        json.dumps(row, default=_json_default, separators=(",", ":")).encode() + b"\n"
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _check_manifest(archive: zipfile.ZipFile) -> None:
+    try:
+        manifest = json.loads(archive.read(MANIFEST))
+    except (KeyError, ValueError) as e:
+        raise BadRequestError("Backup is missing a valid manifest") from e
+    if manifest.get("version") != BACKUP_VERSION:
+        raise BadRequestError(f"Unsupported backup version {manifest.get('version')}")
+
+
+def _iter_records(stream: IO[bytes], member: str):
+    """Yield (line number, record) for each NDJSON line of an archive member."""
+    for line_number, line in enumerate(io.TextIOWrapper(stream, "utf-8"), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise BadRequestError(f"Invalid JSON in {member} line {line_number}") from e
+        if not isinstance(record, dict):
+            raise BadRequestError(f"Invalid record in {member} line {line_number}")
+        yield line_number, record
+
+
+def _load_value(
+    column: sa.Column,
+    value: Any,
+    namespace: UUID | None = None,
+    user_id: UUID | None = None,
+) -> Any:
+    """Convert a JSON value back to the column's Python type, remapping ids."""
+    if value is None:
+        return None
+    column_type = column.type
+    if isinstance(column_type, sa.Uuid):
+        if column.name == "user_id":
+            return user_id
+        return uuid5(namespace, str(UUID(value)))
+    if isinstance(column_type, UUIDArray):
+        return [uuid5(namespace, str(UUID(v))) for v in value]
+    if isinstance(column_type, sa.Enum) and column_type.enum_class:
+        return column_type.enum_class(value)
+    if isinstance(column_type, sa.DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column_type, sa.Date):
+        return date.fromisoformat(value)
+    if isinstance(column_type, (sa.Numeric, Money)):
+        return Decimal(value)
+    return value
+
+
+def _postings_for(row: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": uuid4(),
+            "user_id": row["user_id"],
+            "transaction_id": row["id"],
+            "account_id": account_id,
+            "type": row["type"],
+            "date": row["date"],
+            "amount": amount,
+        }
+        for account_id, amount in posting_legs(
+            row["type"], row["account_id"], row.get("to_account_id"), row["amount"]
+        )
+    ]
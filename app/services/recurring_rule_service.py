@@ -0,0 +1,264 @@
+import asyncio
+import logging
+from datetime import UTC, date, datetime
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.recurring_rules.schemas import (
+    RecurringRuleCreate,
+    RecurringRuleResponse,
+    RecurringRuleUpdate,
+)
+from app.config import get_settings
+from app.exceptions import BadRequestError, NotFoundError
+from app.models.recurring_rule import RecurringRule
+from app.models.transaction import Transaction, TransactionType
+from app.repositories.account_repo import AccountRepository
+from app.repositories.category_repo import CategoryRepository
+from app.repositories.recurring_rule_repo import RecurringRuleRepository
+from app.repositories.tag_repo import TagRepository
+from app.services.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+# Fields that change which dates a rule produces
+SCHEDULE_FIELDS = {"frequency", "interval", "start_date"}
+
+
+class RecurringRuleService:
+    """Service for recurring transaction rules."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = RecurringRuleRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.category_repo = CategoryRepository(session)
+        self.tag_repo = TagRepository(session)
+        self.transaction_service = TransactionService(session)
+
+    def _to_response(self, rule: RecurringRule) -> RecurringRuleResponse:
+        return RecurringRuleResponse(
+            id=rule.id,
+            amount=rule.amount,
+            type=rule.type,
+            category_id=rule.category_id,
+            account_id=rule.account_id,
+            to_account_id=rule.to_account_id,
+            note=rule.note,
+            tag_ids=rule.tag_ids,
+            frequency=rule.frequency,
+            interval=rule.interval,
+            start_date=rule.start_date,
+            end_date=rule.end_date,
+            next_date=rule.next_date,
+            is_active=rule.is_active,
+            created_at=rule.created_at,
+            updated_at=rule.updated_at,
+        )
+
+    async def _validate(self, user_id: UUID, rule: RecurringRule) -> None:
+        """Check the rule only references the user's own records."""
+        if rule.type == TransactionType.TRANSFER and not rule.to_account_id:
+            raise BadRequestError("Transfer requires to_account_id")
+        if rule.end_date and rule.end_date < rule.start_date:
+            raise BadRequestError("end_date must not be before start_date")
+
+        account_ids = [rule.account_id]
+        if rule.to_account_id:
+            account_ids.append(rule.to_account_id)
+        owned = await self.account_repo.get_owned_ids(account_ids, user_id)
+        if rule.account_id not in owned:
+            raise NotFoundError("Account", str(rule.account_id))
+        if rule.to_account_id and rule.to_account_id not in owned:
+            raise NotFoundError("To Account", str(rule.to_account_id))
+
+        if rule.category_id and not await self.category_repo.get_by_id_and_user(
+            rule.category_id, user_id
+        ):
+            raise NotFoundError("Category", str(rule.category_id))
+
+        tags = await self.tag_repo.get_by_ids(rule.tag_ids, user_id)
+        missing = set(rule.tag_ids) - {tag.id for tag in tags}
+        if missing:
+            raise NotFoundError("Tag", str(missing.pop()))
+
+    async def create(
+        self, user_id: UUID, data: RecurringRuleCreate
+    ) -> RecurringRuleResponse:
+        """Create a new recurring rule."""
+        rule = RecurringRule(
+            user_id=user_id,
+            **data.model_dump(exclude={"tag_ids"}),
+            tag_ids=list(dict.fromkeys(data.tag_ids)),
+            next_date=data.start_date,
+        )
+        await self._validate(user_id, rule)
+        rule = await self.repo.create(rule)
+        return self._to_response(rule)
+
+    async def get_all(self, user_id: UUID) -> list[RecurringRuleResponse]:
+        """Get all recurring rules for a user."""
+        rules = await self.repo.get_by_user(user_id)
+        return [self._to_response(r) for r in rules]
+
+    async def get_by_id(self, user_id: UUID, rule_id: UUID) -> RecurringRuleResponse:
+        """Get a single recurring rule."""
+        rule = await self.repo.get_by_id_and_user(rule_id, user_id)
+        if not rule:
+            raise NotFoundError("Recurring rule", str(rule_id))
+        return self._to_response(rule)
+
+    async def update(
+        self,
+        user_id: UUID,
+        rule_id: UUID,
+        data: RecurringRuleUpdate,
+    ) -> RecurringRuleResponse:
+        """Update a recurring rule.
+
+        Schedule changes only affect occurrences after the last one already
+        materialized.
+        """
+        rule = await self.repo.get_by_id_and_user(rule_id, user_id)
+        if not rule:
+            raise NotFoundError("Recurring rule", str(rule_id))
+
+        update_data = data.model_dump(exclude_unset=True)
+        if "tag_ids" in update_data:
+            update_data["tag_ids"] = list(dict.fromkeys(update_data["tag_ids"]))
+        for key, value in update_data.items():
+            setattr(rule, key, value)
+        await self._validate(user_id, rule)
+
+        if SCHEDULE_FIELDS & update_data.keys():
+            last = await self.repo.get_last_materialized_date(rule.id)
+            rule.occurrence_count = 0
+            rule.next_date = rule.start_date
+            while last and rule.next_date <= last:
+                rule.occurrence_count += 1
+                rule.next_date = rule.occurrence_date(rule.occurrence_count)
+        rule.updated_at = datetime.now(UTC)
+
+        rule = await self.repo.update(rule)
+        return self._to_response(rule)
+
+    async def delete(self, user_id: UUID, rule_id: UUID) -> None:
+        """Delete a recurring rule, keeping the transactions it created."""
+        rule = await self.repo.get_by_id_and_user(rule_id, user_id)
+        if not rule:
+            raise NotFoundError("Recurring rule", str(rule_id))
+        await self.repo.delete(rule)
+
+    async def materialize_due(self, today: date, limit: int) -> tuple[int, int]:
+        """Create the due occurrences of up to ``limit`` rules of any user.
+
+        Occurrences of the whole batch go through one bulk insert with one
+        balance delta per account. If that fails, the rules are retried one
+        at a time so a broken rule is deactivated instead of blocking the
+        others. Returns (rules processed, transactions created).
+        """
+        rules = await self.repo.lock_due(today, limit)
+        try:
+            async with self.session.begin_nested():
+                created = await self._materialize(rules, today)
+        except SQLAlchemyError:
+            logger.exception("Recurring batch failed; retrying rule by rule")
+            created = 0
+            for rule in rules:
+                # The rolled back savepoint expired the rule
+                await self.session.refresh(rule)
+                try:
+                    async with self.session.begin_nested():
+                        created += await self._materialize([rule], today)
+                except SQLAlchemyError:
+                    await self.session.refresh(rule)
+                    logger.exception("Deactivating recurring rule %s", rule.id)
+                    self._deactivate(rule)
+        await self.session.flush()
+        return len(rules), created
+
+    async def _materialize(self, rules: list[RecurringRule], today: date) -> int:
+        """Insert the due occurrences of ``rules`` and advance their schedules."""
+        transactions: list[Transaction] = []
+        for rule in rules:
+            try:
+                dates, next_date = _due_dates(rule, today)
+            except (OverflowError, ValueError):
+                logger.exception("Deactivating recurring rule %s", rule.id)
+                self._deactivate(rule)
+                continue
+            transactions += [
+                Transaction(
+                    user_id=rule.user_id,
+                    amount=rule.amount,
+                    type=rule.type,
+                    category_id=rule.category_id,
+                    account_id=rule.account_id,
+                    to_account_id=rule.to_account_id,
+                    date=day,
+                    note=rule.note,
+                    tag_ids=list(rule.tag_ids),
+                    recurring_rule_id=rule.id,
+                )
+                for day in dates
+            ]
+            rule.occurrence_count += len(dates)
+            rule.next_date = next_date
+            if rule.end_date and rule.next_date > rule.end_date:
+                rule.is_active = False
+            rule.updated_at = datetime.now(UTC)
+
+        await self.transaction_service.insert_many(transactions)
+        await self.session.flush()
+        return len(transactions)
+
+    def _deactivate(self, rule: RecurringRule) -> None:
+        rule.is_active = False
+        rule.updated_at = datetime.now(UTC)
+
+
+def _due_dates(rule: RecurringRule, today: date) -> tuple[list[date], date]:
+    """Occurrence dates of ``rule`` due by today, and the date after them."""
+    dates = []
+    next_date = rule.next_date
+    while next_date <= today and (rule.end_date is None or next_date <= rule.end_date):
+        dates.append(next_date)
+        next_date = rule.occurrence_date(rule.occurrence_count + len(dates))
+    return dates, next_date
+
+
+async def materialize_recurring(
+    session_maker: sessionmaker, today: date | None = None
+) -> int:
+    """Materialize all due occurrences, committing one batch of rules at a time.
+
+    Returns the number of transactions created.
+    """
+    today = today or date.today()
+    batch_size = get_settings().recurring_batch_size
+    created = 0
+    while True:
+        async with session_maker() as session:
+            service = RecurringRuleService(session)
+            processed, count = await service.materialize_due(today, batch_size)
+            await session.commit()
+        created += count
+        if processed < batch_size:
+            return created
+
+
+async def run_recurring_materializer(
+    session_maker: sessionmaker, interval: int
+) -> None:
+    """Materialize due occurrences every ``interval`` seconds until cancelled."""
+    while True:
+        try:
+            created = await materialize_recurring(session_maker)
+            if created:
+                logger.info("Materialized %d recurring transactions", created)
+        except Exception:
+            logger.exception("Recurring transaction materialization failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,236 @@
+from datetime import UTC, date, datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.recurring_rules.schemas import (
+    RecurringRuleCreate,
+    RecurringRuleResponse,
+    RecurringSuggestionResponse,
+)
+from app.config import get_settings
+from app.core.fingerprint import normalize_note
+from app.core.money import from_minor
+from app.core.periodicity import amount_bands, find_periodic_groups, np
+from app.exceptions import NotFoundError, ServiceUnavailableError
+from app.models.recurring_rule import RecurrenceFrequency, occurrence_date
+from app.models.recurring_suggestion import RecurringSuggestion, SuggestionStatus
+from app.repositories.recurring_suggestion_repo import (
+    RecurringSuggestionRepository,
+)
+from app.services.recurring_rule_service import RecurringRuleService
+
+# Candidate periods: (mean days, tolerance in days, frequency, interval)
+CANDIDATE_PERIODS = (
+    (7.0, 1.5, RecurrenceFrequency.WEEKLY, 1),
+    (14.0, 2.5, RecurrenceFrequency.WEEKLY, 2),
+    (30.44, 4.0, RecurrenceFrequency.MONTHLY, 1),
+    (91.31, 8.0, RecurrenceFrequency.MONTHLY, 3),
+    (182.62, 12.0, RecurrenceFrequency.MONTHLY, 6),
+    (365.25, 15.0, RecurrenceFrequency.YEARLY, 1),
+)
+
+# A payment's amounts form one band as long as each is within this ratio of
+# the next smaller one, so a price change of a few percent keeps a
+# subscription in one group.
+AMOUNT_BAND_RATIO = 1.2
+# Occurrences at which confidence stops growing with history length
+FULL_CONFIDENCE_OCCURRENCES = 6
+
+
+class RecurringSuggestionService:
+    """Service for detecting recurring payments in transaction history."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = RecurringSuggestionRepository(session)
+        self.rule_service = RecurringRuleService(session)
+        self.settings = get_settings()
+
+    def _to_response(
+        self, suggestion: RecurringSuggestion
+    ) -> RecurringSuggestionResponse:
+        return RecurringSuggestionResponse(
+            id=suggestion.id,
+            account_id=suggestion.account_id,
+            category_id=suggestion.category_id,
+            type=suggestion.type,
+            note=suggestion.note,
+            amount=suggestion.amount,
+            frequency=suggestion.frequency,
+            interval=suggestion.interval,
+            occurrences=suggestion.occurrences,
+            first_date=suggestion.first_date,
+            last_date=suggestion.last_date,
+            next_date=suggestion.next_date,
+            confidence=suggestion.confidence,
+        )
+
+    async def get_pending(self, user_id: UUID) -> list[RecurringSuggestionResponse]:
+        """Get the user's pending suggestions."""
+        suggestions = await self.repo.get_pending(user_id)
+        return [self._to_response(s) for s in suggestions]
+
+    async def refresh(
+        self, user_id: UUID, today: date | None = None
+    ) -> list[RecurringSuggestionResponse]:
+        """Re-analyse the user's whole history and replace pending suggestions.
+
+        History is fetched as plain column tuples in large cursor batches
+        and grouped by (account, type, normalized note, amount band); the
+        periodicity test then runs over all groups in a few NumPy passes.
+        """
+        if np is None:
+            raise ServiceUnavailableError(
+                "Recurring payment detection requires numpy "
+                "(install the 'analytics' extra)"
+            )
+        today = today or date.today()
+
+        keys: dict[tuple[UUID, Any, str], int] = {}
+        note_keys: dict[str, str] = {}
+        key_codes: list[int] = []
+        notes: list[str] = []
+        categories: list[UUID | None] = []
+        dates: list[date] = []
+        amounts: list[int] = []
+        async for rows in self.repo.stream_history(
+            user_id, self.settings.analysis_batch_size
+        ):
+            batch_notes, accounts, types, batch_categories, batch_dates, minor = zip(
+                *rows, strict=True
+            )
+            for note, account_id, transaction_type in zip(
+                batch_notes, accounts, types, strict=True
+            ):
+                note_key = note_keys.get(note)
+                if note_key is None:
+                    note_key = note_keys[note] = normalize_note(note)
+                key_codes.append(
+                    keys.setdefault((account_id, transaction_type, note_key), len(keys))
+                )
+            notes += batch_notes
+            categories += batch_categories
+            dates += batch_dates
+            amounts += minor
+
+        await self.repo.delete_pending(user_id)
+        if not key_codes:
+            return []
+
+        day_numbers = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+        minor_amounts = np.abs(np.array(amounts, dtype=np.int64))
+        groups, band_keys = amount_bands(
+            np.array(key_codes, dtype=np.int64), minor_amounts, AMOUNT_BAND_RATIO
+        )
+
+        found = find_periodic_groups(
+            groups,
+            day_numbers,
+            np.array([p[0] for p in CANDIDATE_PERIODS]),
+            np.array([p[1] for p in CANDIDATE_PERIODS]),
+            today=int(np.datetime64(today, "D").astype(np.int64)),
+        )
+
+        # One suggestion per payment: the band with the longest history
+        resolved = await self.repo.get_resolved_keys(user_id)
+        key_list = list(keys)
+        best: dict[int, dict[str, Any]] = {}
+        for group, period_index, occurrences, regularity, first, last in zip(
+            found.group.tolist(),
+            found.period_index.tolist(),
+            found.occurrences.tolist(),
+            found.regularity.tolist(),
+            found.first.tolist(),
+            found.last.tolist(),
+            strict=True,
+        ):
+            key_code = int(band_keys[group])
+            account_id, transaction_type, note_key = key_list[key_code]
+            if (account_id, transaction_type, note_key) in resolved or not note_key:
+                continue
+            if key_code in best and best[key_code]["occurrences"] >= occurrences:
+                continue
+            _, _, frequency, interval = CANDIDATE_PERIODS[period_index]
+            confidence = regularity * min(
+                1.0, occurrences / FULL_CONFIDENCE_OCCURRENCES
+            )
+            best[key_code] = {
+                "id": uuid4(),
+                "user_id": user_id,
+                "account_id": account_id,
+                "category_id": categories[last],
+                "type": transaction_type,
+                "note_key": note_key,
+                "note": notes[last],
+                "amount": from_minor(int(minor_amounts[last])),
+                "frequency": frequency,
+                "interval": interval,
+                "occurrences": occurrences,
+                "first_date": dates[first],
+                "last_date": dates[last],
+                "next_date": occurrence_date(dates[last], frequency, interval, 1),
+                "confidence": round(confidence, 2),
+                "status": SuggestionStatus.PENDING,
+            }
+
+        await self.repo.bulk_insert(list(best.values()))
+        return await self.get_pending(user_id)
+
+    async def accept(self, user_id: UUID, suggestion_id: UUID) -> RecurringRuleResponse:
+        """Turn a suggestion into a recurring rule starting at its next date."""
+        suggestion = await self._get_pending(user_id, suggestion_id)
+        rule = await self.rule_service.create(
+            user_id,
+            RecurringRuleCreate(
+                amount=suggestion.amount,
+                type=suggestion.type,
+                category_id=suggestion.category_id,
+                account_id=suggestion.account_id,
+                note=suggestion.note,
+                frequency=suggestion.frequency,
+                interval=suggestion.interval,
+                start_date=suggestion.next_date,
+            ),
+        )
+        await self._resolve(suggestion, SuggestionStatus.ACCEPTED)
+        return rule
+
+    async def dismiss(self, user_id: UUID, suggestion_id: UUID) -> None:
+        """Dismiss a suggestion so the payment is not suggested again."""
+        suggestion = await self._get_pending(user_id, suggestion_id)
+        await self._resolve(suggestion, SuggestionStatus.DISMISSED)
+
+    async def _get_pending(
+        self, user_id: UUID, suggestion_id: UUID
+    ) -> RecurringSuggestion:
+        suggestion = await self.repo.get_by_id_and_user(suggestion_id, user_id)
+        if not suggestion or suggestion.status != SuggestionStatus.PENDING:
+            raise NotFoundError("Suggestion", str(suggestion_id))
+        return suggestion
+
+    async def _resolve(
+        self, suggestion: RecurringSuggestion, status: SuggestionStatus
+    ) -> None:
+        suggestion.status = status
+        suggestion.updated_at = datetime.now(UTC)
+        await self.repo.update(suggestion)
+
+
+async def detect_recurring_for_all_users(session_maker: sessionmaker) -> int:
+    """Refresh suggestions of every user with history, one commit per user.
+
+    Returns the number of pending suggestions produced.
+    """
+    async with session_maker() as session:
+        user_ids = await RecurringSuggestionRepository(
+            session
+        ).get_user_ids_with_history()
+    total = 0
+    for user_id in user_ids:
+        async with session_maker() as session:
+            total += len(await RecurringSuggestionService(session).refresh(user_id))
+            await session.commit()
+    return total
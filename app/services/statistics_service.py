@@ -1,17 +1,88 @@
-from datetime import date
-from decimal import Decimal
+from collections.abc import Callable
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import accumulate
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Float, Select, case, func, or_, select, type_coerce
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, sessionmaker
+from sqlalchemy.sql.elements import ColumnElement, Label
 
 from app.api.v1.endpoints.statistics.schemas import (
+    AccountFlow,
+    AccountForecast,
+    AccountStatisticsResponse,
+    AmountDistribution,
+    CalendarResponse,
     CategoryBreakdownResponse,
+    CategoryMatrixResponse,
     CategorySpending,
+    ComparisonResponse,
+    DistributionResponse,
+    FlowLink,
+    FlowNode,
+    FlowNodeType,
+    FlowsResponse,
+    ForecastResponse,
+    HistogramBucket,
+    MatrixCategory,
     MonthlySummaryResponse,
+    PeriodTotals,
+    RollingResponse,
+    RollingWindowSeries,
+    TagBreakdownResponse,
+    TagSpending,
+    TimeBucket,
+    TimeSeriesPoint,
+    TimeSeriesResponse,
 )
+from app.core.cache import (
+    mark_user_data_changed,
+    user_cached,
+)
+from app.core.distribution import group_distributions, histogram_bin, np
+from app.core.forecast import fit_baseline
+from app.core.money import divide_minor, from_minor, percentage_of, to_minor
+from app.exceptions import BadRequestError, ServiceUnavailableError
+from app.models.account import Account
 from app.models.category import Category
-from app.models.transaction import Transaction, TransactionType
+from app.models.daily_rollup import DailyRollup
+from app.models.posting import Posting, posting_legs
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionTag, TransactionType
+from app.models.types import date_bucket, minor_units, sum_minor
+from app.repositories.daily_rollup_repo import DailyRollupRepository
+from app.repositories.recurring_rule_repo import RecurringRuleRepository
+from app.repositories.transaction_repo import has_tag
+from app.repositories.user_repo import UserRepository
+
+# Upper bound on gap-filled points per series (ten years of days)
+MAX_TIMESERIES_POINTS = 3660
+# Upper bound on category matrix columns (ten years of months)
+MAX_MATRIX_MONTHS = 120
+
+# Upper bound on previous periods in a comparison
+MAX_COMPARE_PERIODS = 24
+
+DEFAULT_ROLLING_WINDOWS = (7, 30, 90)
+MAX_ROLLING_WINDOW = 365
+
+# Median, p90 and p99 of amount distributions
+PERCENTILES = (0.5, 0.9, 0.99)
+MAX_HISTOGRAM_BINS = 100
+
+# Forecasts fit their baseline on this many days of history, so their cost
+# does not grow with the age of an account
+FORECAST_HISTORY_DAYS = 730
+MAX_FORECAST_DAYS = 365
+
+# Sankey nodes are keyed by type and category or account id
+NodeKey = tuple[FlowNodeType, UUID | None]
+
+
+def _rollup_count() -> ColumnElement[int]:
+    return func.coalesce(func.sum(DailyRollup.transaction_count), 0)
 
 
 class StatisticsService:
@@ -20,49 +91,42 @@ class StatisticsService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @user_cached("statistics.summary")
     async def get_monthly_summary(
         self,
         user_id: UUID,
         start_date: date,
         end_date: date,
     ) -> MonthlySummaryResponse:
-        """Get monthly income/expense summary."""
-        # Get income total
-        income_result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.type == TransactionType.INCOME)
-            .where(Transaction.date >= start_date)
-            .where(Transaction.date <= end_date)
-        )
-        total_income = income_result.scalar() or Decimal(0)
-
-        # Get expense total
-        expense_result = await self.session.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.type == TransactionType.EXPENSE)
-            .where(Transaction.date >= start_date)
-            .where(Transaction.date <= end_date)
-        )
-        total_expense = expense_result.scalar() or Decimal(0)
+        """Get monthly income/expense summary.
 
-        # Get transaction count
-        count_result = await self.session.execute(
-            select(func.count(Transaction.id))
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.date >= start_date)
-            .where(Transaction.date <= end_date)
+        Both totals and the count come from a single scan over the daily
+        rollups of the date range.
+        """
+        result = await self.session.execute(
+            select(
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.INCOME
+                ),
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.EXPENSE
+                ),
+                _rollup_count(),
+            )
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.date >= start_date)
+            .where(DailyRollup.date <= end_date)
         )
-        transaction_count = count_result.scalar() or 0
+        total_income, total_expense, transaction_count = result.one()
 
         return MonthlySummaryResponse(
-            total_income=total_income,
-            total_expense=total_expense,
-            balance=total_income - total_expense,
+            total_income=from_minor(total_income),
+            total_expense=from_minor(total_expense),
+            balance=from_minor(total_income - total_expense),
             transaction_count=transaction_count,
         )
 
+    @user_cached("statistics.category_breakdown")
     async def get_category_breakdown(
         self,
         user_id: UUID,
@@ -70,55 +134,1086 @@ class StatisticsService:
         end_date: date,
         transaction_type: TransactionType = TransactionType.EXPENSE,
     ) -> CategoryBreakdownResponse:
-        """Get spending breakdown by category."""
-        # Get spending by category
+        """Get spending breakdown by category from the daily rollups."""
+        # Get spending by category, summed as integer minor units
+        amount = sum_minor(DailyRollup.amount).label("amount")
+        count = _rollup_count().label("count")
         result = await self.session.execute(
             select(
-                Transaction.category_id,
+                DailyRollup.category_id,
                 Category.name,
                 Category.icon,
                 Category.color,
-                func.sum(Transaction.amount).label("amount"),
-                func.count(Transaction.id).label("count"),
+                amount,
+                count,
             )
-            .join(Category, Transaction.category_id == Category.id)
-            .where(Transaction.user_id == user_id)
-            .where(Transaction.type == transaction_type)
-            .where(Transaction.date >= start_date)
-            .where(Transaction.date <= end_date)
-            .where(Transaction.category_id.isnot(None))
+            .join(Category, DailyRollup.category_id == Category.id)
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.type == transaction_type)
+            .where(DailyRollup.date >= start_date)
+            .where(DailyRollup.date <= end_date)
+            .where(DailyRollup.category_id.isnot(None))
             .group_by(
-                Transaction.category_id,
+                DailyRollup.category_id,
                 Category.name,
                 Category.icon,
                 Category.color,
             )
-            .order_by(func.sum(Transaction.amount).desc())
+            .having(count > 0)
+            .order_by(amount.desc())
         )
         rows = result.all()
 
         # Calculate total
-        total = sum(row.amount for row in rows) if rows else Decimal(0)
+        total = sum(row.amount for row in rows)
 
         # Build category spending list
-        categories = []
-        for row in rows:
-            percentage = (
-                (row.amount / total * 100) if total > 0 else Decimal(0)
+        categories = [
+            CategorySpending(
+                category_id=row.category_id,
+                category_name=row.name,
+                category_icon=row.icon,
+                category_color=row.color,
+                amount=from_minor(row.amount),
+                percentage=percentage_of(row.amount, total),
+                transaction_count=row.count,
+            )
+            for row in rows
+        ]
+
+        return CategoryBreakdownResponse(
+            total=from_minor(total),
+            categories=categories,
+        )
+
+    @user_cached("statistics.tag_breakdown")
+    async def get_tag_breakdown(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        transaction_type: TransactionType = TransactionType.EXPENSE,
+    ) -> TagBreakdownResponse:
+        """Get spending breakdown by tag.
+
+        Tags are not part of the daily rollups, so the per-tag sums come from
+        one aggregation over transaction_tags joined to the transactions.
+        """
+        amount = sum_minor(Transaction.amount).label("amount")
+        result = await self.session.execute(
+            select(
+                Tag.id,
+                Tag.name,
+                Tag.color,
+                amount,
+                func.count(Transaction.id).label("count"),
+            )
+            .select_from(TransactionTag)
+            .join(Transaction, TransactionTag.transaction_id == Transaction.id)
+            .join(Tag, TransactionTag.tag_id == Tag.id)
+            .where(Transaction.user_id == user_id)
+            .where(Transaction.type == transaction_type)
+            .where(Transaction.date >= start_date)
+            .where(Transaction.date <= end_date)
+            .group_by(Tag.id, Tag.name, Tag.color)
+            .order_by(amount.desc())
+        )
+        rows = result.all()
+
+        # Shares are of everything spent, which the rollups answer cheaply
+        total = await self.session.scalar(
+            select(sum_minor(DailyRollup.amount))
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.type == transaction_type)
+            .where(DailyRollup.date >= start_date)
+            .where(DailyRollup.date <= end_date)
+        )
+
+        tags = [
+            TagSpending(
+                tag_id=row.id,
+                tag_name=row.name,
+                tag_color=row.color,
+                amount=from_minor(row.amount),
+                percentage=percentage_of(row.amount, total),
+                transaction_count=row.count,
+            )
+            for row in rows
+        ]
+
+        return TagBreakdownResponse(total=from_minor(total), tags=tags)
+
+    @user_cached("statistics.accounts")
+    async def get_account_flows(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        include_archived: bool = False,
+    ) -> AccountStatisticsResponse:
+        """Get inflow, outflow and transfers per account.
+
+        Reads the signed postings, where a transfer has an outgoing leg on
+        its account and an incoming one on ``to_account_id``, in a single
+        aggregation. Accounts without postings in the range get zeros.
+        """
+        is_transfer = Posting.type == TransactionType.TRANSFER
+        query = (
+            select(
+                Account.id,
+                Account.name,
+                Account.icon,
+                Account.color,
+                sum_minor(Posting.amount, Posting.type == TransactionType.INCOME).label(
+                    "inflow"
+                ),
+                sum_minor(
+                    Posting.amount, Posting.type == TransactionType.EXPENSE
+                ).label("outflow"),
+                sum_minor(Posting.amount, is_transfer & (Posting.amount > 0)).label(
+                    "transfers_in"
+                ),
+                sum_minor(Posting.amount, is_transfer & (Posting.amount < 0)).label(
+                    "transfers_out"
+                ),
+                func.count(Posting.id).label("count"),
             )
-            categories.append(
-                CategorySpending(
+            .outerjoin(
+                Posting,
+                (Posting.account_id == Account.id)
+                & (Posting.user_id == user_id)
+                & (Posting.date >= start_date)
+                & (Posting.date <= end_date),
+            )
+            .where(Account.user_id == user_id)
+            .group_by(Account.id, Account.name, Account.icon, Account.color)
+            .order_by(Account.order, Account.created_at)
+        )
+        if not include_archived:
+            query = query.where(Account.is_archived == False)  # noqa: E712
+        result = await self.session.execute(query)
+
+        return AccountStatisticsResponse(
+            accounts=[
+                AccountFlow(
+                    account_id=row.id,
+                    account_name=row.name,
+                    account_icon=row.icon,
+                    account_color=row.color,
+                    inflow=from_minor(row.inflow),
+                    outflow=from_minor(-row.outflow),
+                    transfers_in=from_minor(row.transfers_in),
+                    transfers_out=from_minor(-row.transfers_out),
+                    net_change=from_minor(
+                        row.inflow + row.outflow + row.transfers_in + row.transfers_out
+                    ),
+                    transaction_count=row.count,
+                )
+                for row in result.all()
+            ]
+        )
+
+    @user_cached("statistics.flows")
+    async def get_flows(
+        self, user_id: UUID, start_date: date, end_date: date
+    ) -> FlowsResponse:
+        """Get money flows for a Sankey diagram.
+
+        One aggregation over the transactions, by type, category, account
+        and transfer target, yields every link: income flows from its
+        category into its account, expenses from their account into their
+        category, and transfers between accounts. Transfers that go round in
+        a circle (A → B and B → A, or longer) are netted out, as Sankey
+        diagrams cannot draw cycles; every account's net flow is unchanged.
+        """
+        to_account = aliased(Account)
+        amount = sum_minor(Transaction.amount).label("amount")
+        group = (
+            Transaction.type,
+            Transaction.category_id,
+            Category.name.label("category_name"),
+            Category.color.label("category_color"),
+            Transaction.account_id,
+            Account.name.label("account_name"),
+            Account.color.label("account_color"),
+            Transaction.to_account_id,
+            to_account.name.label("to_account_name"),
+            to_account.color.label("to_account_color"),
+        )
+        result = await self.session.execute(
+            select(*group, amount, func.count(Transaction.id).label("count"))
+            .join(Account, Transaction.account_id == Account.id)
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(to_account, Transaction.to_account_id == to_account.id)
+            .where(Transaction.user_id == user_id)
+            .where(Transaction.date >= start_date)
+            .where(Transaction.date <= end_date)
+            .group_by(*group)
+        )
+
+        nodes: dict[NodeKey, FlowNode] = {}
+        links: dict[tuple[NodeKey, NodeKey], list[int]] = {}
+
+        def node(
+            node_type: FlowNodeType,
+            node_id: UUID | None,
+            name: str | None,
+            color: str | None,
+        ) -> NodeKey:
+            key = (node_type, node_id)
+            if key not in nodes:
+                nodes[key] = FlowNode(
+                    type=node_type, id=node_id, name=name, color=color
+                )
+            return key
+
+        for row in result.all():
+            category_type = {
+                TransactionType.INCOME: FlowNodeType.INCOME_CATEGORY,
+                TransactionType.EXPENSE: FlowNodeType.EXPENSE_CATEGORY,
+            }.get(row.type)
+            if category_type is None and row.to_account_id in (None, row.account_id):
+                # Transfers without a distinct target move no money
+                continue
+            account = node(
+                FlowNodeType.ACCOUNT,
+                row.account_id,
+                row.account_name,
+                row.account_color,
+            )
+            if category_type is not None:
+                category = node(
+                    category_type,
+                    row.category_id,
+                    row.category_name,
+                    row.category_color,
+                )
+                source, target = (
+                    (category, account)
+                    if row.type == TransactionType.INCOME
+                    else (account, category)
+                )
+            else:
+                source = account
+                target = node(
+                    FlowNodeType.ACCOUNT,
+                    row.to_account_id,
+                    row.to_account_name,
+                    row.to_account_color,
+                )
+            link = links.setdefault((source, target), [0, 0])
+            link[0] += row.amount
+            link[1] += row.count
+
+        _cancel_cycles(links)
+        # Accounts whose transfers cancelled out entirely are left out
+        throughput: dict[NodeKey, int] = {}
+        for (source, target), (total, _) in links.items():
+            throughput[source] = throughput.get(source, 0) + total
+            throughput[target] = throughput.get(target, 0) + total
+
+        node_types = list(FlowNodeType)
+        order = sorted(
+            throughput, key=lambda key: (node_types.index(key[0]), -throughput[key])
+        )
+        index = {key: position for position, key in enumerate(order)}
+        return FlowsResponse(
+            nodes=[nodes[key] for key in order],
+            links=[
+                FlowLink(
+                    source=index[source],
+                    target=index[target],
+                    amount=from_minor(total),
+                    transaction_count=count,
+                )
+                for (source, target), (total, count) in links.items()
+            ],
+        )
+
+    @user_cached("statistics.category_matrix")
+    async def get_category_matrix(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        transaction_type: TransactionType = TransactionType.EXPENSE,
+    ) -> CategoryMatrixResponse:
+        """Get category totals per month as a dense matrix.
+
+        One GROUP BY over the daily rollups yields the (category, month)
+        cells, which are pivoted into one row per category with a zero for
+        every month without transactions.
+        """
+        if start_date > end_date:
+            raise BadRequestError("startDate must not be after endDate")
+        periods = _bucket_starts(start_date, end_date, TimeBucket.MONTH)
+        if len(periods) > MAX_MATRIX_MONTHS:
+            raise BadRequestError(f"Range spans more than {MAX_MATRIX_MONTHS} months")
+
+        month = date_bucket(TimeBucket.MONTH.value, DailyRollup.date).label("month")
+        count = _rollup_count().label("count")
+        result = await self.session.execute(
+            select(
+                DailyRollup.category_id,
+                Category.name,
+                Category.icon,
+                Category.color,
+                month,
+                sum_minor(DailyRollup.amount).label("amount"),
+                count,
+            )
+            .join(Category, DailyRollup.category_id == Category.id)
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.type == transaction_type)
+            .where(DailyRollup.date >= start_date)
+            .where(DailyRollup.date <= end_date)
+            .group_by(
+                DailyRollup.category_id,
+                Category.name,
+                Category.icon,
+                Category.color,
+                month,
+            )
+            .having(count > 0)
+        )
+
+        columns = {start: index for index, start in enumerate(periods)}
+        headers: dict[UUID, MatrixCategory] = {}
+        amounts: dict[UUID, list[int]] = {}
+        counts: dict[UUID, list[int]] = {}
+        period_totals = [0] * len(periods)
+        for row in result.all():
+            if row.category_id not in headers:
+                headers[row.category_id] = MatrixCategory(
                     category_id=row.category_id,
                     category_name=row.name,
                     category_icon=row.icon,
                     category_color=row.color,
-                    amount=row.amount,
-                    percentage=round(percentage, 2),
-                    transaction_count=row.count,
                 )
+                amounts[row.category_id] = [0] * len(periods)
+                counts[row.category_id] = [0] * len(periods)
+            column = columns[row.month]
+            amounts[row.category_id][column] = row.amount
+            counts[row.category_id][column] = row.count
+            period_totals[column] += row.amount
+
+        order = sorted(headers, key=lambda category_id: -sum(amounts[category_id]))
+        return CategoryMatrixResponse(
+            periods=periods,
+            categories=[headers[category_id] for category_id in order],
+            amounts=[
+                [from_minor(amount) for amount in amounts[category_id]]
+                for category_id in order
+            ],
+            counts=[counts[category_id] for category_id in order],
+            category_totals=[
+                from_minor(sum(amounts[category_id])) for category_id in order
+            ],
+            period_totals=[from_minor(total) for total in period_totals],
+        )
+
+    @user_cached("statistics.calendar")
+    async def get_calendar(self, user_id: UUID, year: int) -> CalendarResponse:
+        """Get income and expense per day of a year.
+
+        Reads at most a few daily rollup rows per day, grouped by date, and
+        fills days without transactions with zeros.
+        """
+        first_day = date(year, 1, 1)
+        days = (date(year, 12, 31) - first_day).days + 1
+        result = await self.session.execute(
+            select(
+                DailyRollup.date,
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.INCOME
+                ).label("income"),
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.EXPENSE
+                ).label("expense"),
+                _rollup_count().label("count"),
             )
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.date >= first_day)
+            .where(DailyRollup.date <= date(year, 12, 31))
+            .group_by(DailyRollup.date)
+        )
 
-        return CategoryBreakdownResponse(
-            total=total,
-            categories=categories,
+        income, expense, counts = [0] * days, [0] * days, [0] * days
+        for row in result.all():
+            day = (row.date - first_day).days
+            income[day], expense[day], counts[day] = row.income, row.expense, row.count
+
+        return CalendarResponse(
+            year=year,
+            income=[from_minor(amount) for amount in income],
+            expense=[from_minor(amount) for amount in expense],
+            counts=counts,
         )
+
+    @user_cached("statistics.rolling")
+    async def get_rolling(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        windows: list[int],
+        category_id: UUID | None = None,
+    ) -> RollingResponse:
+        """Get trailing sums and daily averages of income and expense.
+
+        Daily totals come from one GROUP BY over the rollups, starting early
+        enough to fill the longest window. Every window is then a difference
+        of two prefix sums over the gap-filled days, in integer minor units.
+        """
+        if start_date > end_date:
+            raise BadRequestError("startDate must not be after endDate")
+        days = (end_date - start_date).days + 1
+        if days > MAX_TIMESERIES_POINTS:
+            raise BadRequestError(f"Range spans more than {MAX_TIMESERIES_POINTS} days")
+        windows = sorted(set(windows))
+        if not windows or not 1 <= windows[0] <= windows[-1] <= MAX_ROLLING_WINDOW:
+            raise BadRequestError(
+                f"windows must be between 1 and {MAX_ROLLING_WINDOW} days"
+            )
+
+        lookback = windows[-1] - 1
+        first_day = start_date - timedelta(days=lookback)
+        query = (
+            select(
+                DailyRollup.date,
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.INCOME
+                ).label("income"),
+                sum_minor(
+                    DailyRollup.amount, DailyRollup.type == TransactionType.EXPENSE
+                ).label("expense"),
+            )
+            .where(DailyRollup.user_id == user_id)
+            .where(DailyRollup.date >= first_day)
+            .where(DailyRollup.date <= end_date)
+            .group_by(DailyRollup.date)
+        )
+        if category_id:
+            query = query.where(DailyRollup.category_id == category_id)
+        result = await self.session.execute(query)
+
+        income, expense = [0] * (lookback + days), [0] * (lookback + days)
+        for row in result.all():
+            day = (row.date - first_day).days
+            income[day], expense[day] = row.income, row.expense
+        income_prefix = list(accumulate(income, initial=0))
+        expense_prefix = list(accumulate(expense, initial=0))
+
+        series = []
+        for window in windows:
+            # Sum of days (end - window, end] for each day of the range
+            ends = range(lookback + 1, lookback + days + 1)
+            income_sums = [income_prefix[e] - income_prefix[e - window] for e in ends]
+            expense_sums = [
+                expense_prefix[e] - expense_prefix[e - window] for e in ends
+            ]
+            series.append(
+                RollingWindowSeries(
+                    window=window,
+                    income_sum=[from_minor(total) for total in income_sums],
+                    expense_sum=[from_minor(total) for total in expense_sums],
+                    income_average=[
+                        from_minor(divide_minor(total, window)) for total in income_sums
+                    ],
+                    expense_average=[
+                        from_minor(divide_minor(total, window))
+                        for total in expense_sums
+                    ],
+                )
+            )
+        return RollingResponse(start_date=start_date, end_date=end_date, series=series)
+
+    @user_cached("statistics.distribution")
+    async def get_distribution(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        transaction_type: TransactionType = TransactionType.EXPENSE,
+        by_category: bool = False,
+        category_id: UUID | None = None,
+        bins: int = 10,
+    ) -> DistributionResponse:
+        """Get the spread of single transaction amounts.
+
+        Per group (the whole type, or each category with ``by_category``)
+        returns min, max, median, p90, p99 and an equal-width histogram.
+        Postgres computes everything with ``percentile_cont`` and a binned
+        GROUP BY; other databases fetch the amounts and summarize them with
+        NumPy, with the same results.
+        """
+        if start_date > end_date:
+            raise BadRequestError("startDate must not be after endDate")
+        if not 1 <= bins <= MAX_HISTOGRAM_BINS:
+            raise BadRequestError(f"bins must be between 1 and {MAX_HISTOGRAM_BINS}")
+
+        keys = (
+            [Transaction.category_id.label("category_id"), Category.name.label("name")]
+            if by_category
+            else []
+        )
+
+        def scan(*columns: ColumnElement) -> Select:
+            query = (
+                select(*keys, *columns)
+                .select_from(Transaction)
+                .where(Transaction.user_id == user_id)
+                .where(Transaction.type == transaction_type)
+                .where(Transaction.date >= start_date)
+                .where(Transaction.date <= end_date)
+            )
+            if by_category:
+                query = query.outerjoin(
+                    Category, Transaction.category_id == Category.id
+                )
+            if category_id:
+                query = query.where(Transaction.category_id == category_id)
+            return query
+
+        connection = await self.session.connection()
+        if connection.dialect.name == "postgresql":
+            groups = await self._distributions_in_sql(scan, keys, bins)
+        elif np is not None:
+            groups = await self._distributions_in_numpy(scan, bins)
+        else:
+            raise ServiceUnavailableError(
+                "Amount distributions on this database require numpy "
+                "(install the 'analytics' extra)"
+            )
+        groups.sort(key=lambda group: -group.count)
+        return DistributionResponse(groups=groups)
+
+    async def _distributions_in_sql(
+        self, scan: Callable[..., Select], keys: list[Label], bins: int
+    ) -> list[AmountDistribution]:
+        amount = minor_units(Transaction.amount)
+        result = await self.session.execute(
+            scan(
+                func.count().label("count"),
+                func.min(amount).label("low"),
+                func.max(amount).label("high"),
+                *(
+                    type_coerce(func.percentile_cont(q).within_group(amount), Float)
+                    for q in PERCENTILES
+                ),
+            ).group_by(*keys)
+        )
+        stats = result.all()
+
+        # Bin each amount against its group's range, then count per bin; the
+        # subquery keeps the bin expression's parameters out of GROUP BY
+        partition = {"partition_by": keys} if keys else {}
+        low = func.min(amount).over(**partition)
+        high = func.max(amount).over(**partition)
+        binned = scan(
+            case(
+                (
+                    high > low,
+                    func.least(histogram_bin(amount, low, high, bins), bins - 1),
+                ),
+                else_=0,
+            ).label("bin")
+        ).subquery()
+        group_keys = [binned.c[key.name] for key in keys]
+        result = await self.session.execute(
+            select(*group_keys, binned.c.bin, func.count().label("count")).group_by(
+                *group_keys, binned.c.bin
+            )
+        )
+        histograms: dict[UUID | None, list[int]] = {}
+        for row in result.all():
+            key = row.category_id if keys else None
+            histograms.setdefault(key, [0] * bins)[row.bin] = row.count
+
+        return [
+            _amount_distribution(
+                row.category_id if keys else None,
+                row.name if keys else None,
+                row.count,
+                row.low,
+                row.high,
+                row[-len(PERCENTILES) :],
+                histograms[row.category_id if keys else None],
+            )
+            for row in stats
+            if row.count
+        ]
+
+    async def _distributions_in_numpy(
+        self, scan: Callable[..., Select], bins: int
+    ) -> list[AmountDistribution]:
+        result = await self.session.execute(
+            scan(minor_units(Transaction.amount).label("amount"))
+        )
+        labels: dict[tuple, int] = {}
+        group_labels: list[int] = []
+        amounts: list[int] = []
+        for *key, amount in result:
+            group_labels.append(labels.setdefault(tuple(key), len(labels)))
+            amounts.append(amount)
+
+        summary = group_distributions(
+            np.array(group_labels, dtype=np.int64),
+            np.array(amounts, dtype=np.int64),
+            len(labels),
+            PERCENTILES,
+            bins,
+        )
+        return [
+            _amount_distribution(
+                *(key or (None, None)),
+                int(summary.count[label]),
+                int(summary.low[label]),
+                int(summary.high[label]),
+                summary.percentiles[label].tolist(),
+                summary.histogram[label].tolist(),
+            )
+            for key, label in labels.items()
+        ]
+
+    @user_cached("statistics.timeseries")
+    async def get_timeseries(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        bucket: TimeBucket,
+        category_id: UUID | None = None,
+        account_id: UUID | None = None,
+        tag_id: UUID | None = None,
+    ) -> TimeSeriesResponse:
+        """Get income/expense totals per day, week, month or year.
+
+        All buckets come from one GROUP BY over the range, read from the
+        daily rollups unless a tag filter needs the transactions themselves.
+        Buckets without transactions are filled in with zeros.
+        """
+        if start_date > end_date:
+            raise BadRequestError("startDate must not be after endDate")
+        starts = _bucket_starts(start_date, end_date, bucket)
+        if len(starts) > MAX_TIMESERIES_POINTS:
+            raise BadRequestError(
+                f"Range spans more than {MAX_TIMESERIES_POINTS} {bucket.value} buckets"
+            )
+
+        if tag_id:
+            source, count = Transaction, func.count(Transaction.id)
+        else:
+            source, count = DailyRollup, _rollup_count()
+        period_start = date_bucket(bucket.value, source.date).label("period_start")
+        query = (
+            select(
+                period_start,
+                sum_minor(source.amount, source.type == TransactionType.INCOME).label(
+                    "income"
+                ),
+                sum_minor(source.amount, source.type == TransactionType.EXPENSE).label(
+                    "expense"
+                ),
+                count.label("count"),
+            )
+            .where(source.user_id == user_id)
+            .where(source.date >= start_date)
+            .where(source.date <= end_date)
+            .group_by(period_start)
+        )
+        if category_id:
+            query = query.where(source.category_id == category_id)
+        if account_id:
+            query = query.where(source.account_id == account_id)
+        if tag_id:
+            query = query.where(has_tag(tag_id))
+        result = await self.session.execute(query)
+        rows = {row.period_start: row for row in result.all()}
+
+        points = []
+        for start in starts:
+            row = rows.get(start)
+            income = row.income if row else 0
+            expense = row.expense if row else 0
+            points.append(
+                TimeSeriesPoint(
+                    period_start=start,
+                    total_income=from_minor(income),
+                    total_expense=from_minor(expense),
+                    balance=from_minor(income - expense),
+                    transaction_count=row.count if row else 0,
+                )
+            )
+        return TimeSeriesResponse(bucket=bucket, points=points)
+
+    @user_cached("statistics.compare")
+    async def compare_periods(
+        self,
+        user_id: UUID,
+        reference_date: date,
+        bucket: TimeBucket = TimeBucket.MONTH,
+        periods: int = 1,
+        transaction_type: TransactionType = TransactionType.EXPENSE,
+    ) -> ComparisonResponse:
+        """Compare the period containing ``reference_date`` with earlier ones.
+
+        Returns totals for the current bucket, the ``periods`` buckets before
+        it and the same bucket a year earlier. Every period comes from one
+        grouped query over the daily rollups, with each row's period assigned
+        in SQL; periods that coincide (e.g. twelve months back and a year
+        ago) are read once.
+        """
+        if not 0 <= periods <= MAX_COMPARE_PERIODS:
+            raise BadRequestError(
+                f"periods must be between 0 and {MAX_COMPARE_PERIODS}"
+            )
+        current = _bucket_start(reference_date, bucket)
+        starts = [current]
+        for _ in range(periods):
+            starts.append(_previous_bucket_start(starts[-1], bucket))
+        year_ago = _year_ago_bucket_start(current, bucket)
+        ranges = {
+            start: (start, _next_bucket_start(start, bucket) - timedelta(days=1))
+            for start in (*starts, year_ago)
+        }
+        labels = {start: index for index, start in enumerate(ranges)}
+
+        in_range = [
+            DailyRollup.date.between(start, end) for start, end in ranges.values()
+        ]
+        rows = (
+            select(
+                case(*zip(in_range, labels.values(), strict=True)).label("period"),
+                DailyRollup.type,
+                DailyRollup.category_id,
+                DailyRollup.amount,
+                DailyRollup.transaction_count,
+            )
+            .where(DailyRollup.user_id == user_id)
+            .where(or_(*in_range))
+            .subquery()
+        )
+        # Grouping on the subquery's column keeps the period's bind
+        # parameters out of GROUP BY, which Postgres could not match
+        count = func.coalesce(func.sum(rows.c.transaction_count), 0).label("count")
+        result = await self.session.execute(
+            select(
+                rows.c.period,
+                rows.c.type,
+                rows.c.category_id,
+                Category.name,
+                Category.icon,
+                Category.color,
+                sum_minor(rows.c.amount).label("amount"),
+                count,
+            )
+            .outerjoin(Category, rows.c.category_id == Category.id)
+            .group_by(
+                rows.c.period,
+                rows.c.type,
+                rows.c.category_id,
+                Category.name,
+                Category.icon,
+                Category.color,
+            )
+            .having(count > 0)
+        )
+        by_period: dict[int, list] = {index: [] for index in labels.values()}
+        for row in result.all():
+            by_period[row.period].append(row)
+
+        totals = {
+            start: _period_totals(
+                *ranges[start], by_period[labels[start]], transaction_type
+            )
+            for start in ranges
+        }
+        return ComparisonResponse(
+            bucket=bucket,
+            current=totals[current],
+            previous=[totals[start] for start in starts[1:]],
+            year_over_year=totals[year_ago],
+        )
+
+    @user_cached("statistics.forecast")
+    async def get_forecast(
+        self, user_id: UUID, today: date, days: int
+    ) -> ForecastResponse:
+        """Project the daily balances of active accounts after ``today``.
+
+        Upcoming occurrences of recurring rules are added to a seasonal
+        baseline (see ``app.core.forecast``) fitted on the last
+        FORECAST_HISTORY_DAYS days of postings, from which the rules' past
+        occurrences are taken out so they are not counted twice.
+        """
+        if np is None:
+            raise ServiceUnavailableError(
+                "Forecasting requires numpy (install the 'analytics' extra)"
+            )
+        if not 1 <= days <= MAX_FORECAST_DAYS:
+            raise BadRequestError(f"days must be between 1 and {MAX_FORECAST_DAYS}")
+
+        result = await self.session.execute(
+            select(Account.id, Account.name, minor_units(Account.balance))
+            .where(Account.user_id == user_id)
+            .where(Account.is_archived == False)  # noqa: E712
+            .order_by(Account.order, Account.created_at)
+        )
+        accounts = result.all()
+        columns = {
+            account_id: index for index, (account_id, _, _) in enumerate(accounts)
+        }
+
+        first_day = today - timedelta(days=FORECAST_HISTORY_DAYS - 1)
+        history = np.zeros((FORECAST_HISTORY_DAYS, len(accounts)))
+        result = await self.session.execute(
+            select(Posting.account_id, Posting.date, sum_minor(Posting.amount))
+            .where(Posting.user_id == user_id)
+            .where(Posting.date >= first_day)
+            .where(Posting.date <= today)
+            .group_by(Posting.account_id, Posting.date)
+        )
+        for account_id, day, amount in result.all():
+            if account_id in columns:
+                history[(day - first_day).days, columns[account_id]] = amount
+        # A series starts at its account's first posting in the window
+        observed = history != 0
+        starts = np.where(
+            observed.any(axis=0), observed.argmax(axis=0), FORECAST_HISTORY_DAYS
+        )
+
+        recurring = np.zeros((days, len(accounts)))
+        last_day = today + timedelta(days=days)
+        for rule in await RecurringRuleRepository(self.session).get_by_user(user_id):
+            legs = [
+                (columns[account_id], to_minor(amount))
+                for account_id, amount in posting_legs(
+                    rule.type, rule.account_id, rule.to_account_id, rule.amount
+                )
+                if account_id in columns
+            ]
+            index = rule.occurrence_count - 1
+            while index >= 0 and (day := rule.occurrence_date(index)) >= first_day:
+                if day <= today:
+                    for column, amount in legs:
+                        history[(day - first_day).days, column] -= amount
+                index -= 1
+            if not rule.is_active:
+                continue
+            index = rule.occurrence_count
+            while (day := rule.occurrence_date(index)) <= last_day and (
+                rule.end_date is None or day <= rule.end_date
+            ):
+                # Occurrences the materializer has not created yet are due now
+                offset = max((day - today).days, 1) - 1
+                for column, amount in legs:
+                    recurring[offset, column] += amount
+                index += 1
+
+        flows = recurring + fit_baseline(
+            history, int(np.datetime64(first_day, "D").astype(np.int64)), starts, days
+        )
+        opening = np.array([balance for _, _, balance in accounts], dtype=np.float64)
+        balances = np.floor(opening + np.cumsum(flows, axis=0) + 0.5).astype(np.int64)
+
+        return ForecastResponse(
+            start_date=today + timedelta(days=1),
+            days=days,
+            total=[from_minor(total) for total in balances.sum(axis=1).tolist()],
+            accounts=[
+                AccountForecast(
+                    account_id=account_id,
+                    account_name=name,
+                    balances=[from_minor(b) for b in balances[:, column].tolist()],
+                )
+                for column, (account_id, name, _) in enumerate(accounts)
+            ],
+        )
+
+
+def _cancel_cycles(links: dict[tuple[NodeKey, NodeKey], list[int]]) -> None:
+    """Subtract the smallest amount around each cycle of links, in place.
+
+    Every pass drops at least one link, so this ends; links that reach zero
+    are removed along with their transaction counts.
+    """
+    while cycle := _find_cycle(links):
+        pairs = list(zip(cycle, cycle[1:] + cycle[:1], strict=True))
+        flow = min(links[pair][0] for pair in pairs)
+        for pair in pairs:
+            links[pair][0] -= flow
+            if not links[pair][0]:
+                del links[pair]
+
+
+def _find_cycle(links: dict[tuple[NodeKey, NodeKey], list[int]]) -> list[NodeKey]:
+    """Nodes of one directed cycle among the links, or [] if there is none."""
+    targets: dict[NodeKey, list[NodeKey]] = {}
+    for source, target in links:
+        targets.setdefault(source, []).append(target)
+    done: set[NodeKey] = set()
+    for start in targets:
+        if start in done:
+            continue
+        # Depth-first search; ``path`` holds the nodes on the current branch
+        path = [start]
+        branches = [iter(targets[start])]
+        while branches:
+            target = next(branches[-1], None)
+            if target is None:
+                done.add(path.pop())
+                branches.pop()
+            elif target in path:
+                return path[path.index(target) :]
+            elif target not in done:
+                path.append(target)
+                branches.append(iter(targets.get(target, ())))
+    return []
+
+
+def _period_totals(
+    start: date, end: date, rows: list, transaction_type: TransactionType
+) -> PeriodTotals:
+    """Fold the (type, category) rows of one period into its totals."""
+    income = sum(row.amount for row in rows if row.type == TransactionType.INCOME)
+    expense = sum(row.amount for row in rows if row.type == TransactionType.EXPENSE)
+    categorized = sorted(
+        (
+            row
+            for row in rows
+            if row.type == transaction_type and row.category_id is not None
+        ),
+        key=lambda row: row.amount,
+        reverse=True,
+    )
+    typed_total = income if transaction_type == TransactionType.INCOME else expense
+    return PeriodTotals(
+        period_start=start,
+        period_end=end,
+        total_income=from_minor(income),
+        total_expense=from_minor(expense),
+        balance=from_minor(income - expense),
+        transaction_count=sum(row.count for row in rows),
+        categories=[
+            CategorySpending(
+                category_id=row.category_id,
+                category_name=row.name,
+                category_icon=row.icon,
+                category_color=row.color,
+                amount=from_minor(row.amount),
+                percentage=percentage_of(row.amount, typed_total),
+                transaction_count=row.count,
+            )
+            for row in categorized
+        ],
+    )
+
+
+def _round_minor(value: float) -> int:
+    return int(Decimal(value).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _amount_distribution(
+    category_id: UUID | None,
+    category_name: str | None,
+    count: int,
+    low: int,
+    high: int,
+    percentiles: list[float],
+    histogram: list[int],
+) -> AmountDistribution:
+    """Build a distribution from minor-unit figures."""
+    bins = len(histogram)
+    edges = [low + divide_minor((high - low) * i, bins) for i in range(bins + 1)]
+    median, p90, p99 = (from_minor(_round_minor(value)) for value in percentiles)
+    return AmountDistribution(
+        category_id=category_id,
+        category_name=category_name,
+        count=count,
+        min=from_minor(low),
+        max=from_minor(high),
+        median=median,
+        p90=p90,
+        p99=p99,
+        histogram=[
+            HistogramBucket(
+                lower=from_minor(edges[i]), upper=from_minor(edges[i + 1]), count=n
+            )
+            for i, n in enumerate(histogram)
+        ],
+    )
+
+
+def _bucket_start(day: date, bucket: TimeBucket) -> date:
+    """First day of the bucket containing ``day`` (weeks start on Monday)."""
+    if bucket == TimeBucket.WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == TimeBucket.MONTH:
+        return day.replace(day=1)
+    if bucket == TimeBucket.YEAR:
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_bucket_start(start: date, bucket: TimeBucket) -> date:
+    if bucket == TimeBucket.WEEK:
+        return start + timedelta(days=7)
+    if bucket == TimeBucket.MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    if bucket == TimeBucket.YEAR:
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+def _previous_bucket_start(start: date, bucket: TimeBucket) -> date:
+    if bucket == TimeBucket.WEEK:
+        return start - timedelta(days=7)
+    if bucket == TimeBucket.MONTH:
+        return (start - timedelta(days=1)).replace(day=1)
+    if bucket == TimeBucket.YEAR:
+        return start.replace(year=start.year - 1)
+    return start - timedelta(days=1)
+
+
+def _year_ago_bucket_start(start: date, bucket: TimeBucket) -> date:
+    """Start of the matching bucket a year earlier.
+
+    Weeks go back 52 weeks so they keep starting on Monday; 29 February
+    maps to the 28th.
+    """
+    if bucket == TimeBucket.WEEK:
+        return start - timedelta(weeks=52)
+    if start.month == 2 and start.day == 29:
+        start = start.replace(day=28)
+    return start.replace(year=start.year - 1)
+
+
+def _bucket_starts(start_date: date, end_date: date, bucket: TimeBucket) -> list[date]:
+    """Start dates of every bucket overlapping ``[start_date, end_date]``."""
+    starts = []
+    start = _bucket_start(start_date, bucket)
+    while start <= end_date and len(starts) <= MAX_TIMESERIES_POINTS:
+        starts.append(start)
+        start = _next_bucket_start(start, bucket)
+    return starts
+
+
+async def rebuild_daily_rollups(
+    session_maker: sessionmaker, user_ids: list[UUID] | None = None
+) -> int:
+    """Recompute daily rollups from transactions, committing per user.
+
+    Rebuilds every user when ``user_ids`` is not given. Returns the number
+    of rollup rows written.
+    """
+    if user_ids is None:
+        async with session_maker() as session:
+            user_ids = await UserRepository(session).get_all_ids()
+    written = 0
+    for user_id in user_ids:
+        async with session_maker() as session:
+            written += await DailyRollupRepository(session).rebuild(user_id)
+            await mark_user_data_changed(session, user_id)
+            await session.commit()
+    return written
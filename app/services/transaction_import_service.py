@@ -0,0 +1,304 @@
+import csv
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any
+from uuid import UUID, uuid4
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.transactions.schemas import (
+    ImportColumnMapping,
+    ImportResult,
+    ImportRowError,
+    StatementFormat,
+)
+from app.config import get_settings
+from app.core.cache import mark_user_data_changed
+from app.core.fingerprint import transaction_fingerprint
+from app.core.statement_parsers import (
+    iter_csv_records,
+    iter_lines,
+    iter_ofx_transactions,
+    iter_text,
+)
+from app.exceptions import BadRequestError, NotFoundError
+from app.models.transaction import TransactionType
+from app.repositories.account_repo import AccountRepository
+from app.repositories.anomaly_repo import AnomalyRepository
+from app.repositories.transaction_import_repo import TransactionImportRepository
+from app.repositories.transaction_repo import TransactionRepository
+
+CHUNK_SIZE = 64 * 1024
+NOTE_MAX_LENGTH = 500
+CENT = Decimal("0.01")
+MAX_AMOUNT = Decimal(10) ** 13  # NUMERIC(15, 2)
+
+# Characters that may surround an amount, such as currency symbols
+_AMOUNT_NOISE = re.compile(r"[^\d\-+().,' ]")
+
+_TYPE_ALIASES = {
+    "income": TransactionType.INCOME,
+    "credit": TransactionType.INCOME,
+    "cr": TransactionType.INCOME,
+    "expense": TransactionType.EXPENSE,
+    "debit": TransactionType.EXPENSE,
+    "dr": TransactionType.EXPENSE,
+}
+
+
+class RowError(ValueError):
+    """A statement row that cannot be imported."""
+
+
+class TransactionImportService:
+    """Service for bulk statement imports."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = TransactionImportRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.transaction_repo = TransactionRepository(session)
+        self.settings = get_settings()
+
+    async def import_statement(
+        self,
+        user_id: UUID,
+        account_id: UUID,
+        file: UploadFile,
+        statement_format: StatementFormat | None = None,
+        mapping: ImportColumnMapping | None = None,
+        skip_duplicates: bool = True,
+    ) -> ImportResult:
+        """Stream a statement into the staging table and merge it in bulk.
+
+        Rows matching the fingerprint of an existing transaction (e.g. from
+        re-importing an overlapping statement) are skipped unless
+        ``skip_duplicates`` is False; they are counted either way.
+        """
+        account = await self.account_repo.get_by_id_and_user(account_id, user_id)
+        if not account:
+            raise NotFoundError("Account", str(account_id))
+
+        statement_format = statement_format or _detect_format(file.filename)
+        mapping = mapping or ImportColumnMapping()
+        if statement_format == StatementFormat.OFX:
+            records = self._ofx_rows(file)
+        else:
+            records = self._csv_rows(file, mapping)
+
+        import_id = uuid4()
+        batch: list[dict[str, Any]] = []
+        errors: list[ImportRowError] = []
+        failed = duplicates = 0
+        async for row_number, raw in records:
+            try:
+                fields = (
+                    _ofx_fields(raw)
+                    if statement_format == StatementFormat.OFX
+                    else _csv_fields(raw, mapping)
+                )
+            except RowError as e:
+                failed += 1
+                if len(errors) < self.settings.import_max_errors:
+                    errors.append(ImportRowError(row=row_number, message=str(e)))
+                continue
+
+            batch.append(
+                {
+                    "id": uuid4(),
+                    "import_id": import_id,
+                    "posting_id": uuid4(),
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "fingerprint": transaction_fingerprint(
+                        account_id,
+                        fields["date"],
+                        fields["amount"],
+                        fields["type"],
+                        fields["note"],
+                    ),
+                    **fields,
+                }
+            )
+            if len(batch) >= self.settings.import_batch_size:
+                duplicates += await self._stage(user_id, batch, skip_duplicates)
+                batch = []
+        duplicates += await self._stage(user_id, batch, skip_duplicates)
+
+        imported = await self.repo.merge(import_id)
+        await mark_user_data_changed(self.session, user_id)
+        await AnomalyRepository(self.session).mark_stale(user_id)
+        return ImportResult(
+            imported=imported, failed=failed, duplicates=duplicates, errors=errors
+        )
+
+    async def _stage(
+        self, user_id: UUID, batch: list[dict[str, Any]], skip_duplicates: bool
+    ) -> int:
+        """Stage a batch with one duplicate lookup; return the duplicate count."""
+        if not batch:
+            return 0
+        existing = await self.transaction_repo.find_by_fingerprints(
+            user_id, [row["fingerprint"] for row in batch]
+        )
+        fresh = [row for row in batch if row["fingerprint"] not in existing]
+        await self.repo.bulk_insert(fresh if skip_duplicates else batch)
+        return len(batch) - len(fresh)
+
+    async def _csv_rows(
+        self, file: UploadFile, mapping: ImportColumnMapping
+    ) -> AsyncIterator[tuple[int, dict[str, str | None]]]:
+        """Yield (row number, mapped raw values) for each CSV data row."""
+        lines = iter_lines(iter_text(_read_chunks(file), mapping.encoding))
+        records = iter_csv_records(lines, mapping.delimiter)
+        fields = ["date", "note", "type"]
+        if mapping.debit is not None or mapping.credit is not None:
+            fields += ["debit", "credit"]
+        else:
+            fields.append("amount")
+        columns = {
+            name: getattr(mapping, name)
+            for name in fields
+            if getattr(mapping, name) is not None
+        }
+
+        row_number = 0
+        indexes: dict[str, int] | None = None
+        try:
+            async for record in records:
+                row_number += 1
+                if indexes is None:
+                    if mapping.has_header:
+                        indexes = _resolve_columns(columns, record)
+                        continue
+                    indexes = _resolve_columns(columns, None)
+                yield (
+                    row_number,
+                    {
+                        name: record[index].strip() if index < len(record) else None
+                        for name, index in indexes.items()
+                    },
+                )
+        except csv.Error as e:
+            raise BadRequestError(f"Invalid CSV at row {row_number + 1}: {e}") from e
+
+    async def _ofx_rows(
+        self, file: UploadFile
+    ) -> AsyncIterator[tuple[int, dict[str, str]]]:
+        """Yield (transaction number, OFX fields) for each statement entry."""
+        row_number = 0
+        async for fields in iter_ofx_transactions(iter_text(_read_chunks(file))):
+            row_number += 1
+            yield row_number, fields
+
+
+async def _read_chunks(file: UploadFile) -> AsyncIterable[bytes]:
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+
+def _detect_format(filename: str | None) -> StatementFormat:
+    if filename and filename.lower().endswith((".ofx", ".qfx")):
+        return StatementFormat.OFX
+    return StatementFormat.CSV
+
+
+def _resolve_columns(
+    columns: dict[str, str | int], header: list[str] | None
+) -> dict[str, int]:
+    """Map field names to CSV column indexes using the header row if any."""
+    positions = {}
+    if header is not None:
+        positions = {name.strip().casefold(): i for i, name in enumerate(header)}
+    indexes = {}
+    for name, column in columns.items():
+        if isinstance(column, int) or (header is None and str(column).isdigit()):
+            indexes[name] = int(column)
+        elif column.strip().casefold() in positions:
+            indexes[name] = positions[column.strip().casefold()]
+        else:
+            raise BadRequestError(f"Column '{column}' not found in CSV header")
+    return indexes
+
+
+def _parse_amount(value: str | None, mapping: ImportColumnMapping) -> Decimal | None:
+    if value is None or not value.strip():
+        return None
+    text = _AMOUNT_NOISE.sub("", value).replace(" ", "").replace("'", "")
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()")
+    if mapping.thousands_separator:
+        text = text.replace(mapping.thousands_separator, "")
+    if mapping.decimal_separator != ".":
+        text = text.replace(mapping.decimal_separator, ".")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation as e:
+        raise RowError(f"Invalid amount '{value}'") from e
+    return -amount if negative else amount
+
+
+def _signed_fields(
+    amount: Decimal, transaction_type: TransactionType, note: str | None, day: date
+) -> dict[str, Any]:
+    amount = abs(amount).quantize(CENT, rounding=ROUND_HALF_UP)
+    if amount == 0:
+        raise RowError("Amount is zero")
+    if amount >= MAX_AMOUNT:
+        raise RowError("Amount is out of range")
+    return {
+        "type": transaction_type,
+        "amount": amount,
+        "date": day,
+        "note": note[:NOTE_MAX_LENGTH] if note else None,
+    }
+
+
+def _csv_fields(
+    raw: dict[str, str | None], mapping: ImportColumnMapping
+) -> dict[str, Any]:
+    """Validate one mapped CSV row into staging column values."""
+    try:
+        day = datetime.strptime(raw.get("date") or "", mapping.date_format).date()
+    except ValueError as e:
+        raise RowError(f"Invalid date '{raw.get('date')}'") from e
+
+    amount = _parse_amount(raw.get("amount"), mapping)
+    if amount is None:
+        debit = _parse_amount(raw.get("debit"), mapping)
+        credit = _parse_amount(raw.get("credit"), mapping)
+        if debit is None and credit is None:
+            raise RowError("Missing amount")
+        amount = (credit or Decimal(0)) - abs(debit or Decimal(0))
+    elif not mapping.negative_is_expense:
+        amount = -amount
+
+    type_value = (raw.get("type") or "").strip().casefold()
+    if type_value:
+        if type_value not in _TYPE_ALIASES:
+            raise RowError(f"Unknown transaction type '{raw.get('type')}'")
+        transaction_type = _TYPE_ALIASES[type_value]
+    else:
+        transaction_type = (
+            TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+        )
+    return _signed_fields(amount, transaction_type, raw.get("note"), day)
+
+
+def _ofx_fields(raw: dict[str, str]) -> dict[str, Any]:
+    """Validate one OFX <STMTTRN> entry into staging column values."""
+    try:
+        day = datetime.strptime(raw.get("DTPOSTED", "")[:8], "%Y%m%d").date()
+    except ValueError as e:
+        raise RowError(f"Invalid DTPOSTED '{raw.get('DTPOSTED')}'") from e
+    try:
+        amount = Decimal(raw.get("TRNAMT", "").replace(",", "."))
+    except InvalidOperation as e:
+        raise RowError(f"Invalid TRNAMT '{raw.get('TRNAMT')}'") from e
+
+    note = " - ".join(v for v in (raw.get("NAME"), raw.get("MEMO")) if v) or None
+    transaction_type = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+    return _signed_fields(amount, transaction_type, note, day)
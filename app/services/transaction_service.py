@@ -1,15 +1,23 @@
+from collections import Counter
 from datetime import UTC, date, datetime
 from decimal import Decimal
+from itertools import groupby
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.endpoints.transactions.schemas import (
+    DuplicateGroup,
+    DuplicateMatch,
+    TransactionBulkCreate,
+    TransactionBulkResult,
     TransactionCreate,
     TransactionResponse,
     TransactionUpdate,
 )
-from app.exceptions import BadRequestError, NotFoundError
+from app.core.fingerprint import transaction_fingerprint
+from app.exceptions import BadRequestError, ConflictError, NotFoundError
+from app.models.posting import balance_deltas, posting_legs
 from app.models.transaction import Transaction, TransactionType
 from app.repositories.account_repo import AccountRepository
 from app.repositories.tag_repo import TagRepository
@@ -25,8 +33,9 @@ class TransactionService:
         self.account_repo = AccountRepository(session)
         self.tag_repo = TagRepository(session)
 
-    async def _to_response(self, transaction: Transaction) -> TransactionResponse:
-        tag_ids = await self.repo.get_tag_ids(transaction.id)
+    def _to_response(
+        self, transaction: Transaction, duplicate_of: UUID | None = None
+    ) -> TransactionResponse:
         return TransactionResponse(
             id=transaction.id,
             amount=transaction.amount,
@@ -36,9 +45,10 @@ class TransactionService:
             to_account_id=transaction.to_account_id,
             date=transaction.date,
             note=transaction.note,
-            tag_ids=tag_ids,
+            tag_ids=transaction.tag_ids,
             created_at=transaction.created_at,
             updated_at=transaction.updated_at,
+            duplicate_of=duplicate_of,
         )
 
     async def _apply_balance_change(
@@ -50,41 +60,48 @@ class TransactionService:
         to_account_id: UUID | None = None,
         reverse: bool = False,
     ) -> None:
-        """Apply balance change to account(s)."""
-        account = await self.account_repo.get_by_id_and_user(account_id, user_id)
-        if not account:
-            raise NotFoundError("Account", str(account_id))
-
-        multiplier = Decimal("-1") if reverse else Decimal("1")
-
-        if transaction_type == TransactionType.EXPENSE:
-            account.balance -= amount * multiplier
-        elif transaction_type == TransactionType.INCOME:
-            account.balance += amount * multiplier
-        elif transaction_type == TransactionType.TRANSFER:
-            if not to_account_id:
-                raise BadRequestError("Transfer requires to_account_id")
-            to_account = await self.account_repo.get_by_id_and_user(
-                to_account_id, user_id
-            )
-            if not to_account:
-                raise NotFoundError("To Account", str(to_account_id))
-            account.balance -= amount * multiplier
-            to_account.balance += amount * multiplier
-            to_account.updated_at = datetime.now(UTC)
-            await self.account_repo.update(to_account)
+        """Apply balance change to account(s), one ledger leg at a time."""
+        if transaction_type == TransactionType.TRANSFER and not to_account_id:
+            raise BadRequestError("Transfer requires to_account_id")
 
-        account.updated_at = datetime.now(UTC)
-        await self.account_repo.update(account)
+        sign = -1 if reverse else 1
+        legs = posting_legs(transaction_type, account_id, to_account_id, amount)
+        for index, (leg_account_id, leg_amount) in enumerate(legs):
+            account = await self.account_repo.get_by_id_and_user(
+                leg_account_id, user_id
+            )
+            if not account:
+                resource = "Account" if index == 0 else "To Account"
+                raise NotFoundError(resource, str(leg_account_id))
+            account.balance += leg_amount * sign
+            account.updated_at = datetime.now(UTC)
+            await self.account_repo.update(account)
 
     async def create(
-        self, user_id: UUID, data: TransactionCreate
+        self,
+        user_id: UUID,
+        data: TransactionCreate,
+        reject_duplicates: bool = False,
     ) -> TransactionResponse:
-        """Create a new transaction."""
+        """Create a new transaction.
+
+        A likely duplicate is reported through ``duplicate_of``, or rejected
+        with a conflict when ``reject_duplicates`` is set.
+        """
         # Validate transfer requirements
         if data.type == TransactionType.TRANSFER and not data.to_account_id:
             raise BadRequestError("Transfer requires to_account_id")
 
+        fingerprint = transaction_fingerprint(
+            data.account_id, data.date, data.amount, data.type, data.note
+        )
+        matches = await self.repo.find_by_fingerprints(user_id, [fingerprint])
+        duplicate_of = matches.get(fingerprint)
+        if duplicate_of and reject_duplicates:
+            raise ConflictError(
+                f"Transaction looks like a duplicate of '{duplicate_of}'"
+            )
+
         transaction = Transaction(
             user_id=user_id,
             amount=data.amount,
@@ -99,7 +116,7 @@ class TransactionService:
 
         # Set tags and update usage count
         if data.tag_ids:
-            await self.repo.set_tags(transaction.id, data.tag_ids)
+            await self.repo.set_tags(transaction, data.tag_ids)
             # Increment tag usage count
             tags = await self.tag_repo.get_by_ids(data.tag_ids, user_id)
             for tag in tags:
@@ -116,7 +133,103 @@ class TransactionService:
             data.to_account_id,
         )
 
-        return await self._to_response(transaction)
+        return self._to_response(transaction, duplicate_of)
+
+    async def create_many(
+        self, user_id: UUID, data: TransactionBulkCreate
+    ) -> TransactionBulkResult:
+        """Create many transactions with one duplicate lookup and bulk writes.
+
+        Duplicates are checked against existing transactions only, since
+        repeated rows within one request (two coffees on the same day) are
+        usually legitimate.
+        """
+        items = data.transactions
+        for item in items:
+            if item.type == TransactionType.TRANSFER and not item.to_account_id:
+                raise BadRequestError("Transfer requires to_account_id")
+
+        account_ids = {item.account_id for item in items} | {
+            item.to_account_id for item in items if item.to_account_id
+        }
+        owned = await self.account_repo.get_owned_ids(list(account_ids), user_id)
+        for item in items:
+            if item.account_id not in owned:
+                raise NotFoundError("Account", str(item.account_id))
+            if item.to_account_id and item.to_account_id not in owned:
+                raise NotFoundError("To Account", str(item.to_account_id))
+
+        fingerprints = [
+            transaction_fingerprint(
+                item.account_id, item.date, item.amount, item.type, item.note
+            )
+            for item in items
+        ]
+        existing = await self.repo.find_by_fingerprints(user_id, fingerprints)
+
+        duplicates: list[DuplicateMatch] = []
+        created: list[tuple[Transaction, UUID | None]] = []
+        for index, (item, fingerprint) in enumerate(
+            zip(items, fingerprints, strict=True)
+        ):
+            duplicate_of = existing.get(fingerprint)
+            if duplicate_of:
+                duplicates.append(
+                    DuplicateMatch(index=index, duplicate_of=duplicate_of)
+                )
+                if data.skip_duplicates:
+                    continue
+            transaction = Transaction(
+                user_id=user_id,
+                amount=item.amount,
+                type=item.type,
+                category_id=item.category_id,
+                account_id=item.account_id,
+                to_account_id=item.to_account_id,
+                date=item.date,
+                note=item.note,
+                tag_ids=list(dict.fromkeys(item.tag_ids or [])),
+            )
+            created.append((transaction, duplicate_of))
+        await self.insert_many([transaction for transaction, _ in created])
+        return TransactionBulkResult(
+            created=[self._to_response(t, dup) for t, dup in created],
+            duplicates=duplicates,
+        )
+
+    async def insert_many(self, transactions: list[Transaction]) -> None:
+        """Insert already validated transactions, possibly of many users.
+
+        Postings follow through the flush listener; balances and tag usage
+        are applied as one set-based delta per account and per tag.
+        """
+        if not transactions:
+            return
+        await self.repo.create_many(transactions)
+        await self.account_repo.apply_balance_deltas(balance_deltas(transactions))
+        await self.tag_repo.increment_usage(
+            Counter(
+                (transaction.user_id, tag_id)
+                for transaction in transactions
+                for tag_id in transaction.tag_ids
+            )
+        )
+
+    async def get_duplicates(
+        self,
+        user_id: UUID,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[DuplicateGroup]:
+        """Get groups of transactions that look like duplicates."""
+        transactions = await self.repo.get_duplicates(user_id, start_date, end_date)
+        return [
+            DuplicateGroup(
+                fingerprint=fingerprint,
+                transactions=[self._to_response(t) for t in group],
+            )
+            for fingerprint, group in groupby(transactions, lambda t: t.fingerprint)
+        ]
 
     async def get_all(
         self,
@@ -140,7 +253,7 @@ class TransactionService:
             end_date,
             search_query,
         )
-        return [await self._to_response(t) for t in transactions]
+        return [self._to_response(t) for t in transactions]
 
     async def get_by_id(
         self, user_id: UUID, transaction_id: UUID
@@ -149,7 +262,7 @@ class TransactionService:
         transaction = await self.repo.get_by_id_and_user(transaction_id, user_id)
         if not transaction:
             raise NotFoundError("Transaction", str(transaction_id))
-        return await self._to_response(transaction)
+        return self._to_response(transaction)
 
     async def update(
         self,
@@ -173,7 +286,7 @@ class TransactionService:
         )
 
         # Handle tag changes
-        old_tag_ids = await self.repo.get_tag_ids(transaction_id)
+        old_tag_ids = transaction.tag_ids
         new_tag_ids = data.tag_ids
 
         if new_tag_ids is not None:
@@ -186,7 +299,7 @@ class TransactionService:
                     await self.tag_repo.update(tag)
 
             # Set new tags
-            await self.repo.set_tags(transaction_id, new_tag_ids)
+            await self.repo.set_tags(transaction, new_tag_ids)
 
             # Increment new tags
             new_tags = await self.tag_repo.get_by_ids(new_tag_ids, user_id)
@@ -212,7 +325,7 @@ class TransactionService:
             transaction.to_account_id,
         )
 
-        return await self._to_response(transaction)
+        return self._to_response(transaction)
 
     async def delete(self, user_id: UUID, transaction_id: UUID) -> None:
         """Delete a transaction."""
@@ -231,7 +344,7 @@ class TransactionService:
         )
 
         # Decrement tag usage
-        tag_ids = await self.repo.get_tag_ids(transaction_id)
+        tag_ids = transaction.tag_ids
         if tag_ids:
             tags = await self.tag_repo.get_by_ids(tag_ids, user_id)
             for tag in tags:
@@ -241,5 +354,5 @@ class TransactionService:
                     await self.tag_repo.update(tag)
 
         # Clear tags and delete transaction
-        await self.repo.clear_tags(transaction_id)
+        await self.repo.clear_tags(transaction)
         await self.repo.delete(transaction)
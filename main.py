@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,8 +7,10 @@ from fastapi.responses import JSONResponse
 
 from app.api.router import router
 from app.config import get_settings
-from app.database import init_db
+from app.database import async_session_maker, init_db
 from app.exceptions import AppException
+from app.services.anomaly_service import run_anomaly_refresher
+from app.services.recurring_rule_service import run_recurring_materializer
 
 settings = get_settings()
 
@@ -16,7 +19,28 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     await init_db()
+    tasks = []
+    if settings.recurring_interval_seconds > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_recurring_materializer(
+                    async_session_maker, settings.recurring_interval_seconds
+                )
+            )
+        )
+    if settings.anomaly_interval_seconds > 0:
+        tasks.append(
+            asyncio.create_task(
+                run_anomaly_refresher(
+                    async_session_maker, settings.anomaly_interval_seconds
+                )
+            )
+        )
     yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
 
 
 app = FastAPI(
@@ -27,7 +51,11 @@ app = FastAPI(
 # CORS configuration for frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:8081", "http://localhost:19006", "http://localhost:3000"],
+    allow_origins=[
+        "http://localhost:8081",
+        "http://localhost:19006",
+        "http://localhost:3000",
+    ],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -0,0 +1,46 @@
+"""transaction composite indexes
+
+Revision ID: 136a52a5c371
+Revises: f7e96c0e7ca6
+Create Date: 2026-10-18 23:00:00.000000
+
+Every transaction query filters on user_id first, so the single-column
+user_id and date indexes are replaced with composite indexes that match
+TransactionRepository.get_by_user and StatisticsService.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '136a52a5c371'
+down_revision: Union[str, None] = 'f7e96c0e7ca6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transactions_user_id_date_created_at', 'transactions',
+                    ['user_id', sa.text('date DESC'), sa.text('created_at DESC')])
+    op.create_index('ix_transactions_user_id_type_date', 'transactions',
+                    ['user_id', 'type', 'date'],
+                    postgresql_include=['amount', 'category_id'])
+    op.create_index('ix_transactions_user_id_category_id_date', 'transactions',
+                    ['user_id', 'category_id', 'date'])
+    op.create_index('ix_transactions_user_id_account_id_date', 'transactions',
+                    ['user_id', 'account_id', 'date'])
+    op.create_index('ix_transactions_user_id_to_account_id', 'transactions',
+                    ['user_id', 'to_account_id'])
+    op.drop_index('ix_transactions_user_id', table_name='transactions')
+    op.drop_index('ix_transactions_date', table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index('ix_transactions_date', 'transactions', ['date'])
+    op.create_index('ix_transactions_user_id', 'transactions', ['user_id'])
+    op.drop_index('ix_transactions_user_id_to_account_id', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_account_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_category_id_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_type_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_date_created_at', table_name='transactions')
@@ -0,0 +1,78 @@
+"""add recurring rules
+
+Revision ID: 14fa90346898
+Revises: afd7039880fd
+Create Date: 2026-10-19 01:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = '14fa90346898'
+down_revision: Union[str, None] = 'afd7039880fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    recurrencefrequency = sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY',
+                                  name='recurrencefrequency')
+    recurrencefrequency.create(op.get_bind(), checkfirst=True)
+    transactiontype = postgresql.ENUM(name='transactiontype', create_type=False)
+
+    op.create_table(
+        'recurring_rules',
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('amount', Money(), nullable=False),
+        sa.Column('type', transactiontype, nullable=False),
+        sa.Column('category_id', sa.Uuid(), nullable=True),
+        sa.Column('account_id', sa.Uuid(), nullable=False),
+        sa.Column('to_account_id', sa.Uuid(), nullable=True),
+        sa.Column('note', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column('tag_ids', postgresql.ARRAY(sa.Uuid()), nullable=False,
+                  server_default=sa.text("'{}'::uuid[]")),
+        sa.Column('frequency', postgresql.ENUM(name='recurrencefrequency', create_type=False),
+                  nullable=False),
+        sa.Column('interval', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('next_date', sa.Date(), nullable=False),
+        sa.Column('occurrence_count', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+        sa.ForeignKeyConstraint(['to_account_id'], ['accounts.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_recurring_rules_user_id'), 'recurring_rules', ['user_id'])
+    op.create_index('ix_recurring_rules_next_date', 'recurring_rules', ['next_date'],
+                    postgresql_where=sa.text('is_active'))
+
+    op.add_column('transactions', sa.Column('recurring_rule_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('transactions_recurring_rule_id_fkey', 'transactions',
+                          'recurring_rules', ['recurring_rule_id'], ['id'],
+                          ondelete='SET NULL')
+    op.create_index('ix_transactions_recurring_rule_id_date', 'transactions',
+                    ['recurring_rule_id', 'date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_recurring_rule_id_date', table_name='transactions')
+    op.drop_constraint('transactions_recurring_rule_id_fkey', 'transactions',
+                       type_='foreignkey')
+    op.drop_column('transactions', 'recurring_rule_id')
+    op.drop_index('ix_recurring_rules_next_date', table_name='recurring_rules')
+    op.drop_index(op.f('ix_recurring_rules_user_id'), table_name='recurring_rules')
+    op.drop_table('recurring_rules')
+    sa.Enum(name='recurrencefrequency').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,66 @@
+"""add recurring suggestions
+
+Revision ID: 32372a4bba67
+Revises: 14fa90346898
+Create Date: 2026-10-19 03:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = '32372a4bba67'
+down_revision: Union[str, None] = '14fa90346898'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    suggestionstatus = sa.Enum('PENDING', 'ACCEPTED', 'DISMISSED',
+                               name='suggestionstatus')
+    suggestionstatus.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'recurring_suggestions',
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('account_id', sa.Uuid(), nullable=False),
+        sa.Column('category_id', sa.Uuid(), nullable=True),
+        sa.Column('type', postgresql.ENUM(name='transactiontype', create_type=False),
+                  nullable=False),
+        sa.Column('note_key', sqlmodel.sql.sqltypes.AutoString(length=500),
+                  nullable=False),
+        sa.Column('note', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column('amount', Money(), nullable=False),
+        sa.Column('frequency', postgresql.ENUM(name='recurrencefrequency', create_type=False),
+                  nullable=False),
+        sa.Column('interval', sa.Integer(), nullable=False),
+        sa.Column('occurrences', sa.Integer(), nullable=False),
+        sa.Column('first_date', sa.Date(), nullable=False),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('next_date', sa.Date(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('status', postgresql.ENUM(name='suggestionstatus', create_type=False),
+                  nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_recurring_suggestions_user_id'), 'recurring_suggestions',
+                    ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recurring_suggestions_user_id'),
+                  table_name='recurring_suggestions')
+    op.drop_table('recurring_suggestions')
+    sa.Enum(name='suggestionstatus').drop(op.get_bind(), checkfirst=True)
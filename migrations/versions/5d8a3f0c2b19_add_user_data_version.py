@@ -0,0 +1,27 @@
+"""add user data version
+
+Revision ID: 5d8a3f0c2b19
+Revises: c69e7e6827ff
+Create Date: 2026-10-19 07:00:00.000000
+
+Cached statistics are keyed by users.data_version, which every write to a
+user's data increments in the same transaction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a3f0c2b19'
+down_revision: Union[str, None] = 'c69e7e6827ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,60 @@
+"""add daily rollups
+
+Revision ID: 63a4c6c12907
+Revises: 32372a4bba67
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = '63a4c6c12907'
+down_revision: Union[str, None] = '32372a4bba67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    transactiontype = postgresql.ENUM(name='transactiontype', create_type=False)
+    op.create_table(
+        'daily_rollups',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('type', transactiontype, nullable=False),
+        sa.Column('category_id', sa.Uuid(), nullable=True),
+        sa.Column('account_id', sa.Uuid(), nullable=False),
+        sa.Column('amount', Money(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # A missing category is keyed as the nil UUID so NULLs conflict like
+    # any other value (see app.models.daily_rollup.ROLLUP_INDEX)
+    op.create_index('ux_daily_rollups_key', 'daily_rollups',
+                    ['user_id', 'date', 'type',
+                     sa.text("coalesce(category_id, '00000000-0000-0000-0000-000000000000')"),
+                     'account_id'],
+                    unique=True)
+
+    op.execute("""
+        INSERT INTO daily_rollups
+            (id, user_id, date, type, category_id, account_id, amount, transaction_count)
+        SELECT gen_random_uuid(), user_id, date, type, category_id, account_id,
+               SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, date, type, category_id, account_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_daily_rollups_key', table_name='daily_rollups')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,73 @@
+"""add transaction fingerprint
+
+Revision ID: afd7039880fd
+Revises: c1e2cf931359
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from decimal import Decimal
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.core.fingerprint import transaction_fingerprint
+from app.core.money import from_minor
+
+# revision identifiers, used by Alembic.
+revision: str = 'afd7039880fd'
+down_revision: Union[str, None] = 'c1e2cf931359'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column(
+        'fingerprint', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True))
+    op.add_column('transaction_import_rows', sa.Column(
+        'fingerprint', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False))
+
+    # The hash is computed in Python, so backfill in keyset-paginated batches
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = ("SELECT id, account_id, date, amount, type, note FROM transactions "
+                 "WHERE fingerprint IS NULL")
+        params = {'limit': BATCH_SIZE}
+        if last_id is not None:
+            query += " AND id > :last_id"
+            params['last_id'] = last_id
+        rows = bind.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE transactions SET fingerprint = :fingerprint WHERE id = :id"),
+            [
+                {
+                    'id': row.id,
+                    'fingerprint': transaction_fingerprint(
+                        row.account_id,
+                        row.date,
+                        # BIGINT when money is stored in minor units
+                        row.amount if isinstance(row.amount, Decimal)
+                        else from_minor(row.amount),
+                        row.type,
+                        row.note,
+                    ),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.create_index('ix_transactions_user_id_fingerprint', 'transactions',
+                    ['user_id', 'fingerprint'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_id_fingerprint', table_name='transactions')
+    op.drop_column('transaction_import_rows', 'fingerprint')
+    op.drop_column('transactions', 'fingerprint')
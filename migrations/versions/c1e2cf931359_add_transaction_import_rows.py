@@ -0,0 +1,47 @@
+"""add transaction import rows
+
+Revision ID: c1e2cf931359
+Revises: fc7e8c869678
+Create Date: 2026-10-19 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1e2cf931359'
+down_revision: Union[str, None] = 'fc7e8c869678'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Staging table for statement imports; rows are deleted once merged
+    transactiontype = postgresql.ENUM(name='transactiontype', create_type=False)
+    op.create_table(
+        'transaction_import_rows',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('import_id', sa.Uuid(), nullable=False),
+        sa.Column('posting_id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('account_id', sa.Uuid(), nullable=False),
+        sa.Column('type', transactiontype, nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount', Money(), nullable=False),
+        sa.Column('note', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_transaction_import_rows_import_id'),
+                    'transaction_import_rows', ['import_id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transaction_import_rows_import_id'),
+                  table_name='transaction_import_rows')
+    op.drop_table('transaction_import_rows')
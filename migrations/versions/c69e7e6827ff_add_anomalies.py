@@ -0,0 +1,65 @@
+"""add anomalies
+
+Revision ID: c69e7e6827ff
+Revises: f49b9b3b8a3b
+Create Date: 2026-10-19 06:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = 'c69e7e6827ff'
+down_revision: Union[str, None] = 'f49b9b3b8a3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    anomalykind = sa.Enum('TRANSACTION', 'CATEGORY_MONTH', name='anomalykind')
+    anomalykind.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'anomalies',
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('kind', postgresql.ENUM(name='anomalykind', create_type=False),
+                  nullable=False),
+        sa.Column('type', postgresql.ENUM(name='transactiontype', create_type=False),
+                  nullable=False),
+        sa.Column('category_id', sa.Uuid(), nullable=True),
+        sa.Column('transaction_id', sa.Uuid(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount', Money(), nullable=False),
+        sa.Column('expected', Money(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_anomalies_user_id_kind_date', 'anomalies',
+                    ['user_id', 'kind', 'date'])
+
+    op.create_table(
+        'anomaly_refreshes',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('requested_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('anomaly_refreshes')
+    op.drop_index('ix_anomalies_user_id_kind_date', table_name='anomalies')
+    op.drop_table('anomalies')
+    sa.Enum(name='anomalykind').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""transaction tags tag index
+
+Revision ID: f49b9b3b8a3b
+Revises: 63a4c6c12907
+Create Date: 2026-10-19 05:00:00.000000
+
+The (transaction_id, tag_id) primary key only serves lookups by
+transaction; tag statistics need the tag_id -> transaction_id direction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f49b9b3b8a3b'
+down_revision: Union[str, None] = '63a4c6c12907'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transaction_tags_tag_id_transaction_id', 'transaction_tags',
+                    ['tag_id', 'transaction_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_tags_tag_id_transaction_id',
+                  table_name='transaction_tags')
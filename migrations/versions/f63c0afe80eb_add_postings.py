@@ -0,0 +1,61 @@
+"""add postings
+
+Revision ID: f63c0afe80eb
+Revises: 136a52a5c371
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import Money
+
+# revision identifiers, used by Alembic.
+revision: str = 'f63c0afe80eb'
+down_revision: Union[str, None] = '136a52a5c371'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    transactiontype = postgresql.ENUM(name='transactiontype', create_type=False)
+    op.create_table(
+        'postings',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('transaction_id', sa.Uuid(), nullable=False),
+        sa.Column('account_id', sa.Uuid(), nullable=False),
+        sa.Column('type', transactiontype, nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount', Money(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_postings_transaction_id', 'postings', ['transaction_id'])
+    op.create_index('ix_postings_user_id_account_id_date', 'postings',
+                    ['user_id', 'account_id', sa.text('date DESC')],
+                    postgresql_include=['amount', 'type', 'transaction_id'])
+
+    # Backfill one leg per account: income credits, expenses debit, and
+    # transfers debit the source and credit the destination.
+    op.execute("""
+        INSERT INTO postings (id, user_id, transaction_id, account_id, type, date, amount)
+        SELECT gen_random_uuid(), user_id, id, account_id, type, date,
+               CASE WHEN type = 'INCOME' THEN amount ELSE -amount END
+        FROM transactions
+        UNION ALL
+        SELECT gen_random_uuid(), user_id, id, to_account_id, type, date, amount
+        FROM transactions
+        WHERE type = 'TRANSFER' AND to_account_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_postings_user_id_account_id_date', table_name='postings')
+    op.drop_index('ix_postings_transaction_id', table_name='postings')
+    op.drop_table('postings')
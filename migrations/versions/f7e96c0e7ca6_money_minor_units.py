@@ -0,0 +1,63 @@
+"""money minor units
+
+Revision ID: f7e96c0e7ca6
+Revises: 647aee90bb3f
+Create Date: 2026-10-18 22:30:00.000000
+
+Converts money columns from NUMERIC(15, 2) to BIGINT minor units when
+``MONEY_STORAGE=minor_units`` is configured. With the default ``numeric``
+storage the upgrade is a no-op. Downgrade converts any BIGINT money column
+back to NUMERIC, so switching storage later means downgrade, change the
+setting, upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7e96c0e7ca6'
+down_revision: Union[str, None] = '647aee90bb3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_COLUMNS = [
+    ('transactions', 'amount'),
+    ('accounts', 'balance'),
+    ('accounts', 'initial_balance'),
+    ('budgets', 'amount'),
+]
+
+
+def _is_bigint(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(
+        c['name'] == column and isinstance(c['type'], sa.BigInteger)
+        for c in columns
+    )
+
+
+def upgrade() -> None:
+    if get_settings().money_storage != 'minor_units':
+        return
+    for table, column in MONEY_COLUMNS:
+        if _is_bigint(table, column):
+            continue
+        op.alter_column(table, column,
+                   existing_type=sa.Numeric(15, 2),
+                   type_=sa.BigInteger(),
+                   existing_nullable=False,
+                   postgresql_using=f'round({column} * 100)::bigint')
+
+
+def downgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        if not _is_bigint(table, column):
+            continue
+        op.alter_column(table, column,
+                   existing_type=sa.BigInteger(),
+                   type_=sa.Numeric(15, 2),
+                   existing_nullable=False,
+                   postgresql_using=f'({column} / 100.0)::numeric(15, 2)')
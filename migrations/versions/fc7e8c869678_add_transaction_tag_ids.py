@@ -0,0 +1,43 @@
+"""add transaction tag_ids
+
+Revision ID: fc7e8c869678
+Revises: f63c0afe80eb
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'fc7e8c869678'
+down_revision: Union[str, None] = 'f63c0afe80eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column(
+        'tag_ids', postgresql.ARRAY(sa.Uuid()), nullable=False,
+        server_default=sa.text("'{}'::uuid[]")))
+
+    # Backfill from the join table, which remains the source of truth
+    op.execute("""
+        UPDATE transactions AS t
+        SET tag_ids = tt.tag_ids
+        FROM (
+            SELECT transaction_id, array_agg(tag_id ORDER BY tag_id) AS tag_ids
+            FROM transaction_tags
+            GROUP BY transaction_id
+        ) AS tt
+        WHERE tt.transaction_id = t.id
+    """)
+    op.create_index('ix_transactions_tag_ids', 'transactions', ['tag_ids'],
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_tag_ids', table_name='transactions')
+    op.drop_column('transactions', 'tag_ids')
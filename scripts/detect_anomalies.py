@@ -0,0 +1,28 @@
+"""Re-analyse spending anomalies of users whose transactions changed.
+
+Usage: python -m scripts.detect_anomalies [--all]
+
+Writes mark users as stale in the same transaction, and the app re-analyses
+them every ``anomaly_interval_seconds``. Run this when that is disabled, or
+with ``--all`` to re-analyse every user with history. Each user is committed
+on its own.
+"""
+
+import argparse
+import asyncio
+
+from app.database import async_session_maker
+from app.services.anomaly_service import refresh_stale_anomalies
+
+
+async def main(all_users: bool) -> None:
+    count = await refresh_stale_anomalies(async_session_maker, all_users)
+    print(f"Found {count} anomalies")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--all", action="store_true", help="re-analyse every user with history"
+    )
+    asyncio.run(main(parser.parse_args().all))
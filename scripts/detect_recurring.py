@@ -0,0 +1,21 @@
+"""Refresh recurring payment suggestions for all users.
+
+Usage: python -m scripts.detect_recurring
+
+Each user's whole history is analysed in one pass and committed on its own,
+so an interrupted run keeps the users already processed.
+"""
+
+import asyncio
+
+from app.database import async_session_maker
+from app.services.recurring_suggestion_service import detect_recurring_for_all_users
+
+
+async def main() -> None:
+    count = await detect_recurring_for_all_users(async_session_maker)
+    print(f"Found {count} recurring payment suggestions")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+"""Materialize due recurring transactions for all users.
+
+Usage: python -m scripts.materialize_recurring [YYYY-MM-DD]
+
+Safe to run from cron alongside the in-process materializer; due rules are
+locked with SKIP LOCKED, so concurrent runs never create an occurrence twice.
+"""
+
+import asyncio
+import sys
+from datetime import date
+
+from app.database import async_session_maker
+from app.services.recurring_rule_service import materialize_recurring
+
+
+async def main() -> None:
+    today = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    created = await materialize_recurring(async_session_maker, today)
+    print(f"Materialized {created} recurring transactions")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
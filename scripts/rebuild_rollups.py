@@ -0,0 +1,24 @@
+"""Rebuild the daily statistics rollups from transactions.
+
+Usage: python -m scripts.rebuild_rollups [USER_ID ...]
+
+Rollups are kept up to date on every write; run this after backfills or
+manual data fixes. Without arguments every user is rebuilt.
+"""
+
+import asyncio
+import sys
+from uuid import UUID
+
+from app.database import async_session_maker
+from app.services.statistics_service import rebuild_daily_rollups
+
+
+async def main() -> None:
+    user_ids = [UUID(arg) for arg in sys.argv[1:]] or None
+    written = await rebuild_daily_rollups(async_session_maker, user_ids)
+    print(f"Wrote {written} daily rollup rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,232 @@
+import asyncio
+from contextlib import suppress
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.models.account import Account, AccountType
+from app.models.category import Category, CategoryType
+from app.models.transaction import Transaction, TransactionType
+
+np = pytest.importorskip("numpy")
+
+from app.core.outliers import gap_filled_sums, robust_z_scores  # noqa: E402
+from app.services.anomaly_service import (  # noqa: E402
+    refresh_stale_anomalies,
+    run_anomaly_refresher,
+)
+
+
+def test_robust_z_scores():
+    """Test scores use each group's median and MAD, with a mean fallback."""
+    # Group 0: spread around 10; group 1: mostly equal values; group 2: flat
+    groups = np.array([0] * 5 + [1] * 5 + [2] * 3)
+    values = np.array([8, 9, 10, 11, 100] + [5, 5, 5, 5, 10] + [7, 7, 7])
+    scores = robust_z_scores(groups, values, 4)
+
+    assert scores.median.tolist() == [10.0, 5.0, 7.0, 0.0]
+    assert scores.count.tolist() == [5, 5, 3, 0]
+    # MAD of group 0 is 1, so 100 lies 90 / (1 / 0.6745) above the median
+    assert scores.score[4] == pytest.approx(90 * 0.6745)
+    assert scores.score[2] == 0
+    # Group 1 has a zero MAD: the mean absolute deviation (1) scales it
+    assert scores.score[9] == pytest.approx(5 * 0.7979)
+    assert scores.score[10:].tolist() == [0, 0, 0]
+
+
+def test_gap_filled_sums():
+    """Test totals cover every period from a group's first to the last one."""
+    groups = np.array([0, 0, 0, 2])
+    periods = np.array([3, 3, 5, 6])
+    values = np.array([1, 2, 4, 8])
+    dense_group, dense_period, totals = gap_filled_sums(
+        groups, periods, values, 3, last_period=6
+    )
+    assert dense_group.tolist() == [0, 0, 0, 0, 2]
+    assert dense_period.tolist() == [3, 4, 5, 6, 6]
+    assert totals.tolist() == [3, 0, 4, 0, 8]
+
+
+def _month_start(months_ago: int) -> date:
+    today = date.today()
+    month = today.year * 12 + today.month - 1 - months_ago
+    return date(month // 12, month % 12 + 1, 1)
+
+
+@pytest.fixture
+async def history(async_session: AsyncSession, test_user_id: str):
+    """Steady monthly groceries with one very large purchase this month."""
+    user_id = UUID(test_user_id)
+    account = Account(user_id=user_id, name="Bank", type=AccountType.BANK)
+    groceries = Category(
+        user_id=user_id,
+        name="Groceries",
+        icon="cart",
+        color="#00AA00",
+        type=CategoryType.EXPENSE,
+    )
+    async_session.add_all([account, groceries])
+    await async_session.flush()
+
+    def expense(amount: str, day: date) -> Transaction:
+        return Transaction(
+            user_id=user_id,
+            account_id=account.id,
+            category_id=groceries.id,
+            type=TransactionType.EXPENSE,
+            amount=Decimal(amount),
+            date=day,
+        )
+
+    amounts = ["40", "45", "50", "55", "60", "42", "48", "52", "58"]
+    transactions = [
+        expense(amount, _month_start(months_ago))
+        for months_ago, amount in enumerate(amounts, start=1)
+    ]
+    transactions.append(expense("480", _month_start(0)))
+    async_session.add_all(transactions)
+    await async_session.commit()
+    return {"account": account, "groceries": groceries}
+
+
+async def run_refresh_job(async_session: AsyncSession) -> int:
+    """Commit the test session and run the job on its own sessions."""
+    await async_session.commit()
+    return await refresh_stale_anomalies(
+        sessionmaker(async_session.bind, class_=AsyncSession, expire_on_commit=False)
+    )
+
+
+@pytest.mark.asyncio
+async def test_anomalies_flag_large_transaction_and_month(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    history: dict,
+):
+    """Test the outlier and its month are flagged against the usual amounts."""
+    assert await run_refresh_job(async_session) == 2
+    response = await client.get("/api/v1/statistics/anomalies", headers=auth_headers)
+    assert response.status_code == 200
+    anomalies = {a["kind"]: a for a in response.json()["data"]}
+    assert set(anomalies) == {"transaction", "category_month"}
+
+    transaction = anomalies["transaction"]
+    assert transaction["category_id"] == str(history["groceries"].id)
+    assert transaction["type"] == "expense"
+    assert transaction["transaction_id"] is not None
+    assert Decimal(str(transaction["amount"])) == Decimal("480.00")
+    assert Decimal(str(transaction["expected"])) == Decimal("51.00")
+    assert transaction["score"] > 3.5
+
+    month = anomalies["category_month"]
+    assert month["transaction_id"] is None
+    assert month["date"] == str(_month_start(0))
+    assert Decimal(str(month["amount"])) == Decimal("480.00")
+
+    response = await client.get(
+        "/api/v1/statistics/anomalies",
+        headers=auth_headers,
+        params={"kind": "transaction", "endDate": str(_month_start(1))},
+    )
+    assert response.json()["data"] == []
+
+
+@pytest.mark.asyncio
+async def test_anomalies_follow_transaction_writes(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    history: dict,
+):
+    """Test writes mark users stale and the job re-analyses only them."""
+    # Reads never analyse; the job picks up the fixture's writes
+    response = await client.get("/api/v1/statistics/anomalies", headers=auth_headers)
+    assert response.json()["data"] == []
+    await run_refresh_job(async_session)
+    response = await client.get("/api/v1/statistics/anomalies", headers=auth_headers)
+    transaction = next(a for a in response.json()["data"] if a["kind"] == "transaction")
+    assert await run_refresh_job(async_session) == 0
+
+    response = await client.put(
+        f"/api/v1/transactions/{transaction['transaction_id']}",
+        headers=auth_headers,
+        json={"amount": 51.00},
+    )
+    assert response.status_code == 200
+    await run_refresh_job(async_session)
+    response = await client.get("/api/v1/statistics/anomalies", headers=auth_headers)
+    assert response.json()["data"] == []
+
+    response = await client.post(
+        "/api/v1/transactions",
+        headers=auth_headers,
+        json={
+            "amount": 900.00,
+            "type": "expense",
+            "category_id": str(history["groceries"].id),
+            "account_id": str(history["account"].id),
+            "date": str(date.today()),
+        },
+    )
+    assert response.status_code == 200
+    created_id = response.json()["data"]["id"]
+    await run_refresh_job(async_session)
+    response = await client.get(
+        "/api/v1/statistics/anomalies",
+        headers=auth_headers,
+        params={"kind": "transaction"},
+    )
+    [anomaly] = response.json()["data"]
+    assert anomaly["transaction_id"] == created_id
+
+
+@pytest.mark.asyncio
+async def test_refresh_replaces_previous_results(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    history: dict,
+):
+    """Test repeated refreshes replace the user's anomalies, not add to them."""
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/statistics/anomalies/refresh", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_background_refresher_picks_up_writes(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    async_session: AsyncSession,
+    history: dict,
+):
+    """Test the in-process refresher analyses users after their writes."""
+    refresher = asyncio.create_task(
+        run_anomaly_refresher(
+            sessionmaker(
+                async_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            interval=0,
+        )
+    )
+    try:
+        for _ in range(100):
+            response = await client.get(
+                "/api/v1/statistics/anomalies", headers=auth_headers
+            )
+            if response.json()["data"]:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+    assert len(response.json()["data"]) == 2
@@ -0,0 +1,220 @@
+import io
+import json
+import zipfile
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.core.streaming import ChunkBuffer
+from app.models.account import Account, AccountType
+from app.models.category import Category, CategoryType
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionTag, TransactionType
+from app.models.user import User
+from app.repositories.posting_repo import PostingRepository
+from app.schemas.common import TokenData
+
+
+@pytest.fixture
+async def setup_data(async_session: AsyncSession, test_user_id: str):
+    """Set up a user with accounts, a category, a tag and transactions."""
+    user_id = UUID(test_user_id)
+    user = User(
+        id=user_id,
+        email="backup@example.com",
+        password_hash="hash",
+        name="Backup User",
+        currency="USD",
+    )
+    account = Account(
+        user_id=user_id, name="Cash", type=AccountType.CASH, balance=Decimal("950")
+    )
+    savings = Account(
+        user_id=user_id, name="Savings", type=AccountType.BANK, balance=Decimal("100")
+    )
+    category = Category(
+        user_id=user_id,
+        name="Food",
+        icon="food",
+        color="#FF5733",
+        type=CategoryType.EXPENSE,
+    )
+    tag = Tag(user_id=user_id, name="Daily", usage_count=1)
+    async_session.add_all([user, account, savings, category, tag])
+    await async_session.flush()
+
+    expense = Transaction(
+        user_id=user_id,
+        amount=Decimal("50"),
+        type=TransactionType.EXPENSE,
+        category_id=category.id,
+        account_id=account.id,
+        date=date(2026, 3, 1),
+        note="Lunch",
+        tag_ids=[tag.id],
+    )
+    transfer = Transaction(
+        user_id=user_id,
+        amount=Decimal("100"),
+        type=TransactionType.TRANSFER,
+        account_id=account.id,
+        to_account_id=savings.id,
+        date=date(2026, 3, 2),
+    )
+    async_session.add_all([expense, transfer])
+    await async_session.flush()
+    async_session.add(TransactionTag(transaction_id=expense.id, tag_id=tag.id))
+    await async_session.commit()
+    return {"account": account, "savings": savings, "expense": expense}
+
+
+async def _other_user(async_session: AsyncSession) -> dict[str, str]:
+    user = User(email="restore@example.com", password_hash="hash", name="New")
+    async_session.add(user)
+    await async_session.commit()
+    token = create_access_token(data=TokenData(sub=str(user.id)))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_chunk_buffer_streams_zip():
+    """Test a zip written to the non-seekable buffer is readable when joined."""
+    buffer = ChunkBuffer()
+    chunks = []
+    archive = zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED)
+    with archive, archive.open("rows.ndjson", "w") as member:
+        for i in range(1000):
+            member.write(f'{{"i":{i}}}\n'.encode())
+            chunks.append(buffer.drain())
+    chunks.append(buffer.drain())
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert len(archive.read("rows.ndjson").splitlines()) == 1000
+
+
+@pytest.mark.asyncio
+async def test_backup_archive(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test the backup is a zip of NDJSON tables without secrets."""
+    response = await client.get("/api/v1/users/me/backup", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["counts"] == {
+            "users": 1,
+            "accounts": 2,
+            "categories": 1,
+            "tags": 1,
+            "budgets": 0,
+            "recurring_rules": 0,
+            "transactions": 2,
+            "transaction_tags": 1,
+        }
+        users = [json.loads(line) for line in archive.read("users.ndjson").splitlines()]
+        assert "password_hash" not in users[0]
+        transactions = [
+            json.loads(line)
+            for line in archive.read("transactions.ndjson").splitlines()
+        ]
+        assert {t["amount"] for t in transactions} == {"50.00", "100.00"}
+
+
+@pytest.mark.asyncio
+async def test_restore_backup(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test a backup restores into another user with remapped ids."""
+    backup = (await client.get("/api/v1/users/me/backup", headers=auth_headers)).content
+    other_headers = await _other_user(async_session)
+
+    response = await client.post(
+        "/api/v1/users/me/restore",
+        headers=other_headers,
+        files={"file": ("backup.zip", backup, "application/zip")},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["restored"]["transactions"] == 2
+
+    response = await client.get("/api/v1/users/me", headers=other_headers)
+    assert response.json()["data"]["name"] == "Backup User"
+    assert response.json()["data"]["currency"] == "USD"
+
+    response = await client.get("/api/v1/accounts", headers=other_headers)
+    accounts = {a["name"]: a for a in response.json()["data"]}
+    assert Decimal(str(accounts["Cash"]["balance"])) == Decimal("950")
+    assert accounts["Cash"]["id"] != str(setup_data["account"].id)
+
+    response = await client.get("/api/v1/transactions", headers=other_headers)
+    transactions = response.json()["data"]
+    assert len(transactions) == 2
+    assert str(setup_data["expense"].id) not in {t["id"] for t in transactions}
+    expense = next(t for t in transactions if t["type"] == "expense")
+    response = await client.get(
+        f"/api/v1/transactions?tagId={expense['tag_ids'][0]}", headers=other_headers
+    )
+    assert [t["id"] for t in response.json()["data"]] == [expense["id"]]
+
+    restored_user = (
+        await client.get("/api/v1/users/me", headers=other_headers)
+    ).json()["data"]["id"]
+    changes = await PostingRepository(async_session).get_balance_changes(
+        UUID(restored_user)
+    )
+    assert changes == {
+        UUID(accounts["Cash"]["id"]): Decimal("-150"),
+        UUID(accounts["Savings"]["id"]): Decimal("100"),
+    }
+
+    # Rollups are rebuilt along with postings
+    response = await client.get(
+        "/api/v1/statistics/summary?startDate=2026-03-01&endDate=2026-03-31",
+        headers=other_headers,
+    )
+    summary = response.json()["data"]
+    assert Decimal(summary["total_expense"]) == Decimal("50")
+    assert summary["transaction_count"] == 2
+
+    # A second restore into the now non-empty user is rejected
+    response = await client.post(
+        "/api/v1/users/me/restore",
+        headers=other_headers,
+        files={"file": ("backup.zip", backup, "application/zip")},
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_restore_rejects_invalid_archive(
+    client: AsyncClient,
+    async_session: AsyncSession,
+):
+    """Test restoring something that is not a backup returns 400."""
+    headers = await _other_user(async_session)
+    response = await client.post(
+        "/api/v1/users/me/restore",
+        headers=headers,
+        files={"file": ("backup.zip", b"not a zip", "application/zip")},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_backup_unknown_user(client: AsyncClient):
+    """Test a backup for a user that does not exist returns 404."""
+    token = create_access_token(data=TokenData(sub=str(uuid4())))
+    response = await client.get(
+        "/api/v1/users/me/backup", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
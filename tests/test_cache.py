@@ -0,0 +1,168 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import MemoryCacheBackend, get_cache_backend, set_cache_backend
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.statistics_service import StatisticsService
+
+MARCH = (date(2026, 3, 1), date(2026, 3, 31))
+
+
+@pytest.fixture
+def cache_backend():
+    """Install a fresh in-process cache for the test."""
+    previous = get_cache_backend()
+    backend = MemoryCacheBackend(max_entries=100, max_bytes=1 << 20)
+    set_cache_backend(backend)
+    yield backend
+    set_cache_backend(previous)
+
+
+@pytest.fixture
+async def user_id(async_session: AsyncSession, test_user_id: str) -> UUID:
+    """Create the test user, whose row holds the data version."""
+    user = User(
+        id=UUID(test_user_id), email="cache@example.com", password_hash="x", name="C"
+    )
+    async_session.add(user)
+    await async_session.commit()
+    return user.id
+
+
+@pytest.fixture
+def statements(async_session: AsyncSession):
+    """Count SQL statements sent by the session's engine."""
+    executed = []
+    engine = async_session.bind.sync_engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+async def add_expense(
+    session: AsyncSession, user_id: UUID, account: Account, amount: str
+) -> None:
+    session.add(
+        Transaction(
+            user_id=user_id,
+            account_id=account.id,
+            type=TransactionType.EXPENSE,
+            amount=Decimal(amount),
+            date=date(2026, 3, 10),
+        )
+    )
+    await session.flush()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    """Test the LRU honours both the entry and the byte limit."""
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=20)
+    await backend.set("a", b"1")
+    await backend.set("b", b"2")
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3")
+    assert await backend.get("b") is None
+    assert len(backend) == 2
+
+    await backend.set("d", b"x" * 15)
+    assert await backend.get("a") is None
+    assert await backend.get("d") == b"x" * 15
+    assert backend.size <= 20
+
+    await backend.set("e", b"x" * 50)
+    assert await backend.get("e") is None
+
+
+@pytest.mark.asyncio
+async def test_statistics_cached_until_commit(
+    async_session: AsyncSession,
+    user_id: UUID,
+    cache_backend: MemoryCacheBackend,
+    statements: list[str],
+):
+    """Test repeated reads only look up the data version until a commit."""
+    account = Account(user_id=user_id, name="Bank", type=AccountType.BANK)
+    async_session.add(account)
+    await add_expense(async_session, user_id, account, "10.00")
+    await async_session.commit()
+
+    service = StatisticsService(async_session)
+    first = await service.get_monthly_summary(user_id, *MARCH)
+    executed = len(statements)
+    assert await service.get_monthly_summary(user_id, *MARCH) == first
+    assert len(statements) == executed + 1
+
+    # Different parameters are cached separately
+    other = await service.get_monthly_summary(user_id, date(2026, 4, 1), MARCH[1])
+    assert other.transaction_count == 0
+    assert len(statements) > executed
+
+    # Uncommitted writes of the same user bypass the cache
+    await add_expense(async_session, user_id, account, "5.00")
+    pending = await service.get_monthly_summary(user_id, *MARCH)
+    assert pending.total_expense == Decimal("15.00")
+
+    # Committing makes the next read see the new data
+    await async_session.commit()
+    executed = len(statements)
+    summary = await service.get_monthly_summary(user_id, *MARCH)
+    assert summary.total_expense == Decimal("15.00")
+    assert len(statements) > executed
+
+
+@pytest.mark.asyncio
+async def test_writes_only_invalidate_their_user(
+    async_session: AsyncSession,
+    user_id: UUID,
+    cache_backend: MemoryCacheBackend,
+    statements: list[str],
+):
+    """Test another user's commit leaves cached results in place."""
+    service = StatisticsService(async_session)
+    await service.get_category_breakdown(user_id, *MARCH)
+
+    other_user = uuid4()
+    async_session.add(Account(user_id=other_user, name="Other", type=AccountType.CASH))
+    await async_session.commit()
+
+    executed = len(statements)
+    await service.get_category_breakdown(user_id, *MARCH)
+    assert len(statements) == executed + 1
+
+
+@pytest.mark.asyncio
+async def test_writes_from_other_sessions_invalidate(
+    async_session: AsyncSession,
+    user_id: UUID,
+    cache_backend: MemoryCacheBackend,
+):
+    """Test a commit made elsewhere (e.g. a cron script) is seen at once."""
+    account = Account(user_id=user_id, name="Bank", type=AccountType.BANK)
+    async_session.add(account)
+    await async_session.commit()
+    service = StatisticsService(async_session)
+    assert (await service.get_monthly_summary(user_id, *MARCH)).transaction_count == 0
+    await async_session.commit()
+
+    session_maker = sessionmaker(
+        async_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_maker() as other:
+        await add_expense(other, user_id, account, "10.00")
+        await other.commit()
+
+    summary = await service.get_monthly_summary(user_id, *MARCH)
+    assert summary.total_expense == Decimal("10.00")
@@ -0,0 +1,267 @@
+"""EXPLAIN checks for the transaction indexes.
+
+These run against a real PostgreSQL database because SQLite has neither
+covering indexes nor a comparable planner. Point ``TEST_POSTGRES_URL`` at a
+disposable database (e.g. ``postgresql+asyncpg://ai:ai@localhost:5532/test``)
+to enable them; tables are created and dropped by the fixture.
+"""
+
+import os
+import random
+from collections.abc import AsyncGenerator
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel
+
+from app.models import *  # noqa: F403 - Import all models
+from app.models.account import Account
+from app.models.category import Category, CategoryType
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionTag, TransactionType
+from app.models.types import sum_minor
+from app.models.user import User
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+USERS = 40
+TRANSACTIONS_PER_USER = 250
+SCAN_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pg() -> AsyncGenerator[tuple[AsyncEngine, dict[str, UUID]], None]:
+    """Create the schema on Postgres and fill it with analyzed sample data."""
+    engine = create_async_engine(POSTGRES_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    rng = random.Random(42)
+    users, accounts, categories, transactions = [], [], [], []
+    tags, transaction_tags = [], []
+    for n in range(USERS):
+        user_id = uuid4()
+        users.append(
+            {
+                "id": user_id,
+                "email": f"user{n}@example.com",
+                "password_hash": "x",
+                "name": f"User {n}",
+            }
+        )
+        account_ids = [uuid4() for _ in range(4)]
+        category_ids = [uuid4() for _ in range(5)]
+        tag_ids = [uuid4() for _ in range(3)]
+        accounts += [
+            {"id": a, "user_id": user_id, "name": "Account"} for a in account_ids
+        ]
+        categories += [
+            {
+                "id": c,
+                "user_id": user_id,
+                "name": "Category",
+                "icon": "icon",
+                "color": "#000000",
+                "type": CategoryType.EXPENSE,
+            }
+            for c in category_ids
+        ]
+        tags += [{"id": t, "user_id": user_id, "name": "Tag"} for t in tag_ids]
+        for _ in range(TRANSACTIONS_PER_USER):
+            transaction_id = uuid4()
+            transaction_type = rng.choice(list(TransactionType))
+            tagged = rng.sample(tag_ids, rng.randint(0, 2))
+            transaction_tags += [
+                {"transaction_id": transaction_id, "tag_id": t} for t in tagged
+            ]
+            transactions.append(
+                {
+                    "id": transaction_id,
+                    "user_id": user_id,
+                    "amount": Decimal(rng.randint(1, 100000)) / 100,
+                    "type": transaction_type,
+                    "category_id": rng.choice(category_ids),
+                    "account_id": rng.choice(account_ids),
+                    "to_account_id": (
+                        rng.choice(account_ids)
+                        if transaction_type == TransactionType.TRANSFER
+                        else None
+                    ),
+                    "date": date(2024, 1, 1) + timedelta(days=rng.randint(0, 730)),
+                    "tag_ids": tagged,
+                }
+            )
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), users)
+        await conn.execute(insert(Account), accounts)
+        await conn.execute(insert(Category), categories)
+        await conn.execute(insert(Tag), tags)
+        await conn.execute(insert(Transaction), transactions)
+        await conn.execute(insert(TransactionTag), transaction_tags)
+
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with autocommit.connect() as conn:
+        await conn.execute(text("VACUUM ANALYZE"))
+
+    sample = {
+        "user_id": users[0]["id"],
+        "account_id": accounts[0]["id"],
+        "category_id": categories[0]["id"],
+        "tag_id": tags[0]["id"],
+    }
+    yield engine, sample
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+
+async def explain(engine: AsyncEngine, statement) -> list[tuple[str, str | None]]:
+    """Return (node type, index name) pairs of the statement's plan."""
+    sql = statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar_one()[0]["Plan"]
+
+    nodes = []
+
+    def walk(node: dict) -> None:
+        nodes.append((node["Node Type"], node.get("Index Name")))
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan)
+    return nodes
+
+
+def assert_uses_index(nodes, index_name: str, node_types=SCAN_NODES) -> None:
+    assert any(
+        node_type in node_types and name == index_name for node_type, name in nodes
+    ), f"{index_name} not used by plan: {nodes}"
+
+
+def assert_no_seq_scan(nodes) -> None:
+    assert any(node_type in SCAN_NODES for node_type, _ in nodes), nodes
+    assert not any(node_type == "Seq Scan" for node_type, _ in nodes), nodes
+
+
+@pytest.mark.asyncio
+async def test_transaction_list_uses_date_index(pg):
+    """The default transaction listing walks (user_id, date, created_at)."""
+    engine, sample = pg
+    statement = (
+        select(Transaction)
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.date >= date(2025, 1, 1))
+        .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+    )
+    nodes = await explain(engine, statement)
+    assert_uses_index(nodes, "ix_transactions_user_id_date_created_at")
+    assert not any(node_type == "Sort" for node_type, _ in nodes)
+
+
+@pytest.mark.asyncio
+async def test_summary_sum_is_index_only(pg):
+    """Summary sums are answered from the covering (user_id, type, date) index."""
+    engine, sample = pg
+    statement = (
+        select(sum_minor(Transaction.amount))
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.type == TransactionType.EXPENSE)
+        .where(Transaction.date >= date(2025, 1, 1))
+        .where(Transaction.date <= date(2025, 1, 31))
+    )
+    nodes = await explain(engine, statement)
+    assert_uses_index(nodes, "ix_transactions_user_id_type_date", {"Index Only Scan"})
+
+
+@pytest.mark.asyncio
+async def test_category_breakdown_is_index_only(pg):
+    """Category grouping is covered by the included category_id column."""
+    engine, sample = pg
+    statement = (
+        select(Transaction.category_id, sum_minor(Transaction.amount))
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.type == TransactionType.EXPENSE)
+        .where(Transaction.date >= date(2025, 1, 1))
+        .where(Transaction.date <= date(2025, 3, 31))
+        .group_by(Transaction.category_id)
+    )
+    nodes = await explain(engine, statement)
+    assert_uses_index(nodes, "ix_transactions_user_id_type_date", {"Index Only Scan"})
+
+
+@pytest.mark.asyncio
+async def test_transaction_count_uses_index(pg):
+    """The summary count scans an index instead of the table."""
+    engine, sample = pg
+    statement = (
+        select(func.count(Transaction.id))
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.date >= date(2025, 1, 1))
+        .where(Transaction.date <= date(2025, 1, 31))
+    )
+    assert_no_seq_scan(await explain(engine, statement))
+
+
+@pytest.mark.asyncio
+async def test_single_pass_summary_uses_index(pg):
+    """Filtered sums and the count of the summary share one index scan."""
+    engine, sample = pg
+    statement = (
+        select(
+            sum_minor(Transaction.amount, Transaction.type == TransactionType.INCOME),
+            sum_minor(Transaction.amount, Transaction.type == TransactionType.EXPENSE),
+            func.count(Transaction.id),
+        )
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.date >= date(2025, 1, 1))
+        .where(Transaction.date <= date(2025, 1, 31))
+    )
+    assert_no_seq_scan(await explain(engine, statement))
+
+
+@pytest.mark.asyncio
+async def test_category_filter_uses_index(pg):
+    """Filtering by category never falls back to a sequential scan."""
+    engine, sample = pg
+    statement = (
+        select(Transaction)
+        .where(Transaction.user_id == sample["user_id"])
+        .where(Transaction.category_id == sample["category_id"])
+    )
+    assert_no_seq_scan(await explain(engine, statement))
+
+
+@pytest.mark.asyncio
+async def test_account_filter_uses_index(pg):
+    """The account OR to_account filter never falls back to a sequential scan."""
+    engine, sample = pg
+    statement = select(Transaction).where(
+        Transaction.user_id == sample["user_id"],
+        (Transaction.account_id == sample["account_id"])
+        | (Transaction.to_account_id == sample["account_id"]),
+    )
+    assert_no_seq_scan(await explain(engine, statement))
+
+
+@pytest.mark.asyncio
+async def test_tag_lookup_uses_tag_index(pg):
+    """Finding a tag's transactions does not scan the primary key."""
+    engine, sample = pg
+    statement = select(TransactionTag.transaction_id).where(
+        TransactionTag.tag_id == sample["tag_id"]
+    )
+    nodes = await explain(engine, statement)
+    assert_uses_index(nodes, "ix_transaction_tags_tag_id_transaction_id")
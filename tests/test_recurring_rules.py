@@ -0,0 +1,251 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.models.recurring_rule import (
+    RecurrenceFrequency,
+    RecurringRule,
+    occurrence_date,
+)
+from app.models.tag import Tag
+from app.models.transaction import Transaction, TransactionType
+from app.repositories.posting_repo import PostingRepository
+from app.services.recurring_rule_service import RecurringRuleService
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+async def setup_data(async_session: AsyncSession, test_user_id: str):
+    """Set up accounts and a tag."""
+    user_id = UUID(test_user_id)
+    account = Account(
+        user_id=user_id, name="Bank", type=AccountType.BANK, balance=Decimal("5000")
+    )
+    savings = Account(user_id=user_id, name="Savings", type=AccountType.BANK)
+    tag = Tag(user_id=user_id, name="Rent")
+    async_session.add_all([account, savings, tag])
+    await async_session.commit()
+    return {"account": account, "savings": savings, "tag": tag}
+
+
+def test_occurrence_dates():
+    """Test schedules clamp to month end without drifting."""
+    monthly = [
+        occurrence_date(date(2026, 1, 31), RecurrenceFrequency.MONTHLY, 1, i)
+        for i in range(4)
+    ]
+    assert monthly == [
+        date(2026, 1, 31),
+        date(2026, 2, 28),
+        date(2026, 3, 31),
+        date(2026, 4, 30),
+    ]
+    assert occurrence_date(date(2024, 2, 29), RecurrenceFrequency.YEARLY, 1, 1) == date(
+        2025, 2, 28
+    )
+    assert occurrence_date(date(2026, 1, 1), RecurrenceFrequency.WEEKLY, 2, 3) == date(
+        2026, 2, 12
+    )
+
+
+@pytest.mark.asyncio
+async def test_materialize_due_occurrences(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test due occurrences are created in bulk with balances and tags."""
+    data = setup_data
+    response = await client.post(
+        "/api/v1/recurring-rules",
+        headers=auth_headers,
+        json={
+            "amount": 1200,
+            "type": "expense",
+            "account_id": str(data["account"].id),
+            "note": "Rent",
+            "tag_ids": [str(data["tag"].id)],
+            "frequency": "monthly",
+            "start_date": "2026-01-31",
+            "end_date": "2026-04-30",
+        },
+    )
+    assert response.status_code == 200
+    rule_id = response.json()["data"]["id"]
+    response = await client.post(
+        "/api/v1/recurring-rules",
+        headers=auth_headers,
+        json={
+            "amount": 100,
+            "type": "transfer",
+            "account_id": str(data["account"].id),
+            "to_account_id": str(data["savings"].id),
+            "frequency": "weekly",
+            "interval": 2,
+            "start_date": "2026-03-01",
+        },
+    )
+    assert response.status_code == 200
+
+    service = RecurringRuleService(async_session)
+    processed, created = await service.materialize_due(date(2026, 3, 31), limit=1)
+    assert (processed, created) == (1, 3)
+    processed, created = await service.materialize_due(date(2026, 3, 31), limit=10)
+    assert (processed, created) == (1, 3)
+    processed, created = await service.materialize_due(date(2026, 3, 31), limit=10)
+    assert (processed, created) == (0, 0)
+    await async_session.commit()
+
+    response = await client.get(
+        f"/api/v1/transactions?tagId={data['tag'].id}", headers=auth_headers
+    )
+    assert [t["date"] for t in response.json()["data"]] == [
+        "2026-03-31",
+        "2026-02-28",
+        "2026-01-31",
+    ]
+
+    await async_session.refresh(data["account"])
+    await async_session.refresh(data["savings"])
+    await async_session.refresh(data["tag"])
+    assert data["account"].balance == Decimal("1100")
+    assert data["savings"].balance == Decimal("300")
+    assert data["tag"].usage_count == 3
+    changes = await PostingRepository(async_session).get_balance_changes(
+        UUID(test_user_id)
+    )
+    assert changes == {
+        data["account"].id: Decimal("-3900"),
+        data["savings"].id: Decimal("300"),
+    }
+
+    # The last occurrence ends the rule
+    await service.materialize_due(date(2026, 6, 1), limit=10)
+    response = await client.get(
+        f"/api/v1/recurring-rules/{rule_id}", headers=auth_headers
+    )
+    assert response.json()["data"]["is_active"] is False
+    assert response.json()["data"]["next_date"] == "2026-05-31"
+
+
+@pytest.mark.asyncio
+async def test_failing_rules_do_not_block_the_batch(
+    async_session: AsyncSession,
+    test_user_id: str,
+    setup_data,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test a rule that cannot be scheduled or inserted is deactivated alone."""
+    account_id = setup_data["account"].id
+
+    def rule(**fields) -> RecurringRule:
+        return RecurringRule(
+            user_id=UUID(test_user_id),
+            amount=Decimal("10"),
+            type=TransactionType.EXPENSE,
+            account_id=account_id,
+            start_date=date(2026, 5, 1),
+            next_date=date(2026, 5, 1),
+            **fields,
+        )
+
+    healthy = rule(frequency=RecurrenceFrequency.DAILY)
+    # The occurrence after the first lies beyond date.max
+    overflowing = rule(frequency=RecurrenceFrequency.YEARLY, interval=10000)
+    rejected = rule(frequency=RecurrenceFrequency.MONTHLY)
+    async_session.add_all([healthy, overflowing, rejected])
+    await async_session.commit()
+
+    rejected_id = rejected.id
+    insert_many = TransactionService.insert_many
+
+    async def reject(self, transactions):
+        if any(t.recurring_rule_id == rejected_id for t in transactions):
+            raise IntegrityError("INSERT", {}, Exception("rejected"))
+        await insert_many(self, transactions)
+
+    monkeypatch.setattr(TransactionService, "insert_many", reject)
+    service = RecurringRuleService(async_session)
+    processed, created = await service.materialize_due(date(2026, 5, 3), 10)
+    assert (processed, created) == (3, 3)
+    await async_session.commit()
+
+    assert healthy.is_active and healthy.next_date == date(2026, 5, 4)
+    assert not overflowing.is_active and overflowing.occurrence_count == 0
+    assert not rejected.is_active and rejected.occurrence_count == 0
+    count = await async_session.scalar(select(func.count()).select_from(Transaction))
+    assert count == 3
+
+    # Deactivated rules are no longer due
+    assert await service.materialize_due(date(2026, 5, 3), 10) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reschedule_skips_materialized_dates(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test a schedule change resumes after the last created occurrence."""
+    response = await client.post(
+        "/api/v1/recurring-rules",
+        headers=auth_headers,
+        json={
+            "amount": 10,
+            "type": "expense",
+            "account_id": str(setup_data["account"].id),
+            "frequency": "daily",
+            "start_date": "2026-05-01",
+        },
+    )
+    rule_id = response.json()["data"]["id"]
+    await RecurringRuleService(async_session).materialize_due(date(2026, 5, 3), 10)
+
+    response = await client.put(
+        f"/api/v1/recurring-rules/{rule_id}",
+        headers=auth_headers,
+        json={"frequency": "weekly"},
+    )
+    assert response.json()["data"]["next_date"] == "2026-05-08"
+
+
+@pytest.mark.asyncio
+async def test_create_rule_validates_references(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test rules must reference the user's records and a valid schedule."""
+    base = {
+        "amount": 10,
+        "type": "expense",
+        "account_id": str(setup_data["account"].id),
+        "frequency": "monthly",
+        "start_date": "2026-05-01",
+    }
+    response = await client.post(
+        "/api/v1/recurring-rules",
+        headers=auth_headers,
+        json={**base, "account_id": "00000000-0000-0000-0000-000000000000"},
+    )
+    assert response.status_code == 404
+    response = await client.post(
+        "/api/v1/recurring-rules",
+        headers=auth_headers,
+        json={**base, "end_date": "2026-04-01"},
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/v1/recurring-rules", headers=auth_headers, json={**base, "interval": 0}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,191 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+
+np = pytest.importorskip("numpy")
+
+from app.core.periodicity import amount_bands, find_periodic_groups  # noqa: E402
+
+
+def test_find_periodic_groups():
+    """Test only regular, recent groups are reported, with their period."""
+    # Group 1: monthly; group 2: irregular; group 3: weekly but stale;
+    # group 4: weekly with a same-day retry
+    groups = np.array([1] * 5 + [2] * 5 + [3] * 4 + [4] * 5)
+    days = np.array(
+        [0, 30, 61, 91, 122]
+        + [0, 3, 40, 45, 100]
+        + [0, 7, 14, 21]
+        + [100, 107, 107, 114, 121]
+    )
+    result = find_periodic_groups(
+        groups,
+        days,
+        periods=np.array([7.0, 30.44]),
+        tolerances=np.array([1.5, 4.0]),
+        today=125,
+    )
+    assert result.group.tolist() == [1, 4]
+    assert result.period_index.tolist() == [1, 0]
+    assert result.occurrences.tolist() == [5, 4]
+    assert result.regularity.tolist() == [1.0, 1.0]
+    assert result.first.tolist() == [0, 14]
+    assert result.last.tolist() == [4, 18]
+
+
+def test_amount_bands_follow_neighbouring_amounts():
+    """Test bands split only at gaps larger than the ratio, per key."""
+    keys = np.array([0, 0, 0, 0, 1, 1])
+    amounts = np.array([999, 1049, 1100, 5000, 999, 1049])
+    bands, band_keys = amount_bands(keys, amounts, ratio=1.2)
+    assert bands.tolist() == [0, 0, 0, 1, 2, 2]
+    assert band_keys.tolist() == [0, 0, 1]
+
+
+@pytest.fixture
+async def history(async_session: AsyncSession, test_user_id: str):
+    """Monthly and weekly payments among irregular spending."""
+    user_id = UUID(test_user_id)
+    account = Account(user_id=user_id, name="Bank", type=AccountType.BANK)
+    async_session.add(account)
+    await async_session.flush()
+
+    today = date.today()
+
+    def expense(note: str, amount: str, days_ago: int) -> Transaction:
+        return Transaction(
+            user_id=user_id,
+            account_id=account.id,
+            type=TransactionType.EXPENSE,
+            amount=Decimal(amount),
+            date=today - timedelta(days=days_ago),
+            note=note,
+        )
+
+    transactions = [expense("NETFLIX.COM", "15.99", 5 + 30 * i) for i in range(6)]
+    transactions += [expense("Gym #42", "9.50", 2 + 7 * i) for i in range(8)]
+    transactions += [
+        expense("Supermarket", "54.20", days_ago) for days_ago in (1, 9, 10, 33, 80)
+    ]
+    async_session.add_all(transactions)
+    await async_session.commit()
+    return account
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_accept_suggestion(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    history: Account,
+):
+    """Test periodic payments are suggested and can become rules."""
+    response = await client.post(
+        "/api/v1/recurring-rules/suggestions/refresh", headers=auth_headers
+    )
+    assert response.status_code == 200
+    suggestions = {s["note"]: s for s in response.json()["data"]}
+    assert set(suggestions) == {"NETFLIX.COM", "Gym #42"}
+
+    netflix = suggestions["NETFLIX.COM"]
+    assert netflix["frequency"] == "monthly"
+    assert netflix["interval"] == 1
+    assert netflix["occurrences"] == 6
+    assert Decimal(str(netflix["amount"])) == Decimal("15.99")
+    assert netflix["confidence"] == 1.0
+    assert date.fromisoformat(netflix["next_date"]) > date.fromisoformat(
+        netflix["last_date"]
+    )
+    assert suggestions["Gym #42"]["frequency"] == "weekly"
+
+    response = await client.post(
+        f"/api/v1/recurring-rules/suggestions/{netflix['id']}/accept",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    rule = response.json()["data"]
+    assert rule["account_id"] == str(history.id)
+    assert rule["frequency"] == "monthly"
+    assert rule["start_date"] == netflix["next_date"]
+
+    # Accepted payments are not suggested again
+    response = await client.post(
+        "/api/v1/recurring-rules/suggestions/refresh", headers=auth_headers
+    )
+    assert [s["note"] for s in response.json()["data"]] == ["Gym #42"]
+
+    response = await client.post(
+        f"/api/v1/recurring-rules/suggestions/{netflix['id']}/accept",
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_dismissed_suggestion_stays_dismissed(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    history: Account,
+):
+    """Test dismissed payments are left out of later refreshes."""
+    response = await client.post(
+        "/api/v1/recurring-rules/suggestions/refresh", headers=auth_headers
+    )
+    gym = next(s for s in response.json()["data"] if s["note"] == "Gym #42")
+
+    response = await client.post(
+        f"/api/v1/recurring-rules/suggestions/{gym['id']}/dismiss",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/api/v1/recurring-rules/suggestions/refresh", headers=auth_headers
+    )
+    assert [s["note"] for s in response.json()["data"]] == ["NETFLIX.COM"]
+
+    response = await client.get(
+        "/api/v1/recurring-rules/suggestions", headers=auth_headers
+    )
+    assert [s["note"] for s in response.json()["data"]] == ["NETFLIX.COM"]
+
+
+@pytest.mark.asyncio
+async def test_price_change_keeps_one_suggestion(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+):
+    """Test a small price rise keeps the history together at the new price."""
+    user_id = UUID(test_user_id)
+    account = Account(user_id=user_id, name="Bank", type=AccountType.BANK)
+    async_session.add(account)
+    await async_session.flush()
+    today = date.today()
+    # 9.99 and 10.49 fall on either side of a fixed log(1.2) grid boundary
+    async_session.add_all(
+        Transaction(
+            user_id=user_id,
+            account_id=account.id,
+            type=TransactionType.EXPENSE,
+            amount=Decimal("10.49" if months_ago < 2 else "9.99"),
+            date=today - timedelta(days=3 + 30 * months_ago),
+            note="Spotify",
+        )
+        for months_ago in range(6)
+    )
+    await async_session.commit()
+
+    response = await client.post(
+        "/api/v1/recurring-rules/suggestions/refresh", headers=auth_headers
+    )
+    [suggestion] = response.json()["data"]
+    assert suggestion["occurrences"] == 6
+    assert Decimal(str(suggestion["amount"])) == Decimal("10.49")
@@ -0,0 +1,130 @@
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache_backend, set_cache_backend
+from app.core.singleflight import SingleFlight, single_flight
+
+
+class SlowService:
+    """Stand-in for a service whose reads take a while."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @single_flight("tests.slow")
+    async def read(self, user_id: UUID, month: int = 1) -> tuple[UUID, int]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return user_id, month
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test identical concurrent calls run once and share the result."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+
+    # Once finished, the next call runs again
+    await flight.do("key", fetch)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    """Test waiting callers receive the leader's exception."""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_waiter_takes_over_from_cancelled_leader():
+    """Test a cancelled leader does not fail the callers waiting on it."""
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_service_decorator_keys_by_arguments():
+    """Test the decorator coalesces equal arguments across instances only."""
+    first, second = SlowService(), SlowService()
+    user_id = uuid4()
+    results = await asyncio.gather(
+        first.read(user_id),
+        second.read(user_id, month=1),
+        first.read(user_id, 2),
+        first.read(uuid4()),
+    )
+    assert results[0] == results[1] == (user_id, 1)
+    assert results[2] == (user_id, 2)
+    assert first.calls + second.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_query(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+):
+    """Test a burst of identical GETs runs the statistics query once."""
+    previous = get_cache_backend()
+    set_cache_backend(None)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        url = "/api/v1/statistics/summary?startDate=2026-03-01&endDate=2026-03-31"
+        responses = await asyncio.gather(
+            *(client.get(url, headers=auth_headers) for _ in range(4))
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        set_cache_backend(previous)
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.content for response in responses}) == 1
+    assert responses[0].json()["data"]["transaction_count"] == 0
+    assert len(statements) == 1
@@ -0,0 +1,1117 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.money import divide_minor, from_minor, percentage_of, to_minor
+from app.models.account import Account, AccountType
+from app.models.category import Category, CategoryType
+from app.models.daily_rollup import DailyRollup
+from app.models.transaction import Transaction, TransactionType
+from app.models.types import Money, MoneyStorage, date_bucket, sum_minor
+from app.repositories.daily_rollup_repo import DailyRollupRepository
+
+
+@pytest.fixture
+async def setup_data(async_session: AsyncSession, test_user_id: str):
+    """Set up accounts and categories for statistics tests."""
+    account = Account(
+        user_id=UUID(test_user_id),
+        name="Main Account",
+        type=AccountType.CASH,
+        balance=Decimal("1000"),
+    )
+    food = Category(
+        user_id=UUID(test_user_id),
+        name="Food",
+        icon="food",
+        color="#FF5733",
+        type=CategoryType.EXPENSE,
+    )
+    transport = Category(
+        user_id=UUID(test_user_id),
+        name="Transport",
+        icon="car",
+        color="#3357FF",
+        type=CategoryType.EXPENSE,
+    )
+    salary = Category(
+        user_id=UUID(test_user_id),
+        name="Salary",
+        icon="money",
+        color="#33FF57",
+        type=CategoryType.INCOME,
+    )
+    async_session.add_all([account, food, transport, salary])
+    await async_session.commit()
+    for obj in (account, food, transport, salary):
+        await async_session.refresh(obj)
+    return {
+        "account": account,
+        "food": food,
+        "transport": transport,
+        "salary": salary,
+    }
+
+
+async def create_transaction(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    **payload,
+) -> dict:
+    """Create a transaction through the API and return its data."""
+    payload.setdefault("date", str(date(2026, 3, 15)))
+    response = await client.post(
+        "/api/v1/transactions", headers=auth_headers, json=payload
+    )
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.fixture
+async def march_transactions(
+    client: AsyncClient, auth_headers: dict[str, str], setup_data
+):
+    """Create a month of income and expenses."""
+    data = setup_data
+    account_id = str(data["account"].id)
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="3000.00",
+        type="income",
+        category_id=str(data["salary"].id),
+        account_id=account_id,
+    )
+    for amount in ("10.10", "20.20"):
+        await create_transaction(
+            client,
+            auth_headers,
+            amount=amount,
+            type="expense",
+            category_id=str(data["food"].id),
+            account_id=account_id,
+        )
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="0.03",
+        type="expense",
+        category_id=str(data["transport"].id),
+        account_id=account_id,
+    )
+    return data
+
+
+def test_minor_unit_conversion():
+    """Test conversion between decimal amounts and minor units."""
+    assert to_minor(Decimal("19.99")) == 1999
+    assert to_minor("0.005") == 1
+    assert to_minor(Decimal("-12.34")) == -1234
+    assert from_minor(1999) == Decimal("19.99")
+    assert from_minor(-5) == Decimal("-0.05")
+
+
+def test_percentage_of_uses_integer_rounding():
+    """Test percentages are computed on integers and rounded half up."""
+    assert percentage_of(1, 3) == Decimal("33.33")
+    assert percentage_of(2, 3) == Decimal("66.67")
+    assert percentage_of(5, 5) == Decimal("100.00")
+    assert percentage_of(5, 0) == Decimal("0.00")
+
+
+def test_divide_minor_rounds_half_away_from_zero():
+    """Test averages of minor units round symmetrically."""
+    assert divide_minor(1000, 7) == 143
+    assert divide_minor(5, 2) == 3
+    assert divide_minor(-5, 2) == -3
+    assert divide_minor(4, 8) == 1
+    assert divide_minor(3, 8) == 0
+
+
+def test_money_type_minor_unit_storage():
+    """Test the Money column type converts to and from minor units."""
+    money = Money(MoneyStorage.MINOR_UNITS)
+    assert money.process_bind_param(Decimal("15.50"), None) == 1550
+    assert money.process_result_value(1550, None) == Decimal("15.50")
+
+    numeric = Money(MoneyStorage.NUMERIC)
+    assert numeric.process_bind_param(Decimal("15.50"), None) == Decimal("15.50")
+
+
+def test_filtered_sum_compiles_per_dialect():
+    """Test filtered sums use FILTER on Postgres and CASE elsewhere."""
+    expr = sum_minor(Transaction.amount, Transaction.type == TransactionType.INCOME)
+    postgres = str(expr.compile(dialect=postgresql.dialect()))
+    assert "FILTER (WHERE transactions.type = " in postgres
+    fallback = str(expr.compile(dialect=sqlite.dialect()))
+    assert "SUM(CASE WHEN transactions.type = ? THEN " in fallback
+    assert "FILTER" not in fallback
+
+
+def test_date_bucket_compiles_per_dialect():
+    """Test date buckets use date_trunc on Postgres and date() elsewhere."""
+    expr = date_bucket("week", Transaction.date)
+    assert str(expr.compile(dialect=postgresql.dialect())) == (
+        "CAST(date_trunc('week', transactions.date) AS DATE)"
+    )
+    assert str(expr.compile(dialect=sqlite.dialect())) == (
+        "date(transactions.date, 'weekday 0', '-6 days')"
+    )
+    with pytest.raises(ValueError):
+        date_bucket("quarter", Transaction.date)
+
+
+@pytest.mark.asyncio
+async def test_monthly_summary(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test the income/expense summary for a date range."""
+    response = await client.get(
+        "/api/v1/statistics/summary?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert Decimal(result["total_income"]) == Decimal("3000.00")
+    assert Decimal(result["total_expense"]) == Decimal("30.33")
+    assert Decimal(result["balance"]) == Decimal("2969.67")
+    assert result["transaction_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_monthly_summary_empty_range(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test the summary outside of any transactions returns zeros."""
+    response = await client.get(
+        "/api/v1/statistics/summary?startDate=2025-01-01&endDate=2025-01-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert Decimal(result["total_income"]) == Decimal("0")
+    assert Decimal(result["total_expense"]) == Decimal("0")
+    assert result["transaction_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_category_breakdown(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test the expense breakdown by category."""
+    response = await client.get(
+        "/api/v1/statistics/category-breakdown?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert Decimal(result["total"]) == Decimal("30.33")
+
+    food, transport = result["categories"]
+    assert food["category_name"] == "Food"
+    assert Decimal(food["amount"]) == Decimal("30.30")
+    assert Decimal(food["percentage"]) == Decimal("99.90")
+    assert food["transaction_count"] == 2
+    assert transport["category_name"] == "Transport"
+    assert Decimal(transport["percentage"]) == Decimal("0.10")
+
+
+@pytest.mark.asyncio
+async def test_monthly_timeseries_fills_gaps(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test monthly buckets, including empty months, come from one query."""
+    data = march_transactions
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="5.00",
+        type="expense",
+        category_id=str(data["food"].id),
+        account_id=str(data["account"].id),
+        date="2026-05-31",
+    )
+    response = await client.get(
+        "/api/v1/statistics/timeseries?startDate=2026-02-10&endDate=2026-05-31"
+        "&bucket=month",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["bucket"] == "month"
+    points = result["points"]
+    assert [p["period_start"] for p in points] == [
+        "2026-02-01",
+        "2026-03-01",
+        "2026-04-01",
+        "2026-05-01",
+    ]
+    assert [Decimal(p["total_expense"]) for p in points] == [
+        Decimal("0"),
+        Decimal("30.33"),
+        Decimal("0"),
+        Decimal("5.00"),
+    ]
+    assert Decimal(points[1]["total_income"]) == Decimal("3000.00")
+    assert Decimal(points[1]["balance"]) == Decimal("2969.67")
+    assert [p["transaction_count"] for p in points] == [0, 4, 0, 1]
+
+
+@pytest.mark.asyncio
+async def test_weekly_timeseries_with_category_filter(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test weeks start on Monday and filters narrow the series."""
+    data = march_transactions
+    response = await client.get(
+        "/api/v1/statistics/timeseries?startDate=2026-03-08&endDate=2026-03-20"
+        f"&bucket=week&categoryId={data['food'].id}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    points = response.json()["data"]["points"]
+    # 2026-03-15 is a Sunday, so it falls into the week of Monday 03-09
+    assert [p["period_start"] for p in points] == [
+        "2026-03-02",
+        "2026-03-09",
+        "2026-03-16",
+    ]
+    assert [Decimal(p["total_expense"]) for p in points] == [
+        Decimal("0"),
+        Decimal("30.30"),
+        Decimal("0"),
+    ]
+    assert Decimal(points[1]["total_income"]) == Decimal("0")
+
+
+@pytest.mark.asyncio
+async def test_timeseries_rejects_inverted_range(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+):
+    """Test a start date after the end date is rejected."""
+    response = await client.get(
+        "/api/v1/statistics/timeseries?startDate=2026-03-31&endDate=2026-03-01",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+async def rollup_totals(session: AsyncSession, user_id: UUID) -> dict:
+    """Rollup (minor amount, count) per key, ignoring emptied rows."""
+    key = (
+        DailyRollup.date,
+        DailyRollup.type,
+        DailyRollup.category_id,
+        DailyRollup.account_id,
+    )
+    count = func.sum(DailyRollup.transaction_count)
+    result = await session.execute(
+        select(*key, sum_minor(DailyRollup.amount), count)
+        .where(DailyRollup.user_id == user_id)
+        .group_by(*key)
+        .having(count != 0)
+    )
+    return {tuple(row[:4]): tuple(row[4:]) for row in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_updates_and_deletes(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    march_transactions,
+):
+    """Test rollups track every write and match a full rebuild."""
+    data = march_transactions
+    account_id = str(data["account"].id)
+    moved = await create_transaction(
+        client,
+        auth_headers,
+        amount="50.00",
+        type="expense",
+        category_id=str(data["food"].id),
+        account_id=account_id,
+    )
+    response = await client.put(
+        f"/api/v1/transactions/{moved['id']}",
+        headers=auth_headers,
+        json={
+            "amount": "40.00",
+            "category_id": str(data["transport"].id),
+            "date": "2026-04-02",
+        },
+    )
+    assert response.status_code == 200
+    removed = await create_transaction(
+        client,
+        auth_headers,
+        amount="7.00",
+        type="expense",
+        category_id=str(data["food"].id),
+        account_id=account_id,
+    )
+    response = await client.delete(
+        f"/api/v1/transactions/{removed['id']}", headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        "/api/v1/statistics/summary?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    march = response.json()["data"]
+    assert Decimal(march["total_expense"]) == Decimal("30.33")
+    assert march["transaction_count"] == 4
+
+    response = await client.get(
+        "/api/v1/statistics/category-breakdown?startDate=2026-04-01&endDate=2026-04-30",
+        headers=auth_headers,
+    )
+    (transport,) = response.json()["data"]["categories"]
+    assert transport["category_name"] == "Transport"
+    assert Decimal(transport["amount"]) == Decimal("40.00")
+    assert transport["transaction_count"] == 1
+
+    user_id = UUID(test_user_id)
+    incremental = await rollup_totals(async_session, user_id)
+    await DailyRollupRepository(async_session).rebuild(user_id)
+    assert await rollup_totals(async_session, user_id) == incremental
+    assert len(incremental) == 4
+
+
+@pytest.mark.asyncio
+async def test_rollups_keep_one_row_per_uncategorized_key(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test writes without a category update their rollup row in place."""
+    account_id = str(setup_data["account"].id)
+    kept = await create_transaction(
+        client, auth_headers, amount="12.00", type="expense", account_id=account_id
+    )
+    removed = await create_transaction(
+        client, auth_headers, amount="8.00", type="expense", account_id=account_id
+    )
+    response = await client.put(
+        f"/api/v1/transactions/{kept['id']}",
+        headers=auth_headers,
+        json={"amount": "15.00"},
+    )
+    assert response.status_code == 200
+    response = await client.delete(
+        f"/api/v1/transactions/{removed['id']}", headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    result = await async_session.execute(
+        select(DailyRollup).where(DailyRollup.user_id == UUID(test_user_id))
+    )
+    (rollup,) = result.scalars().all()
+    assert rollup.category_id is None
+    assert rollup.amount == Decimal("15.00")
+    assert rollup.transaction_count == 1
+
+
+@pytest.mark.asyncio
+async def test_timeseries_tag_filter_reads_transactions(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test tag filters, which rollups cannot answer, still work."""
+    data = march_transactions
+    response = await client.post(
+        "/api/v1/tags", headers=auth_headers, json={"name": "Trip"}
+    )
+    tag_id = response.json()["data"]["id"]
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="12.00",
+        type="expense",
+        category_id=str(data["transport"].id),
+        account_id=str(data["account"].id),
+        tag_ids=[tag_id],
+    )
+    response = await client.get(
+        "/api/v1/statistics/timeseries?startDate=2026-03-01&endDate=2026-03-31"
+        f"&tagId={tag_id}",
+        headers=auth_headers,
+    )
+    (point,) = response.json()["data"]["points"]
+    assert Decimal(point["total_expense"]) == Decimal("12.00")
+    assert point["transaction_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_compare_periods(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test the current month against earlier months and a year ago."""
+    data = march_transactions
+    for day, amount in (("2026-02-27", "7.00"), ("2025-03-02", "4.50")):
+        await create_transaction(
+            client,
+            auth_headers,
+            amount=amount,
+            type="expense",
+            category_id=str(data["transport"].id),
+            account_id=str(data["account"].id),
+            date=day,
+        )
+    response = await client.get(
+        "/api/v1/statistics/compare?date=2026-03-20&periods=12",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["bucket"] == "month"
+
+    current = result["current"]
+    assert (current["period_start"], current["period_end"]) == (
+        "2026-03-01",
+        "2026-03-31",
+    )
+    assert Decimal(current["total_income"]) == Decimal("3000.00")
+    assert Decimal(current["total_expense"]) == Decimal("30.33")
+    assert current["transaction_count"] == 4
+    assert [c["category_name"] for c in current["categories"]] == [
+        "Food",
+        "Transport",
+    ]
+    assert Decimal(current["categories"][0]["percentage"]) == Decimal("99.90")
+
+    previous = result["previous"]
+    assert len(previous) == 12
+    assert previous[0]["period_start"] == "2026-02-01"
+    assert previous[0]["period_end"] == "2026-02-28"
+    assert Decimal(previous[0]["total_expense"]) == Decimal("7.00")
+    assert Decimal(previous[1]["total_expense"]) == Decimal("0")
+
+    # Twelve months back is the same period as a year ago
+    year_ago = result["year_over_year"]
+    assert year_ago == previous[11]
+    assert year_ago["period_start"] == "2025-03-01"
+    assert Decimal(year_ago["total_expense"]) == Decimal("4.50")
+    assert year_ago["categories"][0]["category_name"] == "Transport"
+
+
+@pytest.mark.asyncio
+async def test_compare_weeks_by_income(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test weekly comparison keeps Mondays and lists income categories."""
+    response = await client.get(
+        "/api/v1/statistics/compare?date=2026-03-15&bucket=week&periods=0&type=income",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["previous"] == []
+    assert result["current"]["period_start"] == "2026-03-09"
+    assert result["current"]["period_end"] == "2026-03-15"
+    assert [c["category_name"] for c in result["current"]["categories"]] == ["Salary"]
+    assert result["year_over_year"]["period_start"] == "2025-03-10"
+
+    response = await client.get(
+        "/api/v1/statistics/compare?periods=25", headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_category_matrix(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test category × month totals come back as dense aligned rows."""
+    data = march_transactions
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="40.00",
+        type="expense",
+        category_id=str(data["transport"].id),
+        account_id=str(data["account"].id),
+        date="2026-05-03",
+    )
+    response = await client.get(
+        "/api/v1/statistics/category-matrix?startDate=2026-02-15&endDate=2026-05-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["periods"] == [
+        "2026-02-01",
+        "2026-03-01",
+        "2026-04-01",
+        "2026-05-01",
+    ]
+    assert [c["category_name"] for c in result["categories"]] == [
+        "Transport",
+        "Food",
+    ]
+    assert result["categories"][1]["category_color"] == "#FF5733"
+    assert [[Decimal(a) for a in row] for row in result["amounts"]] == [
+        [Decimal("0"), Decimal("0.03"), Decimal("0"), Decimal("40.00")],
+        [Decimal("0"), Decimal("30.30"), Decimal("0"), Decimal("0")],
+    ]
+    assert result["counts"] == [[0, 1, 0, 1], [0, 2, 0, 0]]
+    assert [Decimal(t) for t in result["category_totals"]] == [
+        Decimal("40.03"),
+        Decimal("30.30"),
+    ]
+    assert [Decimal(t) for t in result["period_totals"]] == [
+        Decimal("0"),
+        Decimal("30.33"),
+        Decimal("0"),
+        Decimal("40.00"),
+    ]
+
+    response = await client.get(
+        "/api/v1/statistics/category-matrix?startDate=2016-05-01&endDate=2026-05-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Range spans more than 120 months"
+
+
+@pytest.mark.asyncio
+async def test_tag_breakdown(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test per-tag sums, counts and shares of the type's total."""
+    data = march_transactions
+    tag_ids = {}
+    for name in ("Trip", "Work"):
+        response = await client.post(
+            "/api/v1/tags", headers=auth_headers, json={"name": name}
+        )
+        tag_ids[name] = response.json()["data"]["id"]
+    for amount, tags in (("19.67", ["Trip", "Work"]), ("50.00", ["Trip"])):
+        await create_transaction(
+            client,
+            auth_headers,
+            amount=amount,
+            type="expense",
+            category_id=str(data["food"].id),
+            account_id=str(data["account"].id),
+            tag_ids=[tag_ids[name] for name in tags],
+        )
+    # Outside the range and of another type: both ignored
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="99.00",
+        type="expense",
+        account_id=str(data["account"].id),
+        date="2026-04-01",
+        tag_ids=[tag_ids["Work"]],
+    )
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="1.00",
+        type="income",
+        account_id=str(data["account"].id),
+        tag_ids=[tag_ids["Work"]],
+    )
+
+    response = await client.get(
+        "/api/v1/statistics/tag-breakdown?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert Decimal(result["total"]) == Decimal("100.00")
+    trip, work = result["tags"]
+    assert trip["tag_name"] == "Trip"
+    assert Decimal(trip["amount"]) == Decimal("69.67")
+    assert Decimal(trip["percentage"]) == Decimal("69.67")
+    assert trip["transaction_count"] == 2
+    assert work["tag_name"] == "Work"
+    assert Decimal(work["amount"]) == Decimal("19.67")
+    assert work["transaction_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_account_flows_include_both_transfer_legs(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    march_transactions,
+):
+    """Test transfers count out of the source and into the target account."""
+    data = march_transactions
+    savings = Account(user_id=UUID(test_user_id), name="Savings", order=1)
+    archived = Account(user_id=UUID(test_user_id), name="Old", is_archived=True)
+    async_session.add_all([savings, archived])
+    await async_session.commit()
+    await async_session.refresh(savings)
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="500.00",
+        type="transfer",
+        account_id=str(data["account"].id),
+        to_account_id=str(savings.id),
+    )
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="25.00",
+        type="expense",
+        account_id=str(savings.id),
+    )
+    # Outside the range
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="80.00",
+        type="transfer",
+        account_id=str(savings.id),
+        to_account_id=str(data["account"].id),
+        date="2026-04-02",
+    )
+
+    response = await client.get(
+        "/api/v1/statistics/accounts?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    main, saving = response.json()["data"]["accounts"]
+    assert (main["account_name"], saving["account_name"]) == ("Main Account", "Savings")
+
+    def flows(account: dict) -> list[Decimal]:
+        keys = ("inflow", "outflow", "transfers_in", "transfers_out", "net_change")
+        return [Decimal(account[key]) for key in keys]
+
+    assert flows(main) == [
+        Decimal("3000.00"),
+        Decimal("30.33"),
+        Decimal("0"),
+        Decimal("500.00"),
+        Decimal("2469.67"),
+    ]
+    assert main["transaction_count"] == 5
+    assert flows(saving) == [
+        Decimal("0"),
+        Decimal("25.00"),
+        Decimal("500.00"),
+        Decimal("0"),
+        Decimal("475.00"),
+    ]
+    assert saving["transaction_count"] == 2
+
+    response = await client.get(
+        "/api/v1/statistics/accounts?startDate=2026-03-01&endDate=2026-03-31"
+        "&includeArchived=true",
+        headers=auth_headers,
+    )
+    accounts = {a["account_name"]: a for a in response.json()["data"]["accounts"]}
+    assert flows(accounts["Old"]) == [Decimal("0")] * 5
+    assert accounts["Old"]["transaction_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_calendar(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test a year of daily totals as arrays indexed by day of year."""
+    response = await client.get(
+        "/api/v1/statistics/calendar?year=2026", headers=auth_headers
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["year"] == 2026
+    assert len(result["income"]) == len(result["expense"]) == 365
+    day = (date(2026, 3, 15) - date(2026, 1, 1)).days
+    assert Decimal(result["income"][day]) == Decimal("3000.00")
+    assert Decimal(result["expense"][day]) == Decimal("30.33")
+    assert result["counts"][day] == 4
+    assert sum(result["counts"]) == 4
+
+    response = await client.get(
+        "/api/v1/statistics/calendar?year=2028", headers=auth_headers
+    )
+    assert len(response.json()["data"]["counts"]) == 366
+
+
+@pytest.mark.asyncio
+async def test_rolling_windows(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test trailing sums look back before the range and fill gaps."""
+    data = march_transactions
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="10.00",
+        type="expense",
+        category_id=str(data["food"].id),
+        account_id=str(data["account"].id),
+        date="2026-03-10",
+    )
+    response = await client.get(
+        "/api/v1/statistics/rolling?startDate=2026-03-14&endDate=2026-03-17"
+        "&window=7&window=3",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    three, seven = result["series"]
+    assert (three["window"], seven["window"]) == (3, 7)
+    assert [Decimal(v) for v in three["expense_sum"]] == [
+        Decimal("0"),
+        Decimal("30.33"),
+        Decimal("30.33"),
+        Decimal("30.33"),
+    ]
+    assert [Decimal(v) for v in seven["expense_sum"]] == [
+        Decimal("10.00"),
+        Decimal("40.33"),
+        Decimal("40.33"),
+        Decimal("30.33"),
+    ]
+    assert Decimal(seven["expense_average"][0]) == Decimal("1.43")
+    assert Decimal(seven["expense_average"][1]) == Decimal("5.76")
+    assert Decimal(seven["income_sum"][1]) == Decimal("3000.00")
+    assert Decimal(seven["income_average"][1]) == Decimal("428.57")
+
+    response = await client.get(
+        "/api/v1/statistics/rolling?startDate=2026-03-15&endDate=2026-03-15"
+        f"&categoryId={data['food'].id}",
+        headers=auth_headers,
+    )
+    windows = response.json()["data"]["series"]
+    assert [w["window"] for w in windows] == [7, 30, 90]
+    assert [Decimal(w["expense_sum"][0]) for w in windows] == [Decimal("40.30")] * 3
+
+    response = await client.get(
+        "/api/v1/statistics/rolling?startDate=2026-03-15&endDate=2026-03-15&window=400",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_group_distributions_match_percentile_cont():
+    """Test percentiles interpolate linearly and empty groups stay zero."""
+    np = pytest.importorskip("numpy")
+    from app.core.distribution import group_distributions
+
+    rng = np.random.default_rng(7)
+    amounts = rng.integers(1, 100000, size=500)
+    groups = rng.integers(0, 3, size=500) * 2  # labels 0, 2 and 4 only
+    result = group_distributions(groups, amounts, 5, (0.5, 0.9, 0.99), bins=8)
+
+    for label in (0, 2, 4):
+        values = amounts[groups == label]
+        assert result.count[label] == len(values)
+        assert (result.low[label], result.high[label]) == (values.min(), values.max())
+        np.testing.assert_allclose(
+            result.percentiles[label], np.percentile(values, [50, 90, 99])
+        )
+        assert result.histogram[label].sum() == len(values)
+    assert result.count[1] == 0
+    assert result.percentiles[1].tolist() == [0, 0, 0]
+    assert result.histogram[3].tolist() == [0] * 8
+
+
+@pytest.mark.asyncio
+async def test_amount_distribution(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    march_transactions,
+):
+    """Test percentiles and histogram of expenses, overall and per category."""
+    pytest.importorskip("numpy")
+    data = march_transactions
+    for amount in ("1.00", "5.00"):
+        await create_transaction(
+            client,
+            auth_headers,
+            amount=amount,
+            type="expense",
+            category_id=str(data["food"].id),
+            account_id=str(data["account"].id),
+        )
+    response = await client.get(
+        "/api/v1/statistics/distribution?startDate=2026-03-01&endDate=2026-03-31"
+        "&bins=4",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    (overall,) = response.json()["data"]["groups"]
+    assert overall["category_id"] is None
+    assert overall["count"] == 5
+    assert Decimal(overall["min"]) == Decimal("0.03")
+    assert Decimal(overall["max"]) == Decimal("20.20")
+    assert Decimal(overall["median"]) == Decimal("5.00")
+    assert Decimal(overall["p90"]) == Decimal("16.16")
+    assert Decimal(overall["p99"]) == Decimal("19.80")
+    assert [bucket["count"] for bucket in overall["histogram"]] == [3, 1, 0, 1]
+    assert [Decimal(bucket["lower"]) for bucket in overall["histogram"]] == [
+        Decimal("0.03"),
+        Decimal("5.07"),
+        Decimal("10.12"),
+        Decimal("15.16"),
+    ]
+    assert Decimal(overall["histogram"][-1]["upper"]) == Decimal("20.20")
+
+    response = await client.get(
+        "/api/v1/statistics/distribution?startDate=2026-03-01&endDate=2026-03-31"
+        "&byCategory=true",
+        headers=auth_headers,
+    )
+    food, transport = response.json()["data"]["groups"]
+    assert (food["category_name"], food["count"]) == ("Food", 4)
+    assert Decimal(food["median"]) == Decimal("7.55")
+    assert transport["category_name"] == "Transport"
+    assert Decimal(transport["p99"]) == Decimal("0.03")
+    assert transport["histogram"][0]["count"] == 1
+    assert sum(bucket["count"] for bucket in transport["histogram"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_flows(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    march_transactions,
+):
+    """Test Sankey nodes and links, including transfers between accounts."""
+    data = march_transactions
+    savings = Account(user_id=UUID(test_user_id), name="Savings")
+    async_session.add(savings)
+    await async_session.commit()
+    await async_session.refresh(savings)
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="500.00",
+        type="transfer",
+        account_id=str(data["account"].id),
+        to_account_id=str(savings.id),
+    )
+    await create_transaction(
+        client,
+        auth_headers,
+        amount="25.00",
+        type="expense",
+        account_id=str(savings.id),
+    )
+
+    response = await client.get(
+        "/api/v1/statistics/flows?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert [(n["type"], n["name"]) for n in result["nodes"]] == [
+        ("income_category", "Salary"),
+        ("account", "Main Account"),
+        ("account", "Savings"),
+        ("expense_category", "Food"),
+        ("expense_category", None),
+        ("expense_category", "Transport"),
+    ]
+    assert result["nodes"][4]["id"] is None
+    links = {
+        (link["source"], link["target"]): (
+            Decimal(link["amount"]),
+            link["transaction_count"],
+        )
+        for link in result["links"]
+    }
+    assert links == {
+        (0, 1): (Decimal("3000.00"), 1),
+        (1, 2): (Decimal("500.00"), 1),
+        (1, 3): (Decimal("30.30"), 2),
+        (1, 5): (Decimal("0.03"), 1),
+        (2, 4): (Decimal("25.00"), 1),
+    }
+
+
+@pytest.mark.asyncio
+async def test_flows_net_out_transfer_cycles(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test circular transfers are netted and linkless accounts left out."""
+    user_id = UUID(test_user_id)
+    main = setup_data["account"]
+    savings = Account(user_id=user_id, name="Savings")
+    wallet = Account(user_id=user_id, name="Wallet")
+    idle = Account(user_id=user_id, name="Idle")
+    async_session.add_all([savings, wallet, idle])
+    # A transfer onto its own account moves no money
+    async_session.add(
+        Transaction(
+            user_id=user_id,
+            account_id=idle.id,
+            to_account_id=idle.id,
+            type=TransactionType.TRANSFER,
+            amount=Decimal("5.00"),
+            date=date(2026, 3, 15),
+        )
+    )
+    await async_session.commit()
+    for source, target, amount in (
+        (main, savings, "500.00"),
+        (savings, main, "80.00"),
+        (savings, wallet, "30.00"),
+        (wallet, main, "10.00"),
+    ):
+        await create_transaction(
+            client,
+            auth_headers,
+            amount=amount,
+            type="transfer",
+            account_id=str(source.id),
+            to_account_id=str(target.id),
+        )
+
+    response = await client.get(
+        "/api/v1/statistics/flows?startDate=2026-03-01&endDate=2026-03-31",
+        headers=auth_headers,
+    )
+    result = response.json()["data"]
+    assert [n["name"] for n in result["nodes"]] == ["Savings", "Main Account", "Wallet"]
+    links = {
+        (link["source"], link["target"]): Decimal(link["amount"])
+        for link in result["links"]
+    }
+    # main -> savings -> wallet -> main carries 10, savings -> main 80 more
+    assert links == {(1, 0): Decimal("410.00"), (0, 2): Decimal("20.00")}
+
+
+def test_fit_baseline_recovers_weekly_pattern():
+    """Test weekday effects are fitted once a series has enough history."""
+    np = pytest.importorskip("numpy")
+    from app.core.forecast import fit_baseline
+
+    first_day = int(np.datetime64("2026-01-05", "D").astype(np.int64))  # Monday
+    weekday = np.arange(70) % 7
+    weekly = np.where(weekday == 5, -5000.0, -1000.0)  # big Saturday shop
+    history = np.column_stack([weekly, np.full(70, -300.0), np.zeros(70)])
+    starts = np.array([0, 60, 70])  # 70 days, 10 days, never observed
+
+    baseline = fit_baseline(history, first_day, starts, horizon=7)
+    np.testing.assert_allclose(baseline[:, 0], weekly[:7], atol=1e-6)
+    np.testing.assert_allclose(baseline[:, 1], -300.0, atol=1e-6)
+    assert baseline[:, 2].tolist() == [0.0] * 7
+
+
+@pytest.mark.asyncio
+async def test_forecast_combines_rules_and_baseline(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test recurring occurrences are projected once on top of the baseline."""
+    pytest.importorskip("numpy")
+    from app.services.recurring_rule_service import RecurringRuleService
+
+    data = setup_data
+    user_id = UUID(test_user_id)
+    account = data["account"]
+    today = date.today()
+    archived = Account(user_id=user_id, name="Old", is_archived=True)
+    async_session.add(archived)
+    async_session.add_all(
+        Transaction(
+            user_id=user_id,
+            account_id=account.id,
+            category_id=data["food"].id,
+            type=TransactionType.EXPENSE,
+            amount=Decimal("10"),
+            date=today - timedelta(days=days_ago),
+        )
+        for days_ago in range(60)
+    )
+    await async_session.commit()
+
+    # A weekly gym fee with past occurrences in the history, and rent
+    # starting tomorrow
+    for amount, frequency, start_date in (
+        (20, "weekly", today - timedelta(weeks=8)),
+        (500, "monthly", today + timedelta(days=1)),
+    ):
+        response = await client.post(
+            "/api/v1/recurring-rules",
+            headers=auth_headers,
+            json={
+                "amount": amount,
+                "type": "expense",
+                "account_id": str(account.id),
+                "frequency": frequency,
+                "start_date": str(start_date),
+            },
+        )
+        assert response.status_code == 200
+    await RecurringRuleService(async_session).materialize_due(today, limit=10)
+    await async_session.commit()
+    await async_session.refresh(account)
+    opening = account.balance
+
+    response = await client.get(
+        "/api/v1/statistics/forecast?days=8", headers=auth_headers
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["start_date"] == str(today + timedelta(days=1))
+    assert result["days"] == 8
+    assert [a["account_name"] for a in result["accounts"]] == ["Main Account"]
+
+    # 10.00 a day of baseline, rent on day 1 and the gym fee on day 7
+    expected = []
+    balance = opening
+    for day in range(1, 9):
+        balance -= Decimal("10") + (500 if day == 1 else 0) + (20 if day == 7 else 0)
+        expected.append(balance)
+    assert [Decimal(b) for b in result["accounts"][0]["balances"]] == expected
+    assert [Decimal(b) for b in result["total"]] == expected
+
+    response = await client.get(
+        "/api/v1/statistics/forecast?days=366", headers=auth_headers
+    )
+    assert response.status_code == 422
@@ -0,0 +1,115 @@
+import io
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.account import Account, AccountType
+from app.models.category import Category, CategoryType
+from app.models.transaction import Transaction, TransactionType
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+async def setup_data(async_session: AsyncSession, test_user_id: str):
+    """Create five transactions across two accounts and a category."""
+    user_id = UUID(test_user_id)
+    account = Account(user_id=user_id, name="Cash", type=AccountType.CASH)
+    savings = Account(user_id=user_id, name="Savings", type=AccountType.BANK)
+    category = Category(
+        user_id=user_id,
+        name="Food",
+        icon="food",
+        color="#FF5733",
+        type=CategoryType.EXPENSE,
+    )
+    async_session.add_all([account, savings, category])
+    await async_session.flush()
+    for day in range(1, 5):
+        async_session.add(
+            Transaction(
+                user_id=user_id,
+                amount=Decimal("12.34") * day,
+                type=TransactionType.EXPENSE,
+                category_id=category.id,
+                account_id=account.id,
+                date=date(2026, 4, day),
+                note=f"Meal {day}",
+                tag_ids=[category.id] if day == 1 else [],
+            )
+        )
+    async_session.add(
+        Transaction(
+            user_id=user_id,
+            amount=Decimal("100"),
+            type=TransactionType.TRANSFER,
+            account_id=account.id,
+            to_account_id=savings.id,
+            date=date(2026, 4, 5),
+        )
+    )
+    await async_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_parquet(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test the Parquet export has one row group per record batch."""
+    monkeypatch.setattr(get_settings(), "export_batch_size", 2)
+    response = await client.get(
+        "/api/v1/transactions/export?format=parquet", headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.num_rows == 5
+    assert table.column("amount").to_pylist()[:2] == [
+        Decimal("12.34"),
+        Decimal("24.68"),
+    ]
+    assert table.column("category_name").to_pylist()[0] == "Food"
+    assert table.column("to_account_name").to_pylist()[-1] == "Savings"
+    assert table.column("type").to_pylist()[-1] == "transfer"
+    assert len(table.column("tag_ids").to_pylist()[0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_arrow_stream(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test the Arrow IPC export honours the date range."""
+    response = await client.get(
+        "/api/v1/transactions/export?format=arrow&startDate=2026-04-02&endDate=2026-04-03",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("date").to_pylist() == [date(2026, 4, 2), date(2026, 4, 3)]
+    assert table.column("note").to_pylist() == ["Meal 2", "Meal 3"]
+
+
+@pytest.mark.asyncio
+async def test_export_empty(client: AsyncClient, auth_headers: dict[str, str]):
+    """Test an export with no transactions is a valid empty stream."""
+    response = await client.get(
+        "/api/v1/transactions/export?format=arrow", headers=auth_headers
+    )
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 0
+    assert "account_name" in table.schema.names
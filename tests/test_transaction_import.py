@@ -0,0 +1,268 @@
+import csv
+import json
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.statement_parsers import (
+    MAX_RECORD_LINES,
+    iter_csv_records,
+    iter_lines,
+    iter_ofx_transactions,
+)
+from app.models.account import Account, AccountType
+from app.models.transaction_import import TransactionImportRow
+from app.repositories.posting_repo import PostingRepository
+
+CSV_STATEMENT = """Date,Description,Amount
+2026-01-02,"Coffee, large",-4.50
+2026-01-03,Salary,"3,000.00"
+2026-01-04,Broken row,abc
+2026-01-05,"Multi
+line note",-10.00
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260110120000[+8:CST]
+<TRNAMT>-25.30
+<FITID>1
+<NAME>Grocery Store
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260111
+<TRNAMT>100.00
+<FITID>2
+<NAME>Refund
+<MEMO>Order 42
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+@pytest.fixture
+async def account(async_session: AsyncSession, test_user_id: str) -> Account:
+    """Create the account statements are imported into."""
+    account = Account(
+        user_id=UUID(test_user_id),
+        name="Checking",
+        type=AccountType.BANK,
+        balance=Decimal("100"),
+    )
+    async_session.add(account)
+    await async_session.commit()
+    await async_session.refresh(account)
+    return account
+
+
+async def _chunks(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_across_chunk_boundaries():
+    """Test CSV parsing is independent of how the input is chunked."""
+    for size in (1, 3, 7, 1024):
+        records = [
+            r async for r in iter_csv_records(iter_lines(_chunks(CSV_STATEMENT, size)))
+        ]
+        assert len(records) == 5
+        assert records[1] == ["2026-01-02", "Coffee, large", "-4.50"]
+        assert records[4][1] == "Multi\nline note"
+
+
+@pytest.mark.asyncio
+async def test_csv_record_with_stray_quote_is_bounded():
+    """Test an unterminated quote fails fast instead of joining the file."""
+    lines = ['2026-01-02,"Coffee,-4.50\n'] + ["2026-01-03,Tea,-3.00\n"] * 8000
+    records = iter_csv_records(iter_lines(_chunks("".join(lines), 1024)))
+    with pytest.raises(csv.Error):
+        [r async for r in records]
+
+    # A quoted field may still span lines up to the limit
+    note = "\n" * (MAX_RECORD_LINES - 1)
+    records = iter_csv_records(iter_lines(_chunks(f'a,"{note}",b\n', 7)))
+    assert [r async for r in records] == [["a", note, "b"]]
+
+
+@pytest.mark.asyncio
+async def test_ofx_transactions_across_chunk_boundaries():
+    """Test OFX parsing is independent of how the input is chunked."""
+    for size in (5, 64, 4096):
+        entries = [e async for e in iter_ofx_transactions(_chunks(OFX_STATEMENT, size))]
+        assert [e["TRNAMT"] for e in entries] == ["-25.30", "100.00"]
+        assert entries[1]["MEMO"] == "Order 42"
+
+
+@pytest.mark.asyncio
+async def test_import_csv_statement(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    account: Account,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test a CSV import creates transactions, postings, rollups and balances."""
+    monkeypatch.setattr(get_settings(), "import_batch_size", 2)
+    mapping = {
+        "date": "Date",
+        "amount": "Amount",
+        "note": "Description",
+        "thousands_separator": ",",
+    }
+    response = await client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        data={"accountId": str(account.id), "mapping": json.dumps(mapping)},
+        files={"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert result["imported"] == 3
+    assert result["failed"] == 1
+    assert result["errors"] == [{"row": 4, "message": "Invalid amount 'abc'"}]
+
+    await async_session.refresh(account)
+    assert account.balance == Decimal("3085.50")
+
+    response = await client.get(
+        f"/api/v1/transactions?accountId={account.id}", headers=auth_headers
+    )
+    transactions = response.json()["data"]
+    assert [t["type"] for t in transactions] == ["expense", "income", "expense"]
+    assert transactions[0]["note"] == "Multi\nline note"
+
+    changes = await PostingRepository(async_session).get_balance_changes(
+        UUID(test_user_id)
+    )
+    assert changes == {account.id: Decimal("2985.50")}
+
+    response = await client.get(
+        "/api/v1/statistics/summary?startDate=2026-01-01&endDate=2026-01-31",
+        headers=auth_headers,
+    )
+    summary = response.json()["data"]
+    assert Decimal(summary["total_income"]) == Decimal("3000.00")
+    assert Decimal(summary["total_expense"]) == Decimal("14.50")
+    assert summary["transaction_count"] == 3
+
+    staged = await async_session.execute(
+        select(func.count()).select_from(TransactionImportRow)
+    )
+    assert staged.scalar_one() == 0
+
+
+@pytest.mark.asyncio
+async def test_import_ofx_statement(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    account: Account,
+):
+    """Test an OFX import detected from the file name."""
+    response = await client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        data={"accountId": str(account.id)},
+        files={"file": ("statement.ofx", OFX_STATEMENT.encode(), "text/plain")},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["imported"] == 2
+
+    await async_session.refresh(account)
+    assert account.balance == Decimal("174.70")
+
+    response = await client.get("/api/v1/transactions", headers=auth_headers)
+    notes = {t["note"] for t in response.json()["data"]}
+    assert notes == {"Grocery Store", "Refund - Order 42"}
+
+
+@pytest.mark.asyncio
+async def test_import_with_unknown_column(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    account: Account,
+):
+    """Test a mapping that references a missing header is rejected."""
+    response = await client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        data={"accountId": str(account.id), "mapping": json.dumps({"date": "When"})},
+        files={"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_with_unterminated_quote(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    account: Account,
+):
+    """Test a stray quote rejects the file without importing part of it."""
+    statement = CSV_STATEMENT + '2026-01-06,"Stray,-1.00\n'
+    statement += "2026-01-07,Tea,-3.00\n" * 8000
+    response = await client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        data={
+            "accountId": str(account.id),
+            "mapping": json.dumps({"note": "Description"}),
+        },
+        files={"file": ("statement.csv", statement.encode(), "text/csv")},
+    )
+    assert response.status_code == 400
+    assert "row 6" in response.json()["detail"]
+
+    response = await client.get("/api/v1/transactions", headers=auth_headers)
+    assert response.json()["data"] == []
+
+
+@pytest.mark.asyncio
+async def test_import_into_unknown_account(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+):
+    """Test importing into another user's or missing account returns 404."""
+    response = await client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        data={"accountId": "00000000-0000-0000-0000-000000000000"},
+        files={"file": ("statement.csv", CSV_STATEMENT.encode(), "text/csv")},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_reimport_skips_duplicates(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    account: Account,
+):
+    """Test importing an overlapping statement again skips known rows."""
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/transactions/import",
+            headers=auth_headers,
+            data={"accountId": str(account.id)},
+            files={"file": ("statement.ofx", OFX_STATEMENT.encode(), "text/plain")},
+        )
+    result = response.json()["data"]
+    assert result["imported"] == 0
+    assert result["duplicates"] == 2
+
+    await async_session.refresh(account)
+    assert account.balance == Decimal("174.70")
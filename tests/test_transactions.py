@@ -10,6 +10,7 @@ from app.models.account import Account, AccountType
 from app.models.category import Category, CategoryType
 from app.models.tag import Tag
 from app.models.transaction import Transaction, TransactionType
+from app.repositories.posting_repo import PostingRepository
 
 
 @pytest.fixture
@@ -472,3 +473,277 @@ async def test_delete_transaction(
     # Balance should be restored: 900 + 100 = 1000
     await async_session.refresh(data["account"])
     assert data["account"].balance == Decimal("1000")
+
+
+@pytest.mark.asyncio
+async def test_filter_transactions_by_transfer_destination(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test a transfer is listed under both of its accounts."""
+    data = setup_data
+    await client.post(
+        "/api/v1/transactions",
+        headers=auth_headers,
+        json={
+            "amount": 200.00,
+            "type": "transfer",
+            "account_id": str(data["account"].id),
+            "to_account_id": str(data["account2"].id),
+            "date": str(date.today()),
+        },
+    )
+
+    for account in (data["account"], data["account2"]):
+        response = await client.get(
+            f"/api/v1/transactions?accountId={account.id}",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_postings_follow_transaction_changes(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test postings are written, rewritten and removed with a transaction."""
+    data = setup_data
+    repo = PostingRepository(async_session)
+    response = await client.post(
+        "/api/v1/transactions",
+        headers=auth_headers,
+        json={
+            "amount": 300.00,
+            "type": "transfer",
+            "account_id": str(data["account"].id),
+            "to_account_id": str(data["account2"].id),
+            "date": str(date.today()),
+        },
+    )
+    transaction_id = response.json()["data"]["id"]
+    changes = await repo.get_balance_changes(UUID(test_user_id))
+    assert changes == {
+        data["account"].id: Decimal("-300.00"),
+        data["account2"].id: Decimal("300.00"),
+    }
+
+    await client.put(
+        f"/api/v1/transactions/{transaction_id}",
+        headers=auth_headers,
+        json={"type": "expense", "to_account_id": None},
+    )
+    changes = await repo.get_balance_changes(UUID(test_user_id))
+    assert changes == {data["account"].id: Decimal("-300.00")}
+
+    await client.delete(f"/api/v1/transactions/{transaction_id}", headers=auth_headers)
+    assert await repo.get_balance_changes(UUID(test_user_id)) == {}
+
+
+@pytest.mark.asyncio
+async def test_filter_transactions_by_tag(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test filtering transactions by tag returns the denormalized tag_ids."""
+    data = setup_data
+    for tag_ids in ([str(data["tag"].id)], []):
+        await client.post(
+            "/api/v1/transactions",
+            headers=auth_headers,
+            json={
+                "amount": 25.00,
+                "type": "expense",
+                "category_id": str(data["category"].id),
+                "account_id": str(data["account"].id),
+                "date": str(date.today()),
+                "tag_ids": tag_ids,
+            },
+        )
+
+    response = await client.get(
+        f"/api/v1/transactions?tagId={data['tag'].id}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert len(result) == 1
+    assert result[0]["tag_ids"] == [str(data["tag"].id)]
+
+
+@pytest.mark.asyncio
+async def test_update_transaction_tags(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    setup_data,
+):
+    """Test replacing tags updates tag_ids and usage counts."""
+    data = setup_data
+    response = await client.post(
+        "/api/v1/transactions",
+        headers=auth_headers,
+        json={
+            "amount": 25.00,
+            "type": "expense",
+            "account_id": str(data["account"].id),
+            "date": str(date.today()),
+            "tag_ids": [str(data["tag"].id)],
+        },
+    )
+    transaction_id = response.json()["data"]["id"]
+
+    response = await client.put(
+        f"/api/v1/transactions/{transaction_id}",
+        headers=auth_headers,
+        json={"tag_ids": []},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["tag_ids"] == []
+
+    await async_session.refresh(data["tag"])
+    assert data["tag"].usage_count == 0
+    response = await client.get(
+        f"/api/v1/transactions?tagId={data['tag'].id}",
+        headers=auth_headers,
+    )
+    assert response.json()["data"] == []
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_reports_duplicates(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test a transaction with an existing fingerprint is flagged or rejected."""
+    data = setup_data
+    existing = Transaction(
+        user_id=UUID(test_user_id),
+        amount=Decimal("4.50"),
+        type=TransactionType.EXPENSE,
+        account_id=data["account"].id,
+        date=date(2026, 1, 2),
+        note="STARBUCKS #123",
+    )
+    async_session.add(existing)
+    await async_session.commit()
+
+    payload = {
+        "amount": 4.5,
+        "type": "expense",
+        "account_id": str(data["account"].id),
+        "date": "2026-01-02",
+        "note": "Starbucks 123",
+    }
+    response = await client.post(
+        "/api/v1/transactions?rejectDuplicates=true",
+        headers=auth_headers,
+        json=payload,
+    )
+    assert response.status_code == 409
+
+    response = await client.post(
+        "/api/v1/transactions", headers=auth_headers, json=payload
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["duplicate_of"] == str(existing.id)
+
+    response = await client.post(
+        "/api/v1/transactions",
+        headers=auth_headers,
+        json={**payload, "date": "2026-01-03"},
+    )
+    assert response.json()["data"]["duplicate_of"] is None
+
+    response = await client.get("/api/v1/transactions/duplicates", headers=auth_headers)
+    groups = response.json()["data"]
+    assert len(groups) == 1
+    assert len(groups[0]["transactions"]) == 2
+    assert groups[0]["transactions"][0]["id"] == str(existing.id)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_transactions(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_id: str,
+    setup_data,
+):
+    """Test bulk creation skips duplicates and applies balances and tags."""
+    data = setup_data
+    account_id = str(data["account"].id)
+    async_session.add(
+        Transaction(
+            user_id=UUID(test_user_id),
+            amount=Decimal("10"),
+            type=TransactionType.EXPENSE,
+            account_id=data["account"].id,
+            date=date(2026, 2, 1),
+            note="Lunch",
+        )
+    )
+    await async_session.commit()
+
+    response = await client.post(
+        "/api/v1/transactions/bulk",
+        headers=auth_headers,
+        json={
+            "transactions": [
+                {
+                    "amount": 10,
+                    "type": "expense",
+                    "account_id": account_id,
+                    "date": "2026-02-01",
+                    "note": "lunch",
+                },
+                {
+                    "amount": 200,
+                    "type": "income",
+                    "account_id": account_id,
+                    "date": "2026-02-01",
+                    "tag_ids": [str(data["tag"].id)],
+                },
+                {
+                    "amount": 300,
+                    "type": "transfer",
+                    "account_id": account_id,
+                    "to_account_id": str(data["account2"].id),
+                    "date": "2026-02-02",
+                },
+            ]
+        },
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert len(result["created"]) == 2
+    assert [d["index"] for d in result["duplicates"]] == [0]
+
+    await async_session.refresh(data["account"])
+    await async_session.refresh(data["account2"])
+    await async_session.refresh(data["tag"])
+    assert data["account"].balance == Decimal("900")
+    assert data["account2"].balance == Decimal("5300")
+    assert data["tag"].usage_count == 1
+
+    changes = await PostingRepository(async_session).get_balance_changes(
+        UUID(test_user_id)
+    )
+    assert changes == {
+        data["account"].id: Decimal("-110"),
+        data["account2"].id: Decimal("300"),
+    }
+
+    response = await client.get(
+        f"/api/v1/transactions?tagId={data['tag'].id}", headers=auth_headers
+    )
+    assert len(response.json()["data"]) == 1